@@ -0,0 +1,82 @@
+"""
+Payload size of the daily line charts before and after downsampling.
+
+Builds the Daily view charts for "All" dates from the newest tank report and
+reports the serialized plotly JSON size and point count with no point budget
+versus the configured one. ``--scale N`` tiles the report N times along the
+date axis to mimic a longer history.
+
+    python benchmarks/chart_payload.py --scale 12 --point-budget 4000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(REPO_ROOT, "scripts"))
+
+import pandas as pd  # noqa: E402
+
+from shrimp import data  # noqa: E402
+from shrimp.charts import daily_charts  # noqa: E402
+from shrimp.downsample import DEFAULT_POINT_BUDGET  # noqa: E402
+
+
+def tile_history(df, scale):
+    span = (df['Date'].max() - df['Date'].min()) + pd.Timedelta(days=1)
+    copies = [df.assign(Date=df['Date'] + span * i) for i in range(scale)]
+    return pd.concat(copies, ignore_index=True)
+
+
+def measure(view_df, point_budget):
+    import plotly.io as pio
+
+    start = time.perf_counter()
+    bundle = daily_charts(view_df, point_budget)
+    build_ms = (time.perf_counter() - start) * 1000
+    result = {"build_ms": round(build_ms, 1), "charts": {}}
+    for c in bundle["charts"]:
+        if c["kind"] != "plotly" or c["figure"] is None:
+            continue
+        fig = c["figure"]
+        result["charts"][c["title"]] = {
+            "points": int(sum(len(t.y) for t in fig.data if t.y is not None)),
+            "payload_bytes": len(pio.to_json(fig, validate=False)),
+            "trace_types": sorted({t.type for t in fig.data}),
+        }
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--report", default=None, help="tank report .xlsx (default: newest in the repo root)")
+    parser.add_argument("--scale", type=int, default=1, help="tile the history this many times")
+    parser.add_argument("--point-budget", type=int, default=DEFAULT_POINT_BUDGET)
+    parser.add_argument("--output", default=None, help="write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    report = args.report or data.latest_report_file()
+    df = data.read_tank_report(report)
+    view_df = data.prepare_view_df(tile_history(df, args.scale))
+
+    before = measure(view_df, None)
+    after = measure(view_df, args.point_budget)
+    summary = {"rows": len(view_df), "point_budget": args.point_budget, "before": before, "after": after}
+
+    for title, b in before["charts"].items():
+        a = after["charts"][title]
+        print(f"{title}: {b['points']} → {a['points']} points, "
+              f"{b['payload_bytes'] / 1024:.0f} KiB → {a['payload_bytes'] / 1024:.0f} KiB, "
+              f"traces {'/'.join(a['trace_types'])}")
+    print(f"build: {before['build_ms']} ms → {after['build_ms']} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+"""
+Concurrent-session load test for the dashboard.
+
+Drives ``--sessions`` simulated users of ``scripts/dashboard11.py`` at once,
+each a headless Streamlit AppTest on its own thread against a synthetic farm
+(generated once into ``benchmarks/.data``). Every session runs
+``--iterations`` steps; a step opens a page and then changes the View Mode,
+the Block / Tank or the date / week / month selection, or toggles compare
+mode, and on pages with report downloads it "clicks" them by running their
+deferred builders.
+
+Reports rerun latency percentiles per action and overall, exceptions, and
+the process's resident memory before the sessions started and at its peak.
+All sessions share one process, and so one set of st.cache_* caches, like
+users of one deployed dashboard.
+
+    python benchmarks/load_test.py --sessions 8 --iterations 10
+    python benchmarks/load_test.py --sessions 4 --blocks 12 --days 120 --output load.json
+"""
+import argparse
+import ast
+import contextlib
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SCRIPTS_DIR = os.path.join(REPO_ROOT, "scripts")
+ENTRYPOINT = os.path.join(SCRIPTS_DIR, "dashboard11.py")
+DATA_DIR = os.path.join(REPO_ROOT, "benchmarks", ".data")
+sys.path.insert(0, SCRIPTS_DIR)
+
+from shrimp import synthetic  # noqa: E402  (no data paths read at import)
+
+PAGES = [
+    "pages/views.py",
+    "pages/heatmap.py",
+    "pages/tank_history.py",
+    "pages/risk.py",
+    "pages/executive_summary.py",
+    "pages/abw_details.py",
+    "pages/scorecard.py",
+    "pages/feed_plan.py",
+]
+PERIOD_SELECTS = {"Daily": "Select Date", "Weekly": "Select Week", "Monthly": "Select Month"}
+PERCENTILES = (50, 90, 95, 99)
+
+
+# ---------------------------
+# One runtime for all sessions
+# ---------------------------
+# AppTest gives every run its own mock Runtime and clears the global one when
+# the run ends, and patches the config into test mode for the run only; both
+# break any other session still running. Here all sessions share one runtime
+# and stay in test mode, like browser tabs on one dashboard server: one media
+# file manager and one set of st.cache_* storages.
+#
+# Report buttons pass a builder instead of bytes; Streamlit only calls it when
+# the button is clicked in a browser. AppTest has no browser, so each builder
+# is kept by its file id and called to simulate the click. Only the newest
+# are kept, so builders of buttons nobody clicked don't inflate peak memory.
+MAX_DEFERRED = 64
+_deferred = OrderedDict()
+_deferred_lock = threading.Lock()
+
+
+def _share_runtime():
+    from unittest.mock import MagicMock
+
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.testing.v1 import app_test, util
+
+    add_deferred = MediaFileManager.add_deferred
+
+    def recording(self, data_callable, *args, **kwargs):
+        file_id = add_deferred(self, data_callable, *args, **kwargs)
+        with _deferred_lock:
+            _deferred[file_id] = data_callable
+            while len(_deferred) > MAX_DEFERRED:
+                _deferred.popitem(last=False)
+        return file_id
+
+    MediaFileManager.add_deferred = recording
+
+    shared = MagicMock(spec=Runtime)
+    shared.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    shared.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.instance = classmethod(lambda cls: shared)
+    Runtime.exists = classmethod(lambda cls: True)
+    config.get_option = util.build_mock_config_get_option({"global.appTest": True})
+    app_test.patch_config_options = lambda overrides: contextlib.nullcontext()
+
+    # AppTest also re-parses the page script on every run (a server parses it
+    # once), and ast.parse on several threads at once can fail on CPython 3.11
+    parse, parse_lock = ast.parse, threading.Lock()
+
+    def serial_parse(*args, **kwargs):
+        with parse_lock:
+            return parse(*args, **kwargs)
+
+    ast.parse = serial_parse
+
+
+# ---------------------------
+# Memory sampling
+# ---------------------------
+class MemorySampler(threading.Thread):
+    def __init__(self, interval_s=0.05):
+        super().__init__(name="rss-sampler", daemon=True)
+        from shrimp import prom
+        self._rss, self.interval_s = prom._rss_bytes, interval_s
+        self.baseline = self.peak = self._rss()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval_s):
+            self.peak = max(self.peak, self._rss())
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.peak = max(self.peak, self._rss())
+
+
+# ---------------------------
+# Sessions
+# ---------------------------
+def _sidebar_select(at, label):
+    return next((s for s in at.sidebar.selectbox if s.label == label), None)
+
+
+class Session:
+    def __init__(self, index, seed, timeout):
+        from streamlit.testing.v1 import AppTest
+
+        self.index, self.rng = index, random.Random(seed * 1000 + index)
+        self.at = AppTest.from_file(ENTRYPOINT, default_timeout=timeout)
+        self.samples = []      # (action, ms)
+        self.exceptions = []
+
+    def _run(self, action):
+        start = time.perf_counter()
+        self.at.run()
+        self.samples.append((action, (time.perf_counter() - start) * 1000))
+        for e in self.at.exception:
+            self.exceptions.append(f"{action}: {e.value[:300]}")
+
+    def _pick(self, label, action):
+        select = _sidebar_select(self.at, label)
+        if select is None or len(select.options) < 2:
+            return
+        select.select_index(self.rng.randrange(len(select.options)))
+        self._run(action)
+
+    def _change_filters(self):
+        choice = self.rng.choice(["view_mode", "block", "tank", "period", "compare"])
+        if choice == "compare":
+            toggle = self.at.checkbox(key="compare_previous")
+            toggle.set_value(not toggle.value)
+            self._run("compare")
+        elif choice == "view_mode" and self.at.sidebar.radio:
+            self.at.sidebar.radio[0].set_value(self.rng.choice(list(PERIOD_SELECTS)))
+            self._run("view_mode")
+        elif choice == "block":
+            self._pick("Select Block", "block")
+        elif choice == "tank":
+            self._pick("Select Tank", "tank")
+        else:
+            mode = self.at.sidebar.radio[0].value if self.at.sidebar.radio else "Daily"
+            self._pick(PERIOD_SELECTS[mode], "period")
+
+    def _download(self):
+        for button in self.at.get("download_button"):
+            file_id = button.proto.deferred_file_id
+            with _deferred_lock:
+                build = _deferred.pop(file_id, None)
+            if build is None:
+                continue
+            start = time.perf_counter()
+            try:
+                build()
+            except Exception:
+                self.exceptions.append(f"download: {traceback.format_exc(limit=3)}")
+            self.samples.append(("download", (time.perf_counter() - start) * 1000))
+
+    def play(self, iterations):
+        self._run("open")
+        for _ in range(iterations):
+            self.at.switch_page(self.rng.choice(PAGES))
+            self._run("page")
+            self._change_filters()
+            self._download()
+        return self
+
+
+# ---------------------------
+# Report
+# ---------------------------
+def _percentile(values, p):
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def latency_summary(samples):
+    summary = {"count": len(samples)}
+    if samples:
+        summary.update({f"p{p}_ms": round(_percentile(samples, p), 1) for p in PERCENTILES})
+        summary.update({"mean_ms": round(statistics.fmean(samples), 1), "max_ms": round(max(samples), 1)})
+    return summary
+
+
+def _mb(n):
+    return round(n / 2 ** 20, 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=8, help="concurrent simulated users")
+    parser.add_argument("--iterations", type=int, default=10, help="page + filter steps per session")
+    parser.add_argument("--blocks", type=int, default=50)
+    parser.add_argument("--tanks", type=int, default=3)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--seed", type=int, default=0, help="synthetic farm and session click paths")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds allowed for one rerun")
+    parser.add_argument("--output", default=None, help="write the results as JSON to this file")
+    args = parser.parse_args(argv)
+    # Progress of the shrimp modules (e.g. generating the synthetic farm)
+    logging.basicConfig(format="%(message)s")
+    logging.getLogger("shrimp").setLevel(logging.INFO)
+
+    farm_dir = os.path.join(DATA_DIR, f"{args.blocks}x{args.tanks}x{args.days}-s{args.seed}")
+    synthetic.ensure_farm(farm_dir, args.blocks, args.tanks, args.days, args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Data, SQLite, parquet and model paths are read when shrimp.data / db /
+        # store are first imported, which happens inside the first app run
+        os.environ.update({
+            "SHRIMP_DATA_DIR": farm_dir,
+            "SHRIMP_DB_PATH": os.path.join(tmp, "shrimp.db"),
+            "SHRIMP_STORE_DIR": os.path.join(tmp, "store"),
+            "SHRIMP_MODEL_DIR": os.path.join(tmp, "models"),
+            "SHRIMP_PERF_LOG": "",
+            "SHRIMP_PROM_FILE": "",
+        })
+        _share_runtime()
+        sampler = MemorySampler()
+        sampler.start()
+
+        # One session on its own first: loads the farm and fills the caches
+        start = time.perf_counter()
+        warmup = Session(-1, args.seed, args.timeout)
+        warmup._run("open")
+        cold_ms = (time.perf_counter() - start) * 1000
+        warm_rss = sampler._rss()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.sessions, thread_name_prefix="session") as pool:
+            sessions = list(pool.map(lambda i: Session(i, args.seed, args.timeout).play(args.iterations),
+                                     range(args.sessions)))
+        wall_s = time.perf_counter() - start
+        sampler.stop()
+
+    samples = [s for session in sessions for s in session.samples]
+    actions = sorted({a for a, _ in samples})
+    exceptions = warmup.exceptions + [e for session in sessions for e in session.exceptions]
+    result = {
+        "farm": {"blocks": args.blocks, "tanks": args.tanks, "days": args.days, "seed": args.seed},
+        "sessions": args.sessions,
+        "iterations": args.iterations,
+        "cold_open_ms": round(cold_ms, 1),
+        "wall_s": round(wall_s, 2),
+        "reruns_per_s": round(sum(a != "download" for a, _ in samples) / wall_s, 2),
+        "latency": {
+            "all_reruns": latency_summary([ms for a, ms in samples if a != "download"]),
+            **{a: latency_summary([ms for b, ms in samples if b == a]) for a in actions},
+        },
+        "memory_mb": {"start": _mb(sampler.baseline), "after_warmup": _mb(warm_rss), "peak": _mb(sampler.peak)},
+        "exceptions": exceptions,
+    }
+
+    print(f"{'action':<14}{'count':>7}" + "".join(f"{f'p{p}':>10}" for p in PERCENTILES) + f"{'max':>10}")
+    for name, s in result["latency"].items():
+        row = "".join(f"{s.get(f'p{p}_ms', 0):>8.0f}ms" for p in PERCENTILES)
+        print(f"{name:<14}{s['count']:>7}{row}{s.get('max_ms', 0):>8.0f}ms")
+    print(f"cold open {result['cold_open_ms']:.0f} ms, {result['reruns_per_s']} reruns/s over {result['wall_s']} s")
+    print(f"memory: {result['memory_mb']['start']} MB at start, {result['memory_mb']['after_warmup']} MB "
+          f"after warm-up, {result['memory_mb']['peak']} MB peak")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if exceptions:
+        print(f"❌ {len(exceptions)} exception(s), first: {exceptions[0]}", file=sys.stderr)
+        return 1
+    print(f"✅ {args.sessions} sessions × {args.iterations} steps without exceptions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
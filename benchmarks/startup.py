@@ -0,0 +1,107 @@
+"""
+Cold-start benchmark for the dashboard.
+
+Each sample launches a fresh Python process, drives ``scripts/dashboard11.py``
+headlessly with Streamlit's AppTest and records the time from process launch
+until the first script run for the chosen page has finished (first paint).
+The run fails when the median cold start exceeds the budget.
+
+    python benchmarks/startup.py --budget-ms 6000
+    python benchmarks/startup.py --page pages/risk.py --runs 5 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SCRIPTS_DIR = os.path.join(REPO_ROOT, "scripts")
+ENTRYPOINT = os.path.join(SCRIPTS_DIR, "dashboard11.py")
+
+# Modules that should only be imported by the feature that needs them
+HEAVY_MODULES = ["plotly", "altair", "reportlab", "fpdf", "xlsxwriter"]
+
+DEFAULT_BUDGET_MS = 6000
+
+
+def run_child(page):
+    # `streamlit run` puts the script folder on sys.path; AppTest does not.
+    sys.path.insert(0, SCRIPTS_DIR)
+    import_start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    import_s = time.perf_counter() - import_start
+
+    run_start = time.perf_counter()
+    at = AppTest.from_file(ENTRYPOINT, default_timeout=300)
+    at.run()
+    if page:
+        at.switch_page(page)
+        at.run()
+    first_paint_s = time.perf_counter() - run_start
+
+    print(json.dumps({
+        "done_at": time.time(),
+        "streamlit_import_s": round(import_s, 3),
+        "first_run_s": round(first_paint_s, 3),
+        "exceptions": [e.value for e in at.exception],
+        "heavy_modules": sorted(m for m in HEAVY_MODULES if m in sys.modules),
+    }))
+
+
+def sample(page):
+    cmd = [sys.executable, os.path.abspath(__file__), "--child"]
+    if page:
+        cmd += ["--page", page]
+    launched_at = time.time()
+    proc = subprocess.run(cmd, capture_output=True, text=True, cwd=REPO_ROOT)
+    if proc.returncode != 0:
+        raise RuntimeError(f"startup child failed:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["cold_start_ms"] = round((result.pop("done_at") - launched_at) * 1000, 1)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page", default=None, help="page to open after the default one, e.g. pages/risk.py")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget-ms", type=float, default=float(os.environ.get("STARTUP_BUDGET_MS", DEFAULT_BUDGET_MS)))
+    parser.add_argument("--output", default=None, help="write the results as JSON to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.page)
+        return 0
+
+    samples = [sample(args.page) for _ in range(args.runs)]
+    cold = [s["cold_start_ms"] for s in samples]
+    summary = {
+        "page": args.page or "default",
+        "runs": args.runs,
+        "budget_ms": args.budget_ms,
+        "median_cold_start_ms": round(statistics.median(cold), 1),
+        "max_cold_start_ms": max(cold),
+        "samples": samples,
+    }
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+
+    errors = [e for s in samples for e in s["exceptions"]]
+    if errors:
+        print(f"❌ app raised during startup: {errors[0]}", file=sys.stderr)
+        return 1
+    if summary["median_cold_start_ms"] > args.budget_ms:
+        print(f"❌ cold start {summary['median_cold_start_ms']} ms is over the {args.budget_ms:.0f} ms budget", file=sys.stderr)
+        return 1
+    print(f"✅ cold start {summary['median_cold_start_ms']} ms (budget {args.budget_ms:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""
+End-to-end timings at farm scale, stored for regression comparison.
+
+Generates (once, then reuses) a synthetic farm with ``shrimp.synthetic`` and
+times each stage the dashboard runs: loading both workbooks, the SQLite
+ingest and window query, the in-memory filter, the daily / weekly / monthly
+views (metrics and chart bundles), the risk table and one styled page of it,
+the next-day feed plan, the ABW scorecard, its weekly trend and its Excel and
+PDF exports.
+
+Each run is written to ``benchmarks/results/<timestamp>.json``. With
+``--baseline`` the run is compared stage by stage against an earlier result
+(``latest`` picks the newest one) and fails when a stage got slower than
+``--tolerance``.
+
+    python benchmarks/suite.py                                # 50 blocks × 3 tanks × 730 days
+    python benchmarks/suite.py --baseline latest --tolerance 0.25
+    python benchmarks/suite.py --blocks 12 --days 120 --repeat 5
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(REPO_ROOT, "scripts"))
+
+import pandas as pd  # noqa: E402
+
+from shrimp import data, db, growth, metrics, synthetic  # noqa: E402
+from shrimp.charts import daily_charts, monthly_charts, weekly_charts  # noqa: E402
+from shrimp.downsample import DEFAULT_POINT_BUDGET  # noqa: E402
+from shrimp.exports import scorecard_excel, scorecard_pdf  # noqa: E402
+from shrimp.feed import plan_feed  # noqa: E402
+from shrimp.filters import apply_filters  # noqa: E402
+from shrimp.periods import period_scorecard, scorecard_periods  # noqa: E402
+from shrimp.risk import build_risk_table, query_risk_table, style_page  # noqa: E402
+
+DATA_DIR = os.path.join(REPO_ROOT, "benchmarks", ".data")
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+
+# Differences under this many ms are noise, whatever the ratio
+MIN_REGRESSION_MS = 20
+
+
+def farm_files(blocks, tanks, days, seed):
+    """Paths of the synthetic workbooks for these parameters, generated on first use."""
+    out = os.path.join(DATA_DIR, f"{blocks}x{tanks}x{days}-s{seed}")
+    return synthetic.ensure_farm(out, blocks, tanks, days, seed)
+
+
+def time_stage(fn, repeat):
+    samples, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return result, {"median_ms": round(statistics.median(samples), 1), "min_ms": round(min(samples), 1),
+                    "runs": repeat}
+
+
+def selection(view_option, **kwargs):
+    sel = {'block': "All", 'tank': "All", 'view_option': view_option, 'date': "All",
+           'week': None, 'week_start': None, 'week_end': None, 'month': None}
+    sel.update(kwargs)
+    return sel
+
+
+def run_suite(report_path, abw_path, repeat, point_budget):
+    stages, once = {}, 1
+
+    raw, stages["load_report"] = time_stage(lambda: data.read_tank_report(report_path), once)
+    abw_df, stages["load_abw"] = time_stage(lambda: data.read_abw(abw_path), repeat)
+    farm_df, stages["prepare"] = time_stage(lambda: data.prepare_view_df(raw), repeat)
+
+    # Windows the sidebar would offer: the last full week and the last month
+    last = raw['Date'].max()
+    week_start = last.normalize() - pd.Timedelta(days=last.weekday() + 7)
+    week_end = week_start + pd.Timedelta(days=6)
+    month = last.to_period('M')
+    weekly_sel = selection("Weekly", week=f"{week_start.date()} to {week_end.date()}",
+                           week_start=week_start, week_end=week_end)
+    monthly_sel = selection("Monthly", month=str(month))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = db.connect(os.path.join(tmp, "bench.db"))
+        try:
+            _, stages["ingest"] = time_stage(lambda: (db.ingest_report(conn, report_path),
+                                                      db.ingest_abw(conn, abw_path)), once)
+            start, end, end_inclusive = db.selection_window(monthly_sel)
+            _, stages["filter_sql_month"] = time_stage(
+                lambda: data.prepare_view_df(db.query_farm_log(conn, start, end, None, None, end_inclusive)), repeat)
+        finally:
+            conn.close()
+
+    monthly_df, stages["filter_memory_month"] = time_stage(lambda: apply_filters(raw, monthly_sel), repeat)
+    weekly_df = apply_filters(raw, weekly_sel)
+
+    def daily_view():
+        return (metrics.tile_kpis(farm_df), metrics.worker_summary(farm_df),
+                metrics.performance_table(farm_df, "Daily"), daily_charts(farm_df, point_budget))
+
+    def weekly_view():
+        return (metrics.tile_kpis(weekly_df), metrics.worker_summary(weekly_df, by_week=True),
+                metrics.performance_table(weekly_df, "Weekly"), weekly_charts(weekly_df, point_budget))
+
+    def monthly_view():
+        return (metrics.monthly_tank_summary(monthly_df), metrics.worker_summary(monthly_df),
+                metrics.performance_table(monthly_df, "Monthly"), monthly_charts(monthly_df, point_budget))
+
+    _, stages["view_daily_all"] = time_stage(daily_view, repeat)
+    _, stages["view_weekly"] = time_stage(weekly_view, repeat)
+    _, stages["view_monthly"] = time_stage(monthly_view, repeat)
+
+    table, stages["risk_table"] = time_stage(lambda: build_risk_table(farm_df), repeat)
+    _, stages["risk_page"] = time_stage(lambda: style_page(
+        query_risk_table(table, [metrics.ALERT_LEVELS[0]], sort_by='Dead Shrimp', descending=True).iloc[:50]
+    ).to_html(), repeat)
+
+    growth_df = growth.daily_growth(raw, abw_df)
+    _, stages["feed_plan"] = time_stage(lambda: plan_feed(growth_df, raw), repeat)
+
+    start_date, end_date = abw_df['Date'].min(), abw_df['Date'].max()
+    target_abw = metrics.get_target_weight(max((end_date - start_date).days, 1))
+
+    def scorecard():
+        tank_df = metrics.tank_scorecard(farm_df, abw_df, start_date, end_date)
+        return tank_df, metrics.consolidated_report(tank_df, target_abw), metrics.worker_report(tank_df, target_abw)
+
+    (tank_df, consolidated_v, worker_v), stages["scorecard"] = time_stage(scorecard, repeat)
+    _, stages["scorecard_weekly_trend"] = time_stage(lambda: period_scorecard(
+        metrics.scorecard_log(farm_df, abw_df), scorecard_periods(start_date, end_date, "Weekly")), repeat)
+    _, stages["export_excel"] = time_stage(lambda: scorecard_excel(tank_df, worker_v, consolidated_v), repeat)
+    _, stages["export_pdf"] = time_stage(
+        lambda: scorecard_pdf(consolidated_v, worker_v, start_date.date(), end_date.date()), repeat)
+
+    sizes = {"farm_rows": len(raw), "abw_samples": len(abw_df), "week_rows": len(weekly_df),
+             "month_rows": len(monthly_df), "tanks": int(tank_df.shape[0])}
+    return stages, sizes
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                               capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def load_baseline(spec):
+    if spec == "latest":
+        runs = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")))
+        if not runs:
+            return None, None
+        spec = runs[-1]
+    with open(spec) as f:
+        return spec, json.load(f)
+
+
+def compare(stages, baseline, tolerance):
+    """Print a per-stage comparison; returns the names of regressed stages."""
+    regressed = []
+    print(f"\n{'stage':<22}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, cur in stages.items():
+        base = baseline["stages"].get(name)
+        if base is None:
+            print(f"{name:<22}{'-':>12}{cur['median_ms']:>10.1f}ms{'new':>10}")
+            continue
+        change = cur["median_ms"] / base["median_ms"] - 1 if base["median_ms"] else 0.0
+        slower = change > tolerance and cur["median_ms"] - base["median_ms"] > MIN_REGRESSION_MS
+        if slower:
+            regressed.append(name)
+        print(f"{name:<22}{base['median_ms']:>10.1f}ms{cur['median_ms']:>10.1f}ms{change:>+9.0%}{' ❌' if slower else ''}")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--blocks", type=int, default=50)
+    parser.add_argument("--tanks", type=int, default=3)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report", default=None, help="time this tank report instead of a synthetic one")
+    parser.add_argument("--abw", default=None, help="ABW workbook to go with --report")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage (loading and ingest run once)")
+    parser.add_argument("--point-budget", type=int, default=DEFAULT_POINT_BUDGET)
+    parser.add_argument("--output", default=None, help="result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", default=None, help="earlier result file to compare against, or 'latest'")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown per stage (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+    # Progress of the shrimp modules (e.g. generating the synthetic farm)
+    logging.basicConfig(format="%(message)s")
+    logging.getLogger("shrimp").setLevel(logging.INFO)
+
+    if args.report:
+        report_path, abw_path = args.report, args.abw or data.abw_source()
+        farm = {"report": os.path.basename(report_path)}
+    else:
+        report_path, abw_path = farm_files(args.blocks, args.tanks, args.days, args.seed)
+        farm = {"blocks": args.blocks, "tanks": args.tanks, "days": args.days, "seed": args.seed}
+
+    # Pick the baseline before this run's result lands in the results folder
+    baseline_path, baseline = load_baseline(args.baseline) if args.baseline else (None, None)
+
+    stages, sizes = run_suite(report_path, abw_path, args.repeat, args.point_budget)
+    result = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "farm": farm,
+        "sizes": sizes,
+        "point_budget": args.point_budget,
+        "stages": stages,
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d_%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+
+    print(json.dumps(sizes))
+    for name, s in stages.items():
+        print(f"{name:<22}{s['median_ms']:>10.1f} ms")
+    print(f"results: {output}")
+
+    if baseline is None:
+        if args.baseline:
+            print("no baseline found; this run can be the baseline for the next one")
+        return 0
+    if baseline.get("farm") != farm:
+        print(f"⚠ baseline {baseline_path} used a different farm ({baseline.get('farm')}); comparing anyway")
+    regressed = compare(stages, baseline, args.tolerance)
+    if regressed:
+        print(f"❌ slower than {baseline_path} by more than {args.tolerance:.0%}: {', '.join(regressed)}", file=sys.stderr)
+        return 1
+    print(f"✅ no stage slower than {baseline_path} by more than {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""
+Load tank reports and the ABW workbook into the SQLite store.
+
+    python scripts/ingest.py                      # newest report + AvgBW.xlsx
+    python scripts/ingest.py Tank_Consolidated_Report_*.xlsx --abw AvgBW.xlsx
+    python scripts/ingest.py --db /data/shrimp.db --force
+
+Files already ingested with the same modification time are skipped unless
+``--force`` is given. Reports are applied oldest first so newer ones win.
+"""
+import argparse
+import os
+import sys
+
+from shrimp import data, db
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("reports", nargs="*", help="Tank_Consolidated_Report_*.xlsx files (default: newest in the repo root)")
+    parser.add_argument("--abw", default=None, help="ABW workbook or URL (default: AvgBW.xlsx in the repo root)")
+    parser.add_argument("--db", default=db.DB_PATH, help=f"database file (default: {db.DB_PATH})")
+    parser.add_argument("--force", action="store_true", help="re-ingest files that are already loaded")
+    args = parser.parse_args(argv)
+
+    reports = args.reports or [data.latest_report_file()]
+    reports = sorted((r for r in reports if r), key=os.path.getmtime)
+    if not reports:
+        print(f"No tank reports found in {data.DATA_DIR}", file=sys.stderr)
+        return 1
+    abw = args.abw or data.abw_source()
+
+    conn = db.connect(args.db)
+    try:
+        for path in reports:
+            if not args.force and db.is_ingested(conn, path):
+                print(f"skip  {os.path.basename(path)} (already ingested)")
+                continue
+            print(f"load  {os.path.basename(path)}: {db.ingest_report(conn, path)} rows")
+        if args.force or not db.is_ingested(conn, abw):
+            print(f"load  {os.path.basename(abw)}: {db.ingest_abw(conn, abw)} ABW samples")
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Local JSON API for the dashboard numbers.
+
+    python scripts/kpi_api.py --port 8502
+
+Endpoints (all GET, all accept ``start`` / ``end`` as YYYY-MM-DD and
+``block`` / ``tank``):
+
+    /api/version    current data version
+    /api/kpi        feed, mortality % and pH / salinity compliance
+    /api/workers    worker performance & compliance summary
+    /api/tanks      ABW tank scorecard (biomass, ADG, survival, FCR)
+    /api/alerts     rows with their alert level; ``level`` may repeat,
+                    e.g. ?level=Critical 🔴
+    /api/metrics    Prometheus text-format latency / cache metrics (shrimp.prom)
+
+Farm log rows and ABW samples come from the SQLite store, the log limited
+to the newest report's dates like the dashboard's (``db.query_current_log``),
+and the numbers from shrimp.metrics, the same rollups the dashboard shows.
+Each response is computed once per data version and query and carries an
+ETag, so pollers that send If-None-Match get a 304 without any recomputation.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import tornado.ioloop
+import tornado.web
+
+from shrimp import data, db, metrics, prom
+
+DEFAULT_PORT = int(os.environ.get("SHRIMP_API_PORT", 8502))
+
+
+def _json_default(value):
+    # numpy scalars as JSON numbers, timestamps as ISO strings
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return str(value)
+
+
+def _records(df):
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+
+@lru_cache(maxsize=4)
+def synced_db(data_version):
+    return db.sync_latest()
+
+
+@lru_cache(maxsize=4)
+def abw_samples(data_version):
+    conn = sqlite3.connect(synced_db(data_version))
+    try:
+        return data.derive_abw(db.query_abw(conn))
+    finally:
+        conn.close()
+
+
+def farm_log(data_version, start, end, block, tank):
+    conn = sqlite3.connect(synced_db(data_version))
+    try:
+        return data.prepare_view_df(db.query_current_log(conn, start, end, block, tank))
+    finally:
+        conn.close()
+
+
+def tank_rollup(data_version, start, end, block, tank):
+    abw_df = abw_samples(data_version)
+    start = start or abw_df['Date'].min()
+    end = end or abw_df['Date'].max()
+    if block:
+        abw_df = abw_df[abw_df['Block'] == block]
+    if tank:
+        abw_df = abw_df[abw_df['Tank'] == tank]
+    tank_df = metrics.tank_scorecard(farm_log(data_version, start, end, block, tank), abw_df, start, end)
+    return {"start": pd.Timestamp(start).date().isoformat(), "end": pd.Timestamp(end).date().isoformat(),
+            "tanks": _records(tank_df)}
+
+
+ROLLUPS = {
+    "kpi": lambda v, q: metrics.kpis(farm_log(v, *q[:4])),
+    "workers": lambda v, q: _records(metrics.worker_summary(farm_log(v, *q[:4]))),
+    "tanks": lambda v, q: tank_rollup(v, *q[:4]),
+    "alerts": lambda v, q: _records(metrics.alerts(farm_log(v, *q[:4]), list(q[4]))),
+}
+
+
+@lru_cache(maxsize=512)
+def rollup_body(data_version, name, query):
+    payload = {"data_version": data_version, "query": dict(zip(["start", "end", "block", "tank", "level"], query)),
+               "data": ROLLUPS[name](data_version, query)}
+    return json.dumps(payload, default=_json_default).encode()
+
+
+class RollupHandler(tornado.web.RequestHandler):
+    def _date(self, name):
+        value = self.get_query_argument(name, None)
+        if not value:
+            return None
+        try:
+            return pd.Timestamp(value).strftime("%Y-%m-%d")
+        except ValueError:
+            raise tornado.web.HTTPError(400, f"{name} must be a date (YYYY-MM-DD)")
+
+    def get(self, name):
+        if name not in ROLLUPS:
+            raise tornado.web.HTTPError(404)
+        start, end = self._date("start"), self._date("end")
+        # A date-only end means the whole day
+        end_ts = pd.Timestamp(end) + pd.Timedelta(hours=23, minutes=59, seconds=59) if end else None
+        block, tank = (self.get_query_argument(k, "").strip().upper() or None for k in ("block", "tank"))
+        query = (start, end_ts and str(end_ts), block, tank,
+                 tuple(sorted(self.get_query_arguments("level"))))
+
+        version = data.data_version()
+        etag = '"' + hashlib.sha1(repr((version, name, query)).encode()).hexdigest()[:20] + '"'
+        self.set_header("ETag", etag)
+        self.set_header("Cache-Control", "no-cache")
+        if etag in self.request.headers.get("If-None-Match", ""):
+            self.set_status(304)
+            return
+        self.set_header("Content-Type", "application/json; charset=utf-8")
+        self.write(rollup_body(version, name, query))
+
+    def compute_etag(self):
+        # The ETag is set from the data version and query in get()
+        return None
+
+
+class VersionHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.write({"data_version": data.data_version()})
+
+
+class MetricsHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.set_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.write(prom.render())
+
+
+def make_app():
+    prom.enable()
+    return tornado.web.Application([
+        (r"/api/version", VersionHandler),
+        (r"/api/metrics", MetricsHandler),
+        (r"/api/(\w+)", RollupHandler),
+    ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--address", default="127.0.0.1")
+    args = parser.parse_args(argv)
+
+    make_app().listen(args.port, address=args.address)
+    print(f"KPI API listening on http://{args.address}:{args.port}/api/")
+    tornado.ioloop.IOLoop.current().start()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,313 @@
+import streamlit as st
+from io import BytesIO
+import pandas as pd
+from textwrap import wrap
+
+from shrimp.data import abw_version, get_abw, size_analytics
+from shrimp.filters import current_view_df
+from shrimp.instrument import traced
+from shrimp.metrics import executive_kpis, tank_status_summary
+from shrimp.timing import timed_section
+
+
+@st.fragment
+def abw_details_section(view_df):
+    with timed_section("ABW details"):
+        # -----------------------------
+        # Ensure dashboard dataframe exists
+        # -----------------------------
+        required_cols = ['Date','WorkerName','Tank','Block','pH','Salinity','WaterTemperature',
+                         'DeadCount_day','DeadWeight_g','ScheduledFeed_day_g','ActualFeed_day_g',
+                         'pH_OK','Salinity_OK','LiveCount','InitialCount']
+        for col in required_cols:
+            if col not in view_df.columns:
+                st.error(f"Missing column: {col}")
+                return
+
+        # -----------------------------
+        # Select Report Parameters
+        # -----------------------------
+        st.title("🦐 Shrimp Farm Dashboard – Executive Summary Report")
+        start_date = st.date_input("Start Date", key="start_date_report")
+        end_date = st.date_input("End Date", key="end_date_report")
+
+        # -----------------------------
+        # Filter Data
+        # -----------------------------
+        filtered_df = view_df[
+            (view_df['Date'] >= pd.to_datetime(start_date)) &
+            (view_df['Date'] <= pd.to_datetime(end_date))
+        ].copy()
+
+        if filtered_df.empty:
+            st.warning("No data available for the selected date range.")
+        else:
+            # -----------------------------
+            # ABW - latest sample per Block/Tank up to the report end date
+            # -----------------------------
+            try:
+                abw_df = get_abw()
+            except Exception as e:
+                st.error(f"ABW Excel Load Error: {e}")
+                return
+            latest_abw = (
+                abw_df[abw_df['Date'] <= pd.to_datetime(end_date)]
+                .sort_values('Date')
+                .groupby(['Block','Tank'], as_index=False)['Avg Weight'].last()
+                .rename(columns={'Block':'ABW_Block','Tank':'ABW_Tank','Avg Weight':'ABW'})
+            )
+            filtered_df['ABW_Block'] = filtered_df['Block'].astype(str).str.strip().str.upper()
+            filtered_df['ABW_Tank'] = filtered_df['Tank'].astype(str).str.strip().str.upper()
+            filtered_df = filtered_df.merge(latest_abw, on=['ABW_Block','ABW_Tank'], how='left')
+            filtered_df['ABW'] = filtered_df['ABW'].fillna(0)
+
+            # -----------------------------
+            # KPIs
+            # -----------------------------
+            k = executive_kpis(filtered_df, initial_stock=filtered_df['InitialCount'].sum())
+
+            # -----------------------------
+            # Assign Worker Labels
+            # -----------------------------
+            hikaru_blocks = ['H','I','J']
+            jimmy_blocks = ['E','F','G']
+            other_blocks = ['A','B','C','D','K']
+
+            def assign_worker(block):
+                if block[0] in hikaru_blocks:
+                    return "Hikaru"
+                elif block[0] in jimmy_blocks:
+                    return "Jimmy"
+                else:
+                    return "Other"
+            filtered_df['Worker_Label'] = filtered_df['Block'].apply(assign_worker)
+
+            # -----------------------------
+            # Tank/Block Risk Summary
+            # -----------------------------
+            tank_summary = tank_status_summary(filtered_df, 'Worker_Label', extra={'ABW': 'first'},  # include ABW per block
+                                               ph_ok=(8.0, 8.3), ph_warn=(7.9, 8.4))
+
+            # -----------------------------
+            # Worker Performance Summary (Latest Date & Wrapped Blocks)
+            # -----------------------------
+            worker_summary_list = []
+            latest_date = filtered_df['Date'].max()
+            latest_df = filtered_df[filtered_df['Date'] == latest_date]
+
+            for worker in ['Hikaru','Jimmy','Other']:
+                w_df = latest_df[latest_df['Worker_Label'] == worker]
+                if w_df.empty:
+                    continue
+
+                # Blocks list
+                blocks_list = w_df['Block'].tolist()
+                blocks_text = ','.join(blocks_list)
+                blocks_lines = wrap(blocks_text, width=40)
+
+                scheduled_feed = round(w_df['ScheduledFeed_day_g'].sum()/1000,2)
+                actual_feed = round(w_df['ActualFeed_day_g'].sum()/1000,2)
+                leftover_feed = round(scheduled_feed - actual_feed,2)
+                dead_count = w_df['DeadCount_day'].sum()
+                dead_weight = round(w_df['DeadWeight_g'].sum(),2)
+                total_blocks = w_df['Block'].nunique()
+                live_count = w_df['LiveCount'].sum()
+                initial_stock = w_df['InitialCount'].sum()
+                survival_pct = round(live_count / initial_stock * 100,2) if initial_stock else 0
+                mortality_pct_worker = round(100 - survival_pct,2)
+                ph_comp = round(w_df['pH_OK'].mean()*100,1)
+                sal_comp = round(w_df['Salinity_OK'].mean()*100,1)
+
+                # ABW average per worker
+                avg_abw = round(w_df['ABW'].mean(),4)
+
+                worker_summary_list.append({
+                    'WorkerName': worker,
+                    'Blocks_Lines': blocks_lines,
+                    'ScheduledFeed_kg': scheduled_feed,
+                    'ActualFeed_kg': actual_feed,
+                    'Leftover_kg': leftover_feed,
+                    'Dead_Count': dead_count,
+                    'Dead_Weight_g': dead_weight,
+                    'Total_Blocks': total_blocks,
+                    'Live_Count': live_count,
+                    'Initial_Count': initial_stock,
+                    'Survival_%': survival_pct,
+                    'Mortality_%': mortality_pct_worker,
+                    'pH_%': ph_comp,
+                    'Salinity_%': sal_comp,
+                    'Avg_ABW': avg_abw
+                })
+
+            worker_summary_df = pd.DataFrame(worker_summary_list)
+
+            # -----------------------------
+            # Generate PDF
+            # -----------------------------
+            # reportlab is only imported when someone actually downloads the PDF
+            def build_pdf():
+                from reportlab.pdfgen import canvas
+                from reportlab.lib.pagesizes import A4
+                from reportlab.lib import colors
+
+                pdf_buffer = BytesIO()
+                c = canvas.Canvas(pdf_buffer, pagesize=A4)
+                width, height = A4
+
+                # Title & Info
+                c.setFont("Times-Bold", 18)
+                c.drawCentredString(width/2, height-50, "🦐 PJ Site Executive Summary Report 🦐")
+                c.setFont("Times-Roman", 12)
+                c.drawString(50, height-80, f"Reporting Period: {start_date} to {end_date}")
+                c.drawString(50, height-100, "Prepared By: Sai")
+                c.drawString(50, height-120, "Data Source: Shrimp Farm Dashboard")
+
+                # Key KPIs
+                c.setFont("Times-Bold", 14)
+                c.drawString(50, height-150, "1️⃣ Key KPIs")
+                y = height-170
+                for line in [
+                    f"Total Feed Scheduled: {k['total_feed_scheduled']:.2f} kg",
+                    f"Total Feed Actual: {k['total_feed_actual']:.2f} kg",
+                    f"Total Leftover Feed: {k['total_leftover_feed']:.2f} kg",
+                    f"Total Mortality: {k['total_mortality']} shrimps ({k['mortality_pct']:.1f}%)",
+                    f"pH Compliance: {k['ph_compliance']}%",
+                    f"Salinity Compliance: {k['salinity_compliance']}%"
+                ]:
+                    c.setFont("Times-Roman", 12)
+                    c.drawString(70, y, line)
+                    y -= 18
+
+                # Worker Performance
+                c.setFont("Times-Bold", 14)
+                c.drawString(50, y-10, "2️⃣ Worker Performance Summary")
+                y -= 30
+
+                for _, row in worker_summary_df.iterrows():
+                    c.setFont("Times-Bold", 12)
+                    c.drawString(60, y, f"Worker: {row['WorkerName']}")
+                    y -= 16
+                    # Draw wrapped block lines
+                    c.setFont("Times-Roman", 12)
+                    for line in row['Blocks_Lines']:
+                        c.drawString(80, y, f"Blocks: {line}")
+                        y -= 14
+                        if y < 50:
+                            c.showPage()
+                            y = height-50
+                    # Metrics bullets
+                    bullets = [
+                        f"• Live Count: {row['Live_Count']}/{row['Initial_Count']}",
+                        f"• Survival %: {row['Survival_%']}",
+                        f"• Mortality %: {row['Mortality_%']}",
+                        f"• Scheduled Feed (kg): {row['ScheduledFeed_kg']}",
+                        f"• Actual Feed (kg): {row['ActualFeed_kg']}",
+                        f"• Leftover Feed (kg): {row['Leftover_kg']}",
+                        f"• Dead Count: {row['Dead_Count']}",
+                        f"• Dead Weight (g): {row['Dead_Weight_g']}",
+                        f"• Blocks Managed: {row['Total_Blocks']}",
+                        f"• Avg ABW: {row['Avg_ABW']}"
+                    ]
+                    for b in bullets:
+                        c.drawString(80, y, b)
+                        y -= 14
+                        if y < 50:
+                            c.showPage()
+                            y = height-50
+                    y -= 8
+
+                # Tank/Block Risk Summary side-by-side symbols
+                c.setFont("Times-Bold", 14)
+                c.drawString(50, y-10, "3️⃣ Tank/Block Risk Summary")
+                y -= 30
+                colors_map = {"✅": colors.green, "⚠": colors.orange, "🔴": colors.red}
+
+                for worker in ["Hikaru","Jimmy","Other"]:
+                    worker_df = tank_summary[tank_summary['Worker_Label']==worker]
+                    if not worker_df.empty:
+                        c.setFont("Times-Bold", 12)
+                        c.drawString(60, y, f"Worker: {worker}")
+                        y -= 18
+                        for _, t in worker_df.iterrows():
+                            x_pos = 80
+                            c.setFont("Times-Roman", 12)
+                            c.drawString(x_pos, y, f"• Tank/Block: {t['Tank']}/{t['Block']}")
+                            x_pos += 130
+                            symbol_spacing = 20
+                            label_spacing = 50
+                            for status, label in zip([t['pH_status'], t['Sal_status'], t['Temp_status'], t['Mort_status']],
+                                                     ["pH", "Salinity", "Temp", "Mortality"]):
+                                c.setFont("Times-Bold", 12)
+                                c.setFillColor(colors_map[status])
+                                c.drawString(x_pos, y, status)
+                                x_pos += symbol_spacing
+                                c.setFont("Times-Roman", 12)
+                                c.setFillColor(colors.black)
+                                c.drawString(x_pos, y, label)
+                                x_pos += label_spacing
+                            y -= 16
+                            if y < 100:
+                                c.showPage()
+                                y = height-50
+
+                c.save()
+                return pdf_buffer.getvalue()
+
+            st.download_button(
+                label="⬇️ Download Executive Summary PDF",
+                data=traced("export.abw_pdf")(build_pdf),
+                file_name="PJ_Site_Executive_Summary.pdf",
+                mime="application/pdf"
+            )
+
+
+@st.fragment
+def size_section():
+    import plotly.express as px
+
+    with timed_section("Size distribution"):
+        st.header("📏 Size Distribution")
+        try:
+            report = size_analytics(abw_version())
+        except Exception as e:
+            st.error(f"ABW Excel Load Error: {e}")
+            return
+        tanks, samples, fits = report['tanks'], report['samples'], report['fits']
+        if tanks.empty:
+            st.info("No weighed ABW samples to size.")
+            return
+        tanks = tanks.assign(Label=tanks['Tank'] + " | " + tanks['Block'])
+
+        divergent = tanks[tanks['Divergent']]
+        st.subheader(f"Divergent Tanks ({len(divergent)} of {len(tanks)})")
+        if divergent.empty:
+            st.success("No tank is out of line with the rest of the farm.")
+        else:
+            st.dataframe(divergent.set_index('Label')[[
+                'Divergence', 'Date', 'ABW', 'CV_pct', 'CV_trend_pp_week', 'Weight_for_length_pct',
+                'Share_S', 'Share_M', 'Share_L']].round(2), use_container_width=True)
+
+        # CV and class shares over time for a few tanks (divergent ones first)
+        default = divergent['Label'].head(3).tolist() or tanks['Label'].head(3).tolist()
+        picked = st.multiselect("Tanks", tanks['Label'].tolist(), default=default, key="size_tanks")
+        shown = samples.assign(Label=samples['Tank'] + " | " + samples['Block'])
+        shown = shown[shown['Label'].isin(picked)]
+        if not shown.empty:
+            fig = px.line(shown, x='Date', y='CV_pct', color='Label', markers=True,
+                          hover_data=['ABW', 'CV_length_pct', 'Cycle'], labels={'CV_pct': "Weight CV (%)"})
+            st.plotly_chart(fig, use_container_width=True, key="size_cv_trend")
+            shares = shown.melt(id_vars=['Label', 'Date'], value_vars=['Share_S', 'Share_M', 'Share_L'],
+                                var_name='Class', value_name='Share %')
+            shares['Class'] = shares['Class'].str[-1]
+            fig = px.bar(shares.dropna(), x='Date', y='Share %', color='Class', facet_row='Label',
+                         category_orders={'Class': ["S", "M", "L"]})
+            st.plotly_chart(fig, use_container_width=True, key="size_class_shares")
+
+        with st.expander("Length–weight fits (W = a·L^b)"):
+            farm = fits.iloc[-1]
+            st.caption(f"Farm: W = {farm['a']:.4f}·L^{farm['b']:.2f} (R² {farm['R2']}, {farm['n']} class samples)")
+            st.dataframe(fits.iloc[:-1].round({'a': 4, 'b': 2}), use_container_width=True, hide_index=True)
+
+
+abw_details_section(current_view_df())
+size_section()
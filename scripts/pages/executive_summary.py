@@ -0,0 +1,206 @@
+# action item dashboard
+import streamlit as st
+import pandas as pd
+from io import BytesIO
+
+from shrimp.filters import current_view_df
+from shrimp.instrument import traced
+from shrimp.metrics import assign_worker, executive_kpis, executive_worker_summary, tank_status_summary
+from shrimp.timing import timed_section
+
+
+@st.fragment
+def executive_summary_section(view_df):
+    with timed_section("Executive summary"):
+        # ==============================
+        # 1️⃣ Ensure dashboard dataframe exists
+        # ==============================
+        required_cols = ['Date','WorkerName','Tank','Block','pH','Salinity','WaterTemperature',
+                         'DeadCount_day','DeadWeight_g','ScheduledFeed_day_g','ActualFeed_day_g',
+                         'pH_OK','Salinity_OK']
+        for col in required_cols:
+            if col not in view_df.columns:
+                st.error(f"Missing column: {col}")
+                return
+
+        # ==============================
+        # 2️⃣ Select Report Parameters
+        # ==============================
+        st.title("🦐 Shrimp Farm Dashboard – Executive Summary Report")
+        start_date = st.date_input("Start Date", key="exec_start_date")
+        end_date = st.date_input("End Date", key="exec_end_date")
+
+        # ==============================
+        # 3️⃣ Filter Data
+        # ==============================
+        filtered_df = view_df[
+            (view_df['Date'] >= pd.to_datetime(start_date)) &
+            (view_df['Date'] <= pd.to_datetime(end_date))
+        ].copy()
+
+        if filtered_df.empty:
+            st.warning("No data available for the selected date range.")
+        else:
+
+            # -----------------------------
+            # KPIs, worker summary (only Flora & Jimmy blocks), tank/block risk summary
+            # -----------------------------
+            k = executive_kpis(filtered_df)
+            worker_summary = executive_worker_summary(filtered_df)
+            tank_summary = tank_status_summary(filtered_df, 'WorkerName')
+            tank_summary['Worker_Label'] = tank_summary['Block'].map(assign_worker)
+
+            # -----------------------------
+            # 4️⃣ Generate PDF
+            # -----------------------------
+            # reportlab is only imported when someone actually downloads the PDF
+            def build_pdf():
+                from reportlab.pdfgen import canvas
+                from reportlab.lib.pagesizes import A4
+                from reportlab.lib import colors
+                from shrimp.pdf import draw_wrapped_text
+
+                pdf_buffer = BytesIO()
+                c = canvas.Canvas(pdf_buffer, pagesize=A4)
+                width, height = A4
+
+                # Title & Info
+                c.setFont("Times-Bold", 18)
+                c.drawCentredString(width/2, height-50, "🦐PJ Site Executive Summary Report🦐")
+                c.setFont("Times-Roman", 12)
+                c.drawString(50, height-80, f"Reporting Period: {start_date} to {end_date}")
+                c.drawString(50, height-100, "Prepared By: Sai")
+                c.drawString(50, height-120, "Data Source: Shrimp Farm Dashboard")
+
+                # KPIs
+                c.setFont("Times-Bold", 14)
+                c.drawString(50, height-150, "1️⃣ Key KPIs")
+                y = height-170
+                for line in [
+                    f"Total Feed Scheduled: {k['total_feed_scheduled']:.2f} kg",
+                    f"Total Feed Actual: {k['total_feed_actual']:.2f} kg",
+                    f"Total Leftover Feed: {k['total_leftover_feed']:.2f} kg",
+                    f"Total Mortality: {k['total_mortality']} shrimps ({k['mortality_pct']:.1f}%)",
+                    f"pH Compliance: {k['ph_compliance']}%",
+                    f"Salinity Compliance: {k['salinity_compliance']}%"
+                ]:
+                    c.setFont("Times-Roman", 12)
+                    c.drawString(70, y, line)
+                    y -= 18
+
+                # Worker Performance (Flora & Jimmy only)
+                c.setFont("Times-Bold", 14)
+                c.drawString(50, y-10, "2️⃣ Worker Performance Summary")
+                y -= 30
+                for _, row in worker_summary.iterrows():
+                    c.setFont("Times-Bold", 12)
+                    c.drawString(60, y, f"Worker: {row['WorkerName']}")
+                    y -= 18
+                    c.setFont("Times-Roman", 12)
+                    bullets = [
+                        f"• Scheduled Feed (kg): {row['ScheduledFeed_kg']}",
+                        f"• Actual Feed (kg): {row['ActualFeed_kg']}",
+                        f"• Leftover Feed (kg): {row['Leftover_kg']}",
+                        f"• Dead Count: {row['Dead_Count']}",
+                        f"• Dead Weight (g): {round(row['Dead_Weight_g'],2)}",
+                        f"• Mortality %: {row['Mortality_%']}%",
+                        f"• Blocks Managed: {row['Total_Blocks']}",
+                        f"• pH Compliance: {row['pH_%']}%",
+                        f"• Salinity Compliance: {row['Salinity_%']}%"
+                    ]
+                    for b in bullets:
+                        c.drawString(80, y, b)
+                        y -= 16
+                    y -= 8
+
+                # Tank/Block Risk Summary by Worker_Label
+                c.setFont("Times-Bold", 14)
+                c.drawString(50, y-10, "3️⃣ Tank/Block Risk Summary")
+                y -= 30
+
+                for worker in ["Flora","Jimmy","Other"]:
+                    worker_df = tank_summary[tank_summary['Worker_Label']==worker]
+                    if not worker_df.empty:
+                        c.setFont("Times-Bold", 12)
+                        c.drawString(60, y, f"Worker: {worker}")
+                        y -= 18
+                        for _, t in worker_df.iterrows():
+                            x_pos = 80
+                            c.setFont("Times-Roman", 12)
+                            c.drawString(x_pos, y, f"• Tank/Block: {t['Tank']}/{t['Block']}")
+                            x_pos += 130
+
+                            colors_map = {"✅": colors.green, "⚠": colors.orange, "🔴": colors.red}
+                            symbol_spacing = 20
+                            label_spacing = 50
+
+                            for status, label in zip([t['pH_status'], t['Sal_status'], t['Temp_status'], t['Mort_status']],
+                                                     ["pH", "Salinity", "Temp", "Mortality"]):
+                                c.setFont("Times-Bold", 12)
+                                c.setFillColor(colors_map[status])
+                                c.drawString(x_pos, y, status)
+                                x_pos += symbol_spacing
+
+                                c.setFont("Times-Roman", 12)
+                                c.setFillColor(colors.black)
+                                c.drawString(x_pos, y, label)
+                                x_pos += label_spacing
+
+                            y -= 16
+                            if y < 100:
+                                c.showPage()
+                                y = height-50
+
+                # Action Plan / Recommendations (all blocks)
+                c.setFont("Times-Bold", 14)
+                c.drawString(50, y-10, "4️⃣ Action Plan / Recommendations")
+                y -= 30
+                c.setFont("Times-Bold", 12)
+                c.drawString(70, y, "Tank/Block")
+                c.drawString(180, y, "Parameter")
+                c.drawString(240, y, "Value")
+                c.drawString(280, y, "Status")
+                c.drawString(350, y, "Recommended Action")
+                y -= 20
+                c.setFont("Times-Roman", 12)
+
+                for _, t in tank_summary.iterrows():
+                    for status, param, val in zip([t['pH_status'], t['Sal_status'], t['Temp_status'], t['Mort_status']],
+                                                 ["pH","Salinity","Temp","Mortality"],
+                                                 [t['pH'], t['Salinity'], t['WaterTemperature'], t['DeadCount_day']]):
+                        if status != "✅":
+                            c.drawString(70, y, f"{t['Tank']}/{t['Block']}")
+                            c.drawString(180, y, param)
+                            c.drawString(240, y, str(val))
+                            c.setFillColor(colors_map[status])
+                            c.drawString(280, y, status)
+                            c.setFillColor(colors.black)
+
+                            if param == "pH":
+                                action = "Follow SOP: maintain pH between 7.6–8.3"
+                            elif param == "Salinity":
+                                action = "Follow SOP: maintain salinity between 25–30 ppt"
+                            elif param == "Temp":
+                                action = "Follow SOP: maintain temperature between 28–30°C"
+                            else:
+                                action = "Follow SOP: investigate cause and monitor mortality"
+
+                            y = draw_wrapped_text(c, action, 350, y, max_width=200, line_height=16)
+
+                        if y < 100:
+                            c.showPage()
+                            y = height-50
+                            c.setFont("Times-Roman", 12)
+
+                c.save()
+                return pdf_buffer.getvalue()
+
+            st.download_button(
+                label="⬇️ Download Executive Summary PDF",
+                data=traced("export.executive_pdf")(build_pdf),
+                file_name="PJ_Site_Executive_Summary.pdf",
+                mime="application/pdf"
+            )
+
+
+executive_summary_section(current_view_df())
@@ -0,0 +1,56 @@
+import streamlit as st
+
+from shrimp.data import data_version, feed_plan
+from shrimp.exports import feed_plan_csv, feed_plan_excel
+from shrimp.feed import FEED_RATE_TABLE, LEFTOVER_DAYS, feed_sheet
+from shrimp.filters import current_selection, selected_tanks
+from shrimp.instrument import span
+from shrimp.timing import timed_section
+
+
+# =============================
+# 🍽️ NEXT-DAY FEED PLAN
+# =============================
+# Rebuilt once per data version for all tanks; the Block / Tank filters in
+# the sidebar only narrow what is shown and downloaded.
+@st.fragment
+def feed_plan_section(selection):
+    st.title("🍽️ Feed Plan")
+    with timed_section("Feed plan"):
+        try:
+            plan = feed_plan(data_version())
+        except Exception as e:
+            st.warning(f"Feed plan unavailable: {e}")
+            return
+        plan = selected_tanks(plan, selection)
+        if plan.empty:
+            scope = "" if selection['block'] == selection['tank'] == "All" else " in the selected Block / Tank"
+            st.info(f"No running tank with an ABW sample to plan feed for{scope}.")
+            return
+
+        feed_date = plan['Date'].max().date()
+        f1, f2, f3 = st.columns(3)
+        f1.metric("Feed date", str(feed_date))
+        f2.metric("Tanks", len(plan))
+        total, scheduled = plan['Recommended_g'].sum() / 1000, plan['Scheduled_today_g'].sum() / 1000
+        f3.metric("Recommended feed (kg)", round(total, 1),
+                  f"{total - scheduled:+.1f} kg vs scheduled today" if scheduled else None, delta_color="off")
+
+        sheet = feed_sheet(plan)
+        with span("render.feed_plan", len(sheet)):
+            st.dataframe(sheet, hide_index=True, use_container_width=True, height=min(600, 38 + 35 * len(sheet)))
+        st.caption(f"Recommended = biomass tomorrow × feed rate for its ABW × share eaten over the last "
+                   f"{LEFTOVER_DAYS} days × water-quality penalties (listed under Adjustments).")
+
+        d1, d2, _ = st.columns([1, 1, 4])
+        d1.download_button("📥 Feed sheet (Excel)", lambda: feed_plan_excel(sheet), f"Feed_Plan_{feed_date}.xlsx",
+                           "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+        d2.download_button("📄 Feed sheet (CSV)", lambda: feed_plan_csv(sheet), f"Feed_Plan_{feed_date}.csv",
+                           "text/csv")
+
+        with st.expander("Feed-rate table"):
+            st.dataframe(FEED_RATE_TABLE.rename(columns={'ABW_g': "ABW (g)", 'Rate_pct': "Feed rate (% of biomass/day)"}),
+                         hide_index=True)
+
+
+feed_plan_section(current_selection())
@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+import streamlit as st
+
+from shrimp import data
+from shrimp.filters import current_selection
+from shrimp.heatmap import HEATMAP_METRICS, HEATMAP_MIDPOINTS, heatmap_slice, pivot_store
+from shrimp.timing import timed_section
+
+DEFAULT_WINDOW_DAYS = 90
+
+
+# =============================
+# 🗺️ BLOCK × DATE HEATMAP
+# =============================
+# Follows the sidebar Block / Tank filter; the date window is chosen here so
+# the whole history stays reachable whatever view mode is selected.
+@st.fragment
+def heatmap_section(selection):
+    import plotly.graph_objects as go
+
+    with timed_section("Heatmap"):
+        st.title("🗺️ Farm Heatmap (Block × Date)")
+        store = pivot_store(data.data_version(), data.get_farm_log())
+        dates = store['dates']
+        if len(dates) == 0 or not store['labels']:
+            st.info("No data available.")
+            return
+
+        metric = st.radio("Metric", list(HEATMAP_METRICS), horizontal=True, key="heatmap_metric")
+        first, last = dates[0].date(), dates[-1].date()
+        default_start = max(first, last - timedelta(days=DEFAULT_WINDOW_DAYS))
+        if first < last:
+            start, end = st.slider("Date window", min_value=first, max_value=last,
+                                   value=(default_start, last), key="heatmap_window")
+        else:
+            start, end = first, last
+
+        matrix, labels, window = heatmap_slice(store, metric, selection['block'], selection['tank'], start, end)
+        if matrix.size == 0:
+            st.info("No data available for selected filters.")
+            return
+
+        colorscale = HEATMAP_METRICS[metric][2]
+        fig = go.Figure(go.Heatmap(
+            z=matrix,
+            x=window,
+            y=labels,
+            colorscale=colorscale,
+            zmid=HEATMAP_MIDPOINTS.get(metric),
+            hoverongaps=False,
+            hovertemplate="%{y}<br>%{x|%Y-%m-%d}<br>" + metric + ": %{z:.2f}<extra></extra>",
+            colorbar=dict(title=metric),
+        ))
+        fig.update_layout(
+            height=max(300, 22 * len(labels) + 120),
+            yaxis=dict(autorange='reversed', title="Block | Tank"),
+            xaxis=dict(title="Date"),
+            margin=dict(t=30),
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"{len(labels)} tanks × {len(window)} days · empty cells have no log entry")
+
+
+heatmap_section(current_selection())
@@ -0,0 +1,110 @@
+import math
+
+import pandas as pd
+import streamlit as st
+
+from shrimp.data import data_version, mortality_risk, risk_model_version, water_drift
+from shrimp.filters import current_selection, current_view_df, selection_key
+from shrimp.instrument import span
+from shrimp.drift import PARAMS
+from shrimp.metrics import ALERT_LEVELS
+from shrimp.mortality import EVENT_DEAD, EXPLAIN_DAYS, RISK_WARN
+from shrimp.risk import STYLED_COLUMNS, query_risk_table, risk_table, style_page
+from shrimp.timing import timed_section
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+# =============================
+# 6️⃣ RISK TABLE (Fixed for TypeError)
+# =============================
+# The full table is built once per data version and filter selection; sort,
+# filter and paging happen on that cached frame and only the visible page is
+# styled and sent to the browser.
+@st.fragment
+def risk_section(view_df, selection):
+    with timed_section("Risk table"):
+        if view_df.empty:
+            st.info("No data available for selected filters.")
+            return
+
+        version, model_version = data_version(), risk_model_version()
+        try:
+            risk = mortality_risk(version, model_version)
+        except Exception as e:
+            st.warning(f"Mortality-risk scores unavailable: {e}")
+            risk = None
+        try:
+            drift_events = water_drift(version)
+        except Exception as e:
+            st.warning(f"Water-quality drift unavailable: {e}")
+            drift_events = None
+        table = risk_table(version, selection_key(selection), view_df, model_version, risk, drift_events)
+        columns = [c for c in table.columns if c not in STYLED_COLUMNS.values()]
+
+        st.subheader("Tank Risk & Alerts")
+        c1, c2, c3, c4 = st.columns([2, 2, 2, 1])
+        levels = c1.multiselect("Alert level", ALERT_LEVELS, key="risk_levels")
+        search = c2.text_input("Search Block / Tank / details", key="risk_search")
+        sort_by = c3.selectbox("Sort by", columns, key="risk_sort_by")
+        descending = c4.checkbox("Descending", value=True, key="risk_descending")
+
+        result = query_risk_table(table, levels, search.strip(), sort_by, descending)
+        if result.empty:
+            st.info("No rows match the risk table filters.")
+            return
+
+        p1, p2, _ = st.columns([1, 1, 4])
+        page_size = p1.selectbox("Rows per page", PAGE_SIZES, key="risk_page_size")
+        n_pages = math.ceil(len(result) / page_size)
+        page_no = p2.number_input("Page", min_value=1, max_value=n_pages, value=1, key="risk_page")
+        page_no = min(page_no, n_pages)
+
+        start = (page_no - 1) * page_size
+        page = result.iloc[start:start + page_size]
+        with span("render.risk_page", len(page)):
+            st.dataframe(style_page(page), height=min(500, 38 + 35 * len(page)), hide_index=True)
+        st.caption(f"Rows {start + 1}–{start + len(page)} of {len(result)} (page {page_no} of {n_pages})")
+        st.caption(f"Water Drift: {', '.join(PARAMS)} moving steadily away from the tank's own recent level "
+                   "(CUSUM), flagged before the alert bands are crossed.")
+        if risk is None:
+            st.caption("Risk Tomorrow is empty until a mortality-risk model is trained: "
+                       "`python scripts/train_risk.py`.")
+            return
+        st.caption(f"Risk Tomorrow: chance of more than {EVENT_DEAD} dead shrimp in the tank the next day "
+                   f"(model {model_version}).")
+        explanation_panel(risk['explanations'])
+
+
+def explanation_panel(explanations):
+    """What drove a flagged tank's risk: precomputed SHAP values, no model call here."""
+    import plotly.express as px
+
+    flagged = explanations[explanations['Risk_Tomorrow'] >= RISK_WARN].sort_values(
+        ['Date', 'Risk_Tomorrow'], ascending=False)
+    st.subheader("Why is this tank at risk?")
+    if flagged.empty:
+        st.info(f"No tank scored {RISK_WARN:.0%} or more in the last {EXPLAIN_DAYS} days.")
+        return
+    labels = (flagged['Tank'] + " | " + flagged['Block'] + " — " + flagged['Date'].dt.strftime("%Y-%m-%d")
+              + " (" + (flagged['Risk_Tomorrow'] * 100).round(1).astype(str) + " %)")
+    pick = st.selectbox("Flagged tank and day", labels.tolist(), key="risk_explain")
+    row = flagged.iloc[labels.tolist().index(pick)]
+
+    drivers = [c for c in explanations.columns if c.startswith("Driver ")]
+    by_driver = pd.DataFrame({'Driver': [c[len("Driver "):] for c in drivers],
+                              'Effect': row[drivers].to_numpy(float)}).sort_values('Effect')
+    fig = px.bar(by_driver, x='Effect', y='Driver', orientation='h', color=by_driver['Effect'] > 0,
+                 color_discrete_map={True: "#FF0000", False: "#2E8B57"},
+                 labels={'Effect': "Effect on risk (log-odds)", 'color': "Raises risk"})
+    fig.update_layout(showlegend=False, height=320)
+    st.plotly_chart(fig, use_container_width=True, key="risk_explain_chart")
+
+    names = [c[len("SHAP "):] for c in explanations.columns if c.startswith("SHAP ")]
+    detail = pd.DataFrame({'Feature': names, 'Value': row[names].to_numpy(float),
+                           'Effect': row[[f"SHAP {n}" for n in names]].to_numpy(float)})
+    detail = detail.reindex(detail['Effect'].abs().sort_values(ascending=False).index)
+    st.dataframe(detail.round(3), hide_index=True, use_container_width=True)
+
+
+risk_section(current_view_df(), current_selection())
@@ -0,0 +1,122 @@
+# ==============================
+# 🦐 Shrimp Farm Scorecard – Unified Streamlit App
+# ==============================
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+
+from shrimp.data import get_abw
+from shrimp.exports import scorecard_excel, scorecard_pdf
+from shrimp.filters import compare_mode, current_view_df, selected_log
+from shrimp.metrics import consolidated_report, get_target_weight, scorecard_log, window_scorecard, worker_report
+from shrimp.periods import (LEVELS, PERIOD_FREQS, TREND_METRICS, compare_periods, compare_report, period_scorecard,
+                            scorecard_periods)
+from shrimp.timing import timed_section
+
+
+def trend_section(aligned, start_date, end_date):
+    import plotly.express as px
+
+    st.subheader("📈 Period Trends")
+    t1, t2, t3 = st.columns(3)
+    freq = t1.radio("Period", PERIOD_FREQS, horizontal=True, key="scorecard_trend_freq")
+    level = t2.selectbox("Level", LEVELS, index=1, key="scorecard_trend_level")
+    metric = t3.selectbox("Metric", TREND_METRICS, key="scorecard_trend_metric")
+
+    trend = period_scorecard(aligned, scorecard_periods(start_date, end_date, freq))
+    shown = trend[(trend['Level'] == level) & (trend['Metric'] == metric)]
+    if shown['Value'].notna().sum() == 0:
+        st.info(f"No {metric} in any {freq.lower()} period of the selected range.")
+        return
+    fig = px.line(shown, x='Start', y='Value', color='Entity', markers=True,
+                  hover_data=['Period', 'Status', 'Change'], labels={'Start': freq[:-2], 'Value': metric})
+    st.plotly_chart(fig, use_container_width=True, key="scorecard_trend")
+
+    # Latest period against the one before it
+    latest = shown[shown['Period'] == shown['Period'].iloc[-1]]
+    st.dataframe(latest[['Period', 'Entity', 'Value', 'Change', 'Status']].set_index('Entity'),
+                 use_container_width=True)
+
+
+def compare_section(abw_df, start_date, end_date):
+    """Farm and worker scorecards against the window of the same length just before."""
+    periods = compare_periods(start_date, end_date)
+    (baseline_start, baseline_end), (_, end) = periods
+    # The sidebar's window rarely reaches back to the baseline: both windows
+    # come from one query of their own dates and are scored in one pass
+    aligned = scorecard_log(selected_log(baseline_start, end), abw_df)
+    table = period_scorecard(aligned, periods)
+
+    st.subheader("Compared with the Previous Period")
+    st.caption(f"Δ: change from {baseline_start.date()} to {baseline_end.date()}")
+    st.table(compare_report(table, "Farm"))
+    st.table(compare_report(table, "Worker"))
+
+
+@st.fragment
+def scorecard_section(view_df):
+    st.title("🦐 Shrimp Farm Performance Scorecard")
+    try:
+        abw_df = get_abw()
+    except Exception as e:
+        st.error(f"ABW Excel Load Error: {e}")
+        return
+
+    with timed_section("ABW scorecard"):
+        # Date Selectors
+        c1, c2 = st.columns(2)
+        with c1:
+            start_date = st.date_input("Start Date", key="scorecard_start_date", value=abw_df['Date'].min() if not abw_df.empty else datetime.today())
+        with c2:
+            end_date = st.date_input("End Date", key="scorecard_end_date", value=abw_df['Date'].max() if not abw_df.empty else datetime.today())
+
+        # -----------------------------
+        # 3. CORE PROCESSING (Restored Original Logic)
+        # -----------------------------
+        if not abw_df.empty:
+            days_elapsed = max((pd.to_datetime(end_date) - pd.to_datetime(start_date)).days, 1)
+            current_target_abw = get_target_weight(days_elapsed)
+
+            # Per-tank ABW / biomass / FCR rollup (shared with the JSON API); the
+            # aligned log is kept for the period trends below
+            aligned = scorecard_log(view_df, abw_df)
+            tank_df = window_scorecard(aligned, start_date, end_date)
+            if tank_df.empty:
+                st.warning("No data found for the selected date range.")
+                return
+
+            # -----------------------------
+            # 4. FARM CONSOLIDATED REPORT & WORKER SUMMARY
+            # -----------------------------
+            consolidated_v = consolidated_report(tank_df, current_target_abw)
+            worker_v = worker_report(tank_df, current_target_abw)
+
+            # -----------------------------
+            # 6. DASHBOARD DISPLAY
+            # -----------------------------
+            st.subheader("PJ Site Score Card")
+            st.table(consolidated_v)
+            st.subheader("Worker Summary")
+            st.table(worker_v)
+            if compare_mode():
+                compare_section(abw_df, start_date, end_date)
+
+            # Detailed Tank view - we also drop the columns here for visual consistency
+            st.subheader("Detailed Tank Scorecard")
+            st.dataframe(tank_df.drop(columns=['InitialCount', 'LiveCount']), use_container_width=True)
+
+            # -----------------------------
+            # 5. PERIOD TRENDS
+            # -----------------------------
+            # Every week / month of the range scored in one pass
+            trend_section(aligned, start_date, end_date)
+
+            # -----------------------------
+            # 7. EXCEL & PDF EXPORT
+            # -----------------------------
+            # Both reports are built only when their download button is clicked
+            st.download_button("📥 Download Excel Report", lambda: scorecard_excel(tank_df, worker_v, consolidated_v), f"Shrimp_Farm_Report_{end_date}.xlsx","application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+            st.download_button("📄 Download PDF Report", lambda: scorecard_pdf(consolidated_v, worker_v, start_date, end_date), "Farm_Report.pdf","application/pdf")
+
+
+scorecard_section(current_view_df())
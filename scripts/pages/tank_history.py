@@ -0,0 +1,158 @@
+import pandas as pd
+import streamlit as st
+
+from shrimp.data import daily_growth_table, data_version, growth_forecast
+from shrimp.forecast import HARVEST_ABW_G, harvest_dates
+from shrimp.filters import current_selection
+from shrimp.store import load_partition, partitions
+from shrimp.timing import timed_section
+
+
+def pick_tank(version, selection):
+    """Block / Tank selectboxes, defaulting to the sidebar filter when it names one tank."""
+    keys = partitions(version)
+    blocks = sorted({b for b, _ in keys})
+    block_default = blocks.index(selection['block']) if selection['block'] in blocks else 0
+    c1, c2 = st.columns(2)
+    block = c1.selectbox("Block", blocks, index=block_default, key="drill_block")
+    tanks = sorted(t for b, t in keys if b == block)
+    tank_default = tanks.index(selection['tank']) if selection['tank'] in tanks else 0
+    tank = c2.selectbox("Tank", tanks, index=tank_default, key="drill_tank")
+    return block, tank
+
+
+# =============================
+# 🔎 TANK DRILL-DOWN
+# =============================
+@st.fragment
+def tank_history_section(selection):
+    import plotly.express as px
+
+    st.title("🔎 Tank History")
+    version = data_version()
+    block, tank = pick_tank(version, selection)
+
+    with timed_section("Tank history"):
+        log = load_partition(version, "farm_log", block, tank)
+        abw = load_partition(version, "abw", block, tank)
+        if log.empty:
+            st.info("No data available for this tank.")
+            return
+
+        first, last = log['Date'].min().date(), log['Date'].max().date()
+        k1, k2, k3, k4 = st.columns(4)
+        k1.metric("Days logged", log['Date'].dt.date.nunique(), f"{first} → {last}", delta_color="off")
+        k2.metric("Total Feed (kg)", round(log['ActualFeed_day_g'].sum() / 1000, 2))
+        k3.metric("Total Dead", int(pd.to_numeric(log['DeadCount_day'], errors='coerce').fillna(0).sum()))
+        k4.metric("Latest ABW (g)", round(abw['Avg Weight'].dropna().iloc[-1], 2) if not abw.empty and abw['Avg Weight'].notna().any() else "—")
+
+        # ----------------------------
+        # Feed
+        # ----------------------------
+        st.subheader("Feed")
+        df_feed = log.melt(id_vars=['Date'], value_vars=['ScheduledFeed_day_g', 'ActualFeed_day_g', 'LeftoverFeed_g'],
+                           var_name='Metric', value_name='Value')
+        st.plotly_chart(px.line(df_feed, x='Date', y='Value', color='Metric', markers=True,
+                                labels={'Value': 'Feed (g)', 'Metric': 'Parameter'}), use_container_width=True)
+
+        # ----------------------------
+        # Deaths
+        # ----------------------------
+        st.subheader("Mortality")
+        st.plotly_chart(px.bar(log, x='Date', y='DeadCount_day', hover_data=['WorkerName', 'DeadWeight_g'],
+                               labels={'DeadCount_day': 'Dead Shrimp'}), use_container_width=True)
+
+        # ----------------------------
+        # Water quality
+        # ----------------------------
+        st.subheader("Water Quality")
+        df_wq = log.melt(id_vars=['Date'], value_vars=['pH', 'Salinity', 'WaterTemperature'],
+                         var_name='Metric', value_name='Value')
+        fig_wq = px.line(df_wq, x='Date', y='Value', facet_row='Metric', markers=True, height=600)
+        fig_wq.update_yaxes(matches=None)
+        fig_wq.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+        st.plotly_chart(fig_wq, use_container_width=True)
+
+        # ----------------------------
+        # ABW samples
+        # ----------------------------
+        st.subheader("Average Body Weight")
+        if abw.empty:
+            st.info("No ABW samples for this tank.")
+        else:
+            size_cols = [c for c in ['Avg Weight', 'S-Weight', 'M-Weight', 'L-Weight'] if c in abw.columns]
+            df_abw = abw.melt(id_vars=['Date'], value_vars=size_cols, var_name='Metric', value_name='Weight (g)')
+            st.plotly_chart(px.line(df_abw, x='Date', y='Weight (g)', color='Metric', markers=True),
+                            use_container_width=True)
+
+        # ----------------------------
+        # Daily biomass & FCR
+        # ----------------------------
+        st.subheader("Daily Biomass & FCR")
+        try:
+            growth_df = daily_growth_table(version)
+        except Exception as e:
+            st.info(f"Daily growth unavailable: {e}")
+            return
+        tank_growth = growth_df[(growth_df['Block'] == str(block).strip().upper())
+                                & (growth_df['Tank'] == str(tank).strip().upper())]
+        if not tank_growth['ABW'].notna().any():
+            st.info("No ABW samples during this tank's batches.")
+        else:
+            df_growth = tank_growth.melt(id_vars=['Date', 'Batch ID', 'ABW_Source'],
+                                         value_vars=['ABW', 'Biomass_kg', 'Cum_FCR'],
+                                         var_name='Metric', value_name='Value')
+            fig_growth = px.line(df_growth, x='Date', y='Value', color='Batch ID', facet_row='Metric',
+                                 hover_data=['ABW_Source'], height=600)
+            fig_growth.update_yaxes(matches=None)
+            fig_growth.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+            st.plotly_chart(fig_growth, use_container_width=True)
+            st.caption("ABW between samplings is interpolated log-linearly and held up to "
+                       "two weeks after the last one; FCR counts feed from each batch's first weighing.")
+
+        harvest_section(version, block, tank)
+
+
+def harvest_section(version, block, tank):
+    import plotly.graph_objects as go
+
+    st.subheader("Growth & Harvest Forecast")
+    try:
+        daily = growth_forecast(version)
+    except Exception as e:
+        st.info(f"Growth forecast unavailable: {e}")
+        return
+    market = st.number_input("Market size (g)", min_value=1.0, value=HARVEST_ABW_G, step=1.0, key="harvest_abw")
+    harvest = harvest_dates(daily, market)
+
+    key = (str(block).strip().upper(), str(tank).strip().upper())
+    tank_daily = daily[(daily['Block'] == key[0]) & (daily['Tank'] == key[1])]
+    if tank_daily.empty:
+        st.info("No forecast for this tank: it needs at least three ABW samples in a batch still running.")
+    else:
+        row = harvest[(harvest['Block'] == key[0]) & (harvest['Tank'] == key[1])].iloc[0]
+        h1, h2, h3 = st.columns(3)
+        if pd.isna(row['Harvest_Date']):
+            h1.metric("Harvest date", "beyond forecast")
+        else:
+            h1.metric("Harvest date", str(row['Harvest_Date'].date()), f"in {int(row['Days_to_harvest'])} days",
+                      delta_color="off")
+        early, late = row['Harvest_Early'], row['Harvest_Late']
+        h2.metric("80 % range", f"{early.date() if pd.notna(early) else '—'} → {late.date() if pd.notna(late) else '—'}")
+        h3.metric("Biomass at harvest (kg)", row['Biomass_at_harvest_kg'] if pd.notna(row['Biomass_at_harvest_kg']) else "—")
+
+        fig = go.Figure([
+            go.Scatter(x=tank_daily['Date'], y=tank_daily['ABW_hi'], line=dict(width=0), showlegend=False),
+            go.Scatter(x=tank_daily['Date'], y=tank_daily['ABW_lo'], line=dict(width=0), fill='tonexty',
+                       name="80 % band"),
+            go.Scatter(x=tank_daily['Date'], y=tank_daily['ABW'], name="Forecast ABW"),
+        ])
+        fig.add_hline(y=market, line_dash="dot", annotation_text="market size")
+        fig.update_layout(yaxis_title="ABW (g)")
+        st.plotly_chart(fig, use_container_width=True, key="harvest_forecast")
+
+    with st.expander("Harvest forecast for all tanks"):
+        st.dataframe(harvest.round({'ABW_now': 2}), use_container_width=True, hide_index=True)
+
+
+tank_history_section(current_selection())
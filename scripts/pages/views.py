@@ -0,0 +1,207 @@
+import pandas as pd
+import streamlit as st
+
+from shrimp import metrics
+from shrimp.charts import render_charts, view_charts
+from shrimp.data import data_version
+from shrimp.filters import (baseline_label, compare_mode, current_compare_df, current_selection, current_view_df,
+                            selection_key)
+from shrimp.timing import timed_section
+
+
+# =============================
+# COMPARE MODE
+# =============================
+# Tiles where a rise is bad news, shown red
+RISE_IS_WORSE = {"leftover_feed_g", "leftover_feed_kg", "mortality_pct", "dead_count", "dead_weight_g"}
+
+
+def delta(changes, key):
+    """Δ (Δ %) text for a tile, or None outside compare mode / without a baseline value."""
+    if changes is None or pd.isna(changes.at[key, "Δ"]):
+        return None
+    d, pct = changes.at[key, "Δ"], changes.at[key, "Δ %"]
+    text = f"{d:+,.0f}" if float(d).is_integer() else f"{d:+,.2f}"
+    return text if pd.isna(pct) else f"{text} ({pct:+.1f}%)"
+
+
+def tile(col, label, value, changes, key):
+    col.metric(label, value, delta=delta(changes, key),
+               delta_color="inverse" if key in RISE_IS_WORSE else "normal")
+
+
+def compare_caption(compare_df):
+    if compare_df is not None:
+        st.caption(f"Δ: change from the previous period ({baseline_label(current_selection())})")
+    elif compare_mode():
+        st.caption("Select a single date, week or month to compare it with the one before.")
+
+
+# =============================
+# 4️⃣ DAILY VIEW
+# =============================
+def kpi_tiles(k, dead_label="Dead Count", changes=None):
+    col1, col2, col3, col4, col5, col6 = st.columns(6)
+    if k["rows"]:
+        tile(col1, "Feed (g)", k["feed_g"], changes, "feed_g")
+        tile(col2, "Feed (kg)", k["feed_kg"], changes, "feed_kg")
+        tile(col3, "Leftover Feed (g)", k["leftover_feed_g"], changes, "leftover_feed_g")
+        tile(col4, "Leftover Feed (kg)", k["leftover_feed_kg"], changes, "leftover_feed_kg")
+        tile(col5, "Mortality %", k["mortality_pct"], changes, "mortality_pct")
+        tile(col6, dead_label, k["dead_count"], changes, "dead_count")
+    else:
+        for c in [col1, col2, col3, col4, col5, col6]:
+            c.metric("No Data","No Data")
+
+
+WORKER_COLUMNS = ['pH_%','Salinity_%','ScheduledFeed_kg','ActualFeed_kg','Leftover_kg','Dead_Count','Dead_Weight_g']
+
+
+def kpi_changes(compare_df):
+    # Both windows' tile numbers from one grouped pass
+    if compare_df is None:
+        return None
+    return metrics.compare_kpis(metrics.kpi_table(compare_df, by='Window'), metrics.KPI_NUMBERS)
+
+
+def worker_table(view_df, compare_df, **kwargs):
+    """Worker rows, with Δ / Δ % columns against the baseline window in compare mode."""
+    if compare_df is None:
+        return metrics.worker_summary(view_df, **kwargs)
+    summary = metrics.worker_summary(compare_df, by='Window')
+    return metrics.compare_rows(summary, ['Worker_Display'], WORKER_COLUMNS)
+
+
+def compare_columns(columns, compare_df):
+    if compare_df is None:
+        return columns
+    return [c for col in columns for c in (col, f"{col} Δ", f"{col} Δ %")]
+
+
+def render_daily_view(view_df, charts, compare_df=None):
+    st.title("🦐 Shrimp Farm Dashboard (Daily)")
+    compare_caption(compare_df)
+
+    # ----------------------------
+    # Feed & mortality KPIs
+    # ----------------------------
+    k = metrics.tile_kpis(view_df)
+    kpi_tiles(k, changes=kpi_changes(compare_df))
+
+    # ----------------------------
+    # Worker performance & compliance (only 6 blocks)
+    # ----------------------------
+    worker_summary = worker_table(view_df, compare_df)
+    st.subheader("Worker Performance & Water Quality Compliance (Daily)")
+    st.dataframe(worker_summary[['Worker_Display'] + compare_columns(WORKER_COLUMNS, compare_df)], use_container_width=True)
+
+    render_charts(charts)
+
+
+# =============================
+# 5️⃣ WEEKLY VIEW
+# =============================
+def render_weekly_view(view_df, charts, week_start, week_end, selected_week, compare_df=None):
+    st.title("🦐 Shrimp Farm Dashboard (Weekly)")
+    compare_caption(compare_df)
+
+    # --------------------------
+    # Top metrics summary
+    # --------------------------
+    k = metrics.tile_kpis(view_df)
+    kpi_tiles(k, dead_label="DeadCount", changes=kpi_changes(compare_df))
+
+    # --------------------------
+    # Worker performance & compliance
+    # --------------------------
+    st.subheader("Weekly Worker Performance & Compliance")
+    # A compared week is one window, so its rows need no Week column
+    by_week = selected_week != "All" and compare_df is None
+    worker_summary_weekly = worker_table(view_df, compare_df, by_week=by_week)
+    group_cols = ['Week', 'Worker_Display'] if by_week else ['Worker_Display']
+    st.dataframe(worker_summary_weekly[group_cols + compare_columns(WORKER_COLUMNS, compare_df)], use_container_width=True)
+
+    render_charts(charts)
+
+# =============================
+# 6️⃣ MONTHLY VIEW
+# =============================
+MONTHLY_NUMBERS = ["feed_kg", "scheduled_feed_kg", "leftover_feed_kg", "dead_count", "dead_weight_g", "mortality_pct"]
+
+
+def render_monthly_view(view_df, charts, compare_df=None):
+    st.title("🦐 Shrimp Farm Dashboard (Monthly)")
+    compare_caption(compare_df)
+
+    if compare_df is None:
+        monthly_df = metrics.monthly_tank_summary(view_df)
+        monthly_k, changes = metrics.monthly_kpis(monthly_df), None
+    else:
+        # Tank rows of both months in one pass; tiles read the current month
+        monthly_df = metrics.monthly_tank_summary(compare_df, by='Window')
+        monthly_k = metrics.monthly_kpis(monthly_df, by='Window')
+        changes = metrics.compare_kpis(monthly_k, MONTHLY_NUMBERS)
+        monthly_k = monthly_k.loc[monthly_k.index == "Current"]
+
+    # Metrics summary
+    col1, col2, col3, col4, col5, col6 = st.columns(6)
+    if not monthly_k.empty:
+        k = monthly_k.iloc[0]
+        tile(col1, "Feed (kg)", f"{k['feed_kg']:.2f}", changes, "feed_kg")
+        tile(col2, "Scheduled Feed (kg)", f"{k['scheduled_feed_kg']:.2f}", changes, "scheduled_feed_kg")
+        tile(col3, "Leftover Feed (kg)", f"{k['leftover_feed_kg']:.2f}", changes, "leftover_feed_kg")
+        tile(col4, "Dead Count", k['dead_count'], changes, "dead_count")
+        tile(col5, "Dead Weight (g)", k['dead_weight_g'], changes, "dead_weight_g")
+        tile(col6, "Avg Mortality %", k['mortality_pct'], changes, "mortality_pct")
+    else:
+        for c in [col1, col2, col3, col4, col5, col6]:
+            c.metric("No Data","No Data")
+
+    # ----------------------------
+    # Monthly Worker Performance
+    # ----------------------------
+    worker_summary = worker_table(view_df, compare_df)
+    st.subheader("Worker Performance & Water Quality Compliance (Monthly)")
+    st.dataframe(worker_summary[['Worker_Display'] + compare_columns(WORKER_COLUMNS, compare_df)], use_container_width=True)
+
+    render_charts(charts)
+
+
+@st.fragment
+def view_section(view_df, selection, compare_df=None):
+    view_option = selection['view_option']
+    with timed_section(f"{view_option} view"):
+        view_df = view_df.copy()
+        # Charts are memoized per (data version, view mode, filters)
+        charts = view_charts(data_version(), view_option, selection_key(selection), view_df, selection['point_budget'])
+        if view_option == "Daily":
+            render_daily_view(view_df, charts, compare_df)
+        elif view_option == "Weekly":
+            render_weekly_view(view_df, charts, selection['week_start'], selection['week_end'], selection['week'],
+                               compare_df)
+        elif view_option == "Monthly":
+            render_monthly_view(view_df, charts, compare_df)
+
+
+# ==========================================
+# 1️⃣ PERFORMANCE TABLE (Daily / Weekly / Monthly)
+# ==========================================
+@st.fragment
+def performance_section(view_df, view_option):
+    with timed_section("Performance table"):
+        st.subheader("Block & Tank Performance Summary")
+        st.dataframe(metrics.performance_table(view_df, view_option))
+
+
+# =============================
+# 7️⃣ RENDER SECTIONS
+# =============================
+selection = current_selection()
+compare_df = current_compare_df() if compare_mode() else None
+if compare_df is None:
+    view_df = current_view_df()
+else:
+    # One query holds both windows; the current one is a slice of it
+    view_df = compare_df[compare_df['Window'] == "Current"].drop(columns='Window').reset_index(drop=True)
+view_section(view_df, selection, compare_df)
+performance_section(view_df, selection['view_option'])
@@ -0,0 +1 @@
+"""Shared code for the Shrimp Farm Dashboard pages."""
@@ -0,0 +1,407 @@
+"""
+Chart builders for the Daily / Weekly / Monthly views.
+
+Building a view's charts means melting the filtered frame, picking out the
+critical pH/salinity points and constructing the plotly / altair objects.
+``view_charts`` memoizes all of that per (data version, view mode, filter
+selection): an unchanged selection reuses the prepared frames, the plotly
+figures and the already-serialized vega-lite specs.
+
+Long daily line charts are thinned to the point budget with LTTB (critical
+points always kept) and drawn with WebGL traces once they stay large.
+"""
+import pandas as pd
+import streamlit as st
+
+from shrimp.downsample import DEFAULT_POINT_BUDGET, downsample_frame, use_webgl
+from shrimp.instrument import cached, span, traced
+
+DAILY_TANK_COLORS = {"T3": "purple", "T4": "darkblue", "T5": "green"}
+WEEKLY_TANK_COLORS = {"T3": "blue", "T4": "green", "T5": "red"}
+
+CRITICAL_HOVER = "Worker: %{customdata[0]}<br>Tank: %{customdata[1]}<br>Block: %{customdata[2]}<br>Parameter: %{customdata[3]}<br>Value: %{customdata[4]}"
+
+
+def x_label(df):
+    return df["Tank"].astype(str) + " | " + df["Block"].astype(str)
+
+
+def chart(title, kind, figure, empty="No data available."):
+    return {"title": title, "kind": kind, "figure": figure, "empty": empty}
+
+
+def vega_spec(altair_chart):
+    """Serialize an altair chart once, with its datasets already in Arrow form."""
+    import altair as alt
+    from streamlit import dataframe_util
+
+    with alt.data_transformers.enable("default", max_rows=None):
+        spec = altair_chart.to_dict()
+    spec["datasets"] = {
+        name: dataframe_util.convert_anything_to_arrow_bytes(pd.DataFrame(values))
+        for name, values in spec.get("datasets", {}).items()
+    }
+    return spec
+
+
+def critical_mask(df_melt, limits):
+    """True for rows outside the limits of their metric, e.g. {'pH': (7.6, 8.3)}."""
+    mask = pd.Series(False, index=df_melt.index)
+    for metric, (low, high) in limits.items():
+        mask |= (df_melt['Metric'] == metric) & ((df_melt['Value'] < low) | (df_melt['Value'] > high))
+    return mask
+
+
+def add_critical_markers(fig, df_melt, metric, low, high, color, name, webgl=False):
+    import plotly.graph_objects as go
+
+    scatter = go.Scattergl if webgl else go.Scatter
+    df_critical = df_melt[(df_melt['Metric'] == metric) & ((df_melt['Value'] < low) | (df_melt['Value'] > high))]
+    fig.add_trace(scatter(
+        x=df_critical['X_label'],
+        y=df_critical['Value'],
+        mode='markers',
+        marker=dict(color=color, size=12, symbol='x'),
+        name=name,
+        hovertemplate=CRITICAL_HOVER,
+        customdata=df_critical[['WorkerName','Tank','Block','Metric','Value']]
+    ))
+    return df_critical
+
+
+# =============================
+# 4️⃣ DAILY VIEW
+# =============================
+@traced("charts.daily")
+def daily_charts(view_df, point_budget=DEFAULT_POINT_BUDGET):
+    import plotly.express as px
+    import altair as alt
+
+    charts, frames = [], {}
+
+    # ----------------------------
+    # Water quality plot (all blocks)
+    # ----------------------------
+    df_plot = view_df.copy()  # Use full dataset for graphs
+    fig = None
+    if not df_plot.empty:
+        df_plot["X_label"] = x_label(df_plot)
+        df_melt = df_plot.melt(
+            id_vars=['X_label','Tank','Block','WorkerName'],
+            value_vars=['Salinity','pH'],
+            var_name='Metric',
+            value_name='Value'
+        )
+        df_melt = downsample_frame(df_melt, ['X_label','Metric'], 'Value', point_budget,
+                                   keep=critical_mask(df_melt, {'pH': (7.6, 8.3), 'Salinity': (25, 30)}))
+        webgl = use_webgl(len(df_melt))
+        fig = px.line(
+            df_melt,
+            x='X_label',
+            y='Value',
+            color='Tank',
+            line_dash='Metric',
+            markers=True,
+            color_discrete_map=DAILY_TANK_COLORS,
+            labels={'X_label':'Tank | Block','Value':'Value','Metric':'Parameter'},
+            hover_data=['WorkerName','Tank','Block','Metric','Value'],
+            render_mode='webgl' if webgl else 'svg'
+        )
+        frames['water_quality'] = df_melt
+        frames['critical_ph'] = add_critical_markers(fig, df_melt, 'pH', 7.6, 8.3, 'red', 'Critical pH', webgl)
+        frames['critical_salinity'] = add_critical_markers(fig, df_melt, 'Salinity', 25, 30, 'orange', 'Critical Salinity', webgl)
+    charts.append(chart("Water Quality (Salinity & pH)", "plotly", fig, "No water quality data available."))
+
+    # ----------------------------
+    # Feed trends (all blocks)
+    # ----------------------------
+    df_feed = view_df.melt(
+        id_vars=['Tank','Block','WorkerName'],
+        value_vars=['ScheduledFeed_day_g','ActualFeed_day_g'],
+        var_name='Metric',
+        value_name='Value'
+    )
+    fig_feed = None
+    if not df_feed.empty:
+        df_feed["X_label"] = x_label(df_feed)
+        df_feed = downsample_frame(df_feed, ['X_label','Metric'], 'Value', point_budget)
+        fig_feed = px.line(
+            df_feed,
+            x='X_label',
+            y='Value',
+            color='Tank',
+            line_dash='Metric',
+            markers=True,
+            color_discrete_map=DAILY_TANK_COLORS,
+            labels={'X_label':'Tank | Block','Value':'Feed (g)','Metric':'Parameter'},
+            hover_data=['WorkerName','Tank','Block','Value','Metric'],
+            render_mode='webgl' if use_webgl(len(df_feed)) else 'svg'
+        )
+        frames['feed'] = df_feed
+    charts.append(chart("Feed Trends", "plotly", fig_feed, "No feed data available."))
+
+    # ----------------------------
+    # Mortality Trends (all blocks)
+    # ----------------------------
+    df_mort = view_df[['Tank','Block','DeadCount_day','DeadWeight_g','WorkerName']].copy()
+    spec = None
+    if not df_mort.empty:
+        df_mort['X_label'] = x_label(df_mort)
+        df_total = df_mort.groupby('X_label').agg(
+            Total_Dead=('DeadCount_day','sum'),
+            Total_Weight=('DeadWeight_g','sum'),
+            Workers=('WorkerName', lambda x: ', '.join(x.dropna().astype(str).unique()))
+        ).reset_index()
+        df_total['Critical'] = (df_total['Total_Dead'] > 5).map({True: 'Yes', False: 'No'})
+        bars = alt.Chart(df_total).mark_bar().encode(
+            x='X_label',
+            y='Total_Dead',
+            tooltip=['X_label','Total_Dead','Total_Weight','Workers'],
+            color=alt.condition(alt.datum.Critical == 'Yes', alt.value('red'), alt.value('steelblue'))
+        )
+        text = bars.mark_text(align='center', baseline='bottom', dy=-2).encode(text='Total_Dead')
+        spec = vega_spec(bars + text)
+        frames['mortality'] = df_total
+    charts.append(chart("Mortality Trends", "vega", spec, "No mortality data available."))
+
+    return {"charts": charts, "frames": frames}
+
+
+# =============================
+# 5️⃣ WEEKLY VIEW
+# =============================
+@traced("charts.weekly")
+def weekly_charts(weekly_df, point_budget=DEFAULT_POINT_BUDGET):
+    # One point per Tank | Block, so there is nothing to thin here
+    import plotly.express as px
+    import altair as alt
+
+    charts, frames = [], {}
+
+    # --------------------------
+    # Weekly aggregation for plots (do not print this DataFrame)
+    # --------------------------
+    block_worker_map = weekly_df[['Block','WorkerName']].dropna().drop_duplicates().groupby('Block')['WorkerName'].first().to_dict()
+
+    agg_cols = {
+        'ScheduledFeed_day_g': 'sum',
+        'ActualFeed_day_g': 'sum',
+        'LeftoverFeed_g': 'sum',
+        'DeadCount_day': 'sum',
+        'DeadWeight_g': 'sum',
+        'pH': 'mean',
+        'Salinity': 'mean'
+    }
+    weekly_plot_df = weekly_df.groupby(['Tank','Block'], as_index=False).agg(agg_cols)
+    weekly_plot_df['WorkerName'] = weekly_plot_df['Block'].map(block_worker_map)
+    weekly_plot_df = weekly_plot_df[weekly_plot_df['Block'] != "Unknown"]
+    weekly_plot_df['X_label'] = weekly_plot_df['Tank'] + " | " + weekly_plot_df['Block']
+    frames['weekly_plot'] = weekly_plot_df
+
+    # --------------------------
+    # Weekly Water Quality
+    # --------------------------
+    df_wq = weekly_plot_df.melt(
+        id_vars=['X_label','Tank','Block','WorkerName'],
+        value_vars=['Salinity','pH'],
+        var_name='Metric',
+        value_name='Value'
+    )
+
+    df_critical_wq = df_wq[((df_wq['Metric']=='pH') & ((df_wq['Value'] < 7.6) | (df_wq['Value'] > 8.3))) |
+                            ((df_wq['Metric']=='Salinity') & ((df_wq['Value'] < 25) | (df_wq['Value'] > 30)))]
+
+    fig_wq = px.line(df_wq, x='X_label', y='Value', color='Tank', line_dash='Metric', markers=True,
+                     color_discrete_map=WEEKLY_TANK_COLORS,
+                     hover_data=['WorkerName','Metric','Value','Tank','Block'])
+
+    if not df_critical_wq.empty:
+        fig_wq.add_scatter(
+            x=df_critical_wq['X_label'],
+            y=df_critical_wq['Value'],
+            mode='markers',
+            marker=dict(color='red', size=12, symbol='x'),
+            name='Critical',
+            hovertext=("Worker: " + df_critical_wq['WorkerName'].astype(str) + "<br>Metric: " + df_critical_wq['Metric']
+                       + "<br>Value: " + df_critical_wq['Value'].astype(str)),
+            hoverinfo='text'
+        )
+    frames['water_quality'] = df_wq
+    frames['critical'] = df_critical_wq
+    charts.append(chart("Weekly Water Quality (Salinity & pH)", "plotly", fig_wq))
+
+    # --------------------------
+    # Weekly Feed Trends
+    # --------------------------
+    df_feed = weekly_plot_df.melt(
+        id_vars=['X_label','Tank','Block','WorkerName'],
+        value_vars=['ScheduledFeed_day_g','ActualFeed_day_g'],
+        var_name='Metric',
+        value_name='Value'
+    )
+    fig_feed = px.line(df_feed, x='X_label', y='Value', color='Tank', line_dash='Metric', markers=True,
+                       color_discrete_map=WEEKLY_TANK_COLORS,
+                       hover_data=['WorkerName','Metric','Value','Tank','Block'])
+    frames['feed'] = df_feed
+    charts.append(chart("Weekly Feed Trends", "plotly", fig_feed))
+
+    # --------------------------
+    # Weekly Mortality
+    # --------------------------
+    df_mort = weekly_plot_df[['X_label','DeadCount_day','DeadWeight_g','WorkerName']].copy()
+    df_mort['DeadCount_day'] = df_mort['DeadCount_day'].fillna(0)
+
+    df_critical_mort = df_mort[df_mort['DeadCount_day'] > 5]
+
+    mort_tooltip = [alt.Tooltip('WorkerName:N', title='Worker'),
+                    alt.Tooltip('DeadCount_day:Q', title='Dead Count'),
+                    alt.Tooltip('DeadWeight_g:Q', title='Dead Weight (g)')]
+    mort_bar = alt.Chart(df_mort).mark_bar(opacity=0.8).encode(
+        x=alt.X('X_label:N', title='Tank | Block'),
+        y=alt.Y('DeadCount_day:Q', title='Dead Shrimp Count'),
+        tooltip=mort_tooltip
+    )
+    mort_hover = alt.Chart(df_mort).mark_point(opacity=0, size=100).encode(
+        x='X_label:N',
+        y='DeadCount_day:Q',
+        tooltip=mort_tooltip
+    )
+    mort_text = alt.Chart(df_mort).mark_text(dy=-5, fontWeight='bold').encode(
+        x='X_label:N',
+        y='DeadCount_day:Q',
+        text=alt.Text('DeadCount_day:Q', format='.0f')
+    )
+    layers = mort_bar + mort_hover + mort_text
+    if not df_critical_mort.empty:
+        layers += alt.Chart(df_critical_mort).mark_circle(size=150, color='red').encode(
+            x='X_label:N',
+            y='DeadCount_day:Q',
+            tooltip=mort_tooltip
+        )
+    frames['mortality'] = df_mort
+    charts.append(chart("Weekly Mortality", "vega", vega_spec(layers)))
+
+    return {"charts": charts, "frames": frames}
+
+
+# =============================
+# 6️⃣ MONTHLY VIEW
+# =============================
+@traced("charts.monthly")
+def monthly_charts(view_df, point_budget=DEFAULT_POINT_BUDGET):
+    # One point per Tank | Block, so there is nothing to thin here
+    import plotly.express as px
+    import altair as alt
+
+    charts, frames = [], {}
+
+    # ----------------------------
+    # Monthly Water Quality Plot (Line) – WorkerName included
+    # ----------------------------
+    monthly_df_plot = view_df.groupby(['Tank','Block'], as_index=False).agg(
+        Salinity_avg=('Salinity','mean'),
+        pH_avg=('pH','mean'),
+        WorkerName=('WorkerName','first')  # Ensure WorkerName present
+    )
+    monthly_df_plot["X_label"] = x_label(monthly_df_plot)
+    df_melt = monthly_df_plot.melt(
+        id_vars=['X_label','WorkerName','Tank','Block'],
+        value_vars=['Salinity_avg','pH_avg'],
+        var_name='Metric',
+        value_name='Value'
+    )
+    fig = px.line(
+        df_melt,
+        x='X_label',
+        y='Value',
+        color='Metric',
+        markers=True,
+        labels={'X_label':'Tank | Block','Value':'Value','Metric':'Parameter'},
+        hover_data=['WorkerName','Tank','Block','Value','Metric']
+    )
+    # Critical markers
+    frames['water_quality'] = df_melt
+    frames['critical_ph'] = add_critical_markers(fig, df_melt, 'pH_avg', 7.6, 8.3, 'red', 'Critical pH')
+    frames['critical_salinity'] = add_critical_markers(fig, df_melt, 'Salinity_avg', 25, 30, 'orange', 'Critical Salinity')
+    charts.append(chart("Monthly Water Quality (Avg Salinity & pH)", "plotly", fig))
+
+    # ----------------------------
+    # Monthly Feed Trends (Line) – WorkerName included
+    # ----------------------------
+    monthly_feed = view_df.groupby(['Tank','Block'], as_index=False).agg(
+        ScheduledFeed_g=('ScheduledFeed_day_g','sum'),
+        ActualFeed_g=('ActualFeed_day_g','sum'),
+        WorkerName=('WorkerName','first')
+    )
+    monthly_feed["X_label"] = x_label(monthly_feed)
+    df_feed = monthly_feed.melt(
+        id_vars=['X_label','WorkerName','Tank','Block'],
+        value_vars=['ScheduledFeed_g','ActualFeed_g'],
+        var_name='Metric',
+        value_name='Value'
+    )
+    fig_feed = px.line(
+        df_feed,
+        x='X_label',
+        y='Value',
+        color='Metric',
+        markers=True,
+        labels={'X_label':'Tank | Block','Value':'Feed (g)','Metric':'Parameter'},
+        hover_data=['WorkerName','Tank','Block','Value','Metric']
+    )
+    frames['feed'] = df_feed
+    charts.append(chart("Monthly Feed Trends", "plotly", fig_feed))
+
+    # ----------------------------
+    # Monthly Mortality Trends – WorkerName included
+    # ----------------------------
+    monthly_mort = view_df.groupby(['Tank','Block'], as_index=False).agg(
+        Total_Dead=('DeadCount_day','sum'),
+        Total_Weight=('DeadWeight_g','sum'),
+        WorkerName=('WorkerName','first')
+    )
+    monthly_mort["X_label"] = x_label(monthly_mort)
+    bars = alt.Chart(monthly_mort).mark_bar().encode(
+        x='X_label',
+        y='Total_Dead',
+        tooltip=['X_label','Total_Dead','Total_Weight','WorkerName'],
+        color=alt.condition(alt.datum.Total_Dead >= 5, alt.value('red'), alt.value('steelblue'))
+    )
+    text = bars.mark_text(align='center', baseline='bottom', dy=-2).encode(text='Total_Dead')
+    frames['mortality'] = monthly_mort
+    charts.append(chart("Monthly Mortality Trends", "vega", vega_spec(bars + text)))
+
+    return {"charts": charts, "frames": frames}
+
+
+CHART_BUILDERS = {
+    "Daily": daily_charts,
+    "Weekly": weekly_charts,
+    "Monthly": monthly_charts,
+}
+
+
+# ---------------------------
+# Cache + render
+# ---------------------------
+# cache_resource hands every session the same objects, so nothing downstream
+# may mutate a cached figure or spec (render_charts copies the spec dict
+# because Streamlit pops the datasets out of it).
+@cached(st.cache_resource(max_entries=64, show_spinner=False))
+def view_charts(data_version, view_option, selection_key, _view_df, point_budget=DEFAULT_POINT_BUDGET):
+    return CHART_BUILDERS[view_option](_view_df, point_budget)
+
+
+def render_charts(bundle):
+    for c in bundle["charts"]:
+        st.subheader(c["title"])
+        if c["figure"] is None:
+            st.info(c["empty"])
+            continue
+        # Keyed by title: an empty window gives several identical figures,
+        # which Streamlit would otherwise reject as duplicate elements
+        with span(f"render.chart: {c['title']}"):
+            if c["kind"] == "plotly":
+                st.plotly_chart(c["figure"], use_container_width=True, key=f"chart: {c['title']}")
+            else:
+                st.vega_lite_chart(spec=dict(c["figure"]), use_container_width=True, key=f"chart: {c['title']}")
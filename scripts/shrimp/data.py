@@ -0,0 +1,320 @@
+"""
+Shared data layer for every dashboard page.
+
+The tank report and the ABW samples are parsed once per process (keyed on
+file path and modification time) and every page reads from these cached
+frames instead of loading the Excel files itself.
+"""
+import glob
+import os
+import threading
+
+import pandas as pd
+import streamlit as st
+
+from shrimp import drift, feed, forecast, growth, mortality, sizes
+from shrimp.instrument import cached, span, traced
+
+
+# ---------------------------
+# Path to your tank summary file in the repo root
+# ---------------------------
+# Check if running on Streamlit Cloud, otherwise fallback to local path logic
+if os.path.exists("/mount/src/shrimp-dashboard"):
+    REPO_ROOT = "/mount/src/shrimp-dashboard"
+else:
+    BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # the scripts/ folder
+    REPO_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))  # go up one level to shrimp-dashboard root
+
+# Folder holding the tank reports and AvgBW.xlsx; the repo root unless
+# SHRIMP_DATA_DIR points somewhere else (e.g. a synthetic farm)
+DATA_DIR = os.environ.get("SHRIMP_DATA_DIR", REPO_ROOT)
+
+REPORT_PATTERN = "Tank_Consolidated_Report_*.xlsx"
+ABW_FILE = "AvgBW.xlsx"
+# ABW file URL, used when the workbook is not next to the tank reports
+ABW_URL = "https://raw.githubusercontent.com/saisravanthi8333-coder/shrimp-dashboard/main/AvgBW.xlsx"
+# Fitted models and drift-detector state kept between runs (shrimp.forecast,
+# shrimp.mortality, shrimp.drift)
+MODEL_DIR = os.environ.get("SHRIMP_MODEL_DIR", os.path.join(REPO_ROOT, ".shrimp_models"))
+
+# Rename columns
+COLUMN_MAPPING = {
+    "Date": "Date",
+    "Worker Name": "WorkerName",
+    "Block": "Block",
+    "Tank No.": "Tank",
+    "Scheduled Feed (g)": "ScheduledFeed_day_g",
+    "Adjusted Feed (g)": "ActualFeed_day_g",
+    "Leftover_g": "LeftoverFeed_g",
+    "Dead Shrimp Count": "DeadCount_day",
+    "Dead Shrimp Weight (g)": "DeadWeight_g",
+    "InitialCount": "InitialCount",
+    "LiveCount": "LiveCount",
+    "Mortality_pct": "Mortality_pct",
+    "Water Temperature": "WaterTemperature",
+    "Room Temperature": "RoomTemperature",
+    "Humidity": "Humidity",
+    "Salinity (ppt)": "Salinity",
+    "pH Value": "pH"
+}
+
+
+def find_report_files(root=DATA_DIR):
+    # Look for files matching Tank_Consolidated_Report_*.xlsx directly in the root
+    return glob.glob(os.path.join(root, REPORT_PATTERN))
+
+
+def latest_report_file(root=DATA_DIR):
+    files = find_report_files(root)
+    if not files:
+        return None
+    # Pick the latest file by modification time
+    return max(files, key=os.path.getmtime)
+
+
+def abw_source(root=DATA_DIR):
+    local_path = os.path.join(root, ABW_FILE)
+    return local_path if os.path.exists(local_path) else ABW_URL
+
+
+def _mtime(source):
+    return os.path.getmtime(source) if os.path.exists(source) else None
+
+
+# ---------------------------
+# Load the Excel files
+# ---------------------------
+def read_tank_report(path):
+    with span("load.tank_report") as s:
+        df = pd.read_excel(path)
+        df = df.rename(columns=COLUMN_MAPPING)
+        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+        df = df.dropna(subset=['Date'])
+        s.rows = len(df)
+    return df
+
+
+def read_abw(source):
+    with span("load.abw_excel") as s:
+        abw_df = pd.read_excel(source)
+        s.rows = len(abw_df)
+    abw_df.columns = abw_df.columns.str.strip()
+
+    # Standardize types
+    abw_df['Block'] = abw_df['Block'].astype(str).str.strip().str.upper()
+    abw_df['Tank'] = abw_df['Tank'].astype(str).str.strip().str.upper()
+    abw_df['Date'] = pd.to_datetime(abw_df['Date'])
+
+    # Clean Avg Weight
+    if 'Avg Weight' in abw_df.columns:
+        abw_df['Avg Weight'] = pd.to_numeric(
+            abw_df['Avg Weight'].astype(str)
+                .str.replace('g','',regex=False)
+                .replace('no shrimp','0'),
+            errors='coerce'
+        )
+
+    for col in ['S-Weight', 'M-Weight', 'L-Weight']:
+        if col in abw_df.columns:
+            abw_df[col] = pd.to_numeric(
+                abw_df[col].astype(str).str.replace('g','',regex=False).replace('no shrimp','0'),
+                errors='coerce'
+            )
+
+    # S/M/L lengths in cm ("12.5cm", "13 cm"; "no shrimp" -> NaN)
+    for col in ['S-Length', 'M-Length', 'L-Length']:
+        if col in abw_df.columns:
+            abw_df[col] = pd.to_numeric(
+                abw_df[col].astype(str).str.extract(r'(\d+(?:\.\d+)?)', expand=False),
+                errors='coerce'
+            )
+    return derive_abw(abw_df)
+
+
+def derive_abw(abw_df):
+    """
+    ABW_end / ABW_start and CV_pct of parsed ABW samples, whether read from
+    the workbook (``read_abw``) or from SQLite (``db.query_abw``).
+    """
+    # -----------------------------
+    # AUTOMATIC LOOK-BACK (Finding Start and End weights from Avg Weight only)
+    # -----------------------------
+    abw_df = abw_df.sort_values(['Tank', 'Block', 'Date'])
+
+    # ABW_end = current date's Avg Weight
+    abw_df['ABW_end'] = abw_df['Avg Weight']
+
+    # ABW_start = previous date's Avg Weight (per Tank/Block)
+    abw_df['ABW_start'] = abw_df.groupby(['Block', 'Tank'])['Avg Weight'].shift(1)
+
+    # CV_pct (if S/M/L weights exist)
+    if all(x in abw_df.columns for x in ['S-Weight','M-Weight','L-Weight']):
+        abw_df['Est_SD'] = (abw_df['L-Weight'] - abw_df['S-Weight']) / 4
+        abw_df['CV_pct'] = (abw_df['Est_SD'] / abw_df['ABW_end'] * 100).fillna(0)
+    else:
+        abw_df['CV_pct'] = 0
+    return abw_df
+
+
+@cached(st.cache_data(show_spinner="Loading tank report..."))
+def load_tank_report(path, mtime):
+    return read_tank_report(path)
+
+
+@cached(st.cache_data(ttl=300, show_spinner="Loading ABW samples..."))
+def load_abw(source, mtime):
+    return read_abw(source)
+
+
+# ---------------------------
+# Page-facing accessors
+# ---------------------------
+def data_version():
+    """Identifies the current inputs; changes whenever a new report or ABW file lands."""
+    latest_file = latest_report_file()
+    report = f"{os.path.basename(latest_file)}@{_mtime(latest_file)}" if latest_file else "none"
+    return f"{report}|{abw_version()}"
+
+
+def abw_version():
+    """The ABW half of ``data_version``: changes only when a new ABW file lands."""
+    source = abw_source()
+    return f"{os.path.basename(source)}@{_mtime(source)}"
+
+
+def get_farm_log():
+    """Cached daily log from the newest tank report; stops the page if missing."""
+    latest_file = latest_report_file()
+    if latest_file is None:
+        st.error(f"❌ No tank summary files found in the root directory: {DATA_DIR}")
+        # Optional: list files to see what is actually there for debugging
+        st.write("Files found in root:", os.listdir(DATA_DIR))
+        st.stop()
+    try:
+        return load_tank_report(latest_file, _mtime(latest_file))
+    except Exception as e:
+        st.error(f"Failed to load Excel file: {latest_file}\nError: {e}")
+        st.stop()
+
+
+def get_abw():
+    """Cached ABW samples. Raises on load errors so each page can report them."""
+    source = abw_source()
+    return load_abw(source, _mtime(source))
+
+
+# Table and ABW samples of the newest version built; the next version only
+# recomputes the batches whose log rows or samples changed
+_growth_lock = threading.Lock()
+_last_growth = {}
+
+
+@cached(st.cache_resource(max_entries=1, show_spinner="Interpolating daily growth..."))
+def daily_growth_table(data_version):
+    """``growth.daily_growth`` of the current farm log and ABW samples (shared: do not mutate)."""
+    farm_df, abw_df = get_farm_log(), get_abw()
+    with _growth_lock:
+        if _last_growth:
+            table = growth.extend_daily_growth(_last_growth['table'], _last_growth['abw'], farm_df, abw_df)
+        else:
+            table = growth.daily_growth(farm_df, abw_df)
+        _last_growth.update(table=table, abw=abw_df)
+    return table
+
+
+_forecast_lock = threading.Lock()
+
+
+@cached(st.cache_resource(max_entries=1, show_spinner="Forecasting growth..."))
+def growth_forecast(data_version):
+    """
+    ``forecast.forecast_growth`` of every active tank (shared: do not mutate).
+    Models are loaded from MODEL_DIR and only tanks with new samples
+    refitted; models saved from another DATA_DIR are all refitted.
+    """
+    growth_df = daily_growth_table(data_version)
+    path = os.path.join(MODEL_DIR, "growth_models.joblib")
+    source = os.path.abspath(DATA_DIR)
+    with _forecast_lock:
+        models = forecast.fit_growth_models(forecast.forecast_samples(growth_df), forecast.load_models(path, source))
+        try:
+            forecast.save_models(models, path, source)
+        except OSError:
+            pass  # read-only deployment: refit again next process
+    return forecast.forecast_growth(models, forecast.current_batches(growth_df))
+
+
+def risk_model_version():
+    """File name of the newest mortality-risk artifact in MODEL_DIR, or None before one is trained."""
+    paths = mortality.artifact_paths(MODEL_DIR)
+    return os.path.basename(paths[-1]) if paths else None
+
+
+@cached(st.cache_resource(max_entries=2, show_spinner="Scoring mortality risk..."))
+def mortality_risk(data_version, model_version):
+    """
+    {'scores', 'explanations'} of the farm log with the artifact
+    ``model_version``: ``mortality.score_mortality_risk`` of every row and
+    ``mortality.explain_mortality_risk`` computed right after it, kept
+    together per (data, model) version (shared: do not mutate). None
+    when no model is trained.
+    """
+    artifact = mortality.load_artifact(os.path.join(MODEL_DIR, model_version)) if model_version else None
+    if artifact is None:
+        return None
+    features = mortality.mortality_features(get_farm_log())
+    scores = mortality.score_mortality_risk(artifact, features)
+    return {'scores': scores, 'explanations': mortality.explain_mortality_risk(artifact, features, scores)}
+
+
+_drift_lock = threading.Lock()
+
+
+@cached(st.cache_resource(max_entries=1, show_spinner="Checking water-quality drift..."))
+def water_drift(data_version):
+    """
+    Drift episodes (``drift.EVENT_COLUMNS``) after feeding the persisted
+    detector state in MODEL_DIR/drift only the days each tank logged since
+    its last update (shared: do not mutate). State saved from another
+    DATA_DIR, or from a log this one does not continue, is rebuilt.
+    """
+    path = os.path.join(MODEL_DIR, "drift")
+    farm_df = get_farm_log()
+    source = drift.log_identity(farm_df, os.path.abspath(DATA_DIR))
+    with _drift_lock:
+        state, events = drift.load_state(path, source)
+        fresh = drift.readings(farm_df, after=drift.watermark(state))
+        state, events = drift.update_drift(state, events, fresh)
+        try:
+            drift.save_state(state, events, path, source)
+        except OSError:
+            pass  # read-only deployment: start from the last saved state next process
+    return events
+
+
+@cached(st.cache_data(max_entries=2, show_spinner="Planning tomorrow's feed..."))
+def feed_plan(data_version):
+    """``feed.plan_feed`` of the daily growth table, farm log and drift episodes of one data version."""
+    return feed.plan_feed(daily_growth_table(data_version), get_farm_log(), water_drift(data_version))
+
+
+@cached(st.cache_data(max_entries=2, show_spinner="Fitting size distributions..."))
+def size_analytics(abw_version):
+    """``sizes.size_report`` of the current ABW samples, refitted only when the ABW file changes."""
+    return sizes.size_report(get_abw())
+
+
+@traced("data.prepare_view_df")
+def prepare_view_df(view_df):
+    # Shared clean-up every section relies on. Sections take a copy of this
+    # frame so none of them depends on columns another section added.
+    view_df = view_df.copy()
+    for col in ['pH','Salinity','WaterTemperature']:
+        view_df[col] = pd.to_numeric(view_df[col], errors='coerce')
+    view_df['DeadCount_day'] = pd.to_numeric(view_df['DeadCount_day'], errors='coerce').fillna(0)
+    view_df['DeadWeight_g'] = view_df['DeadWeight_g'].fillna(0)
+    view_df['WorkerName'] = view_df['WorkerName'].astype(str).str.strip().str.title()
+    view_df['pH_OK'] = view_df['pH'].between(7.6, 8.3).astype(int)
+    view_df['Salinity_OK'] = view_df['Salinity'].between(25, 30).astype(int)
+    return view_df
@@ -0,0 +1,305 @@
+"""
+SQLite store for the daily farm log and the ABW samples.
+
+The Excel workbooks remain the source: ``ingest_report`` / ``ingest_abw``
+copy them into ``DB_PATH`` (run ``python scripts/ingest.py`` or let the
+dashboard ingest the newest files on first use). Pages then ask for just the
+rows of their date window and Block / Tank through the ``query_*``
+functions, which only ever use bound parameters.
+
+The store keeps every report ever ingested, while the rest of the dashboard
+(sidebar, risk, heatmap, growth, drift, mortality) reads the newest report.
+``query_current_log`` therefore clamps a window to the dates of the newest
+report (recorded per file in ``report_ranges``), so every page and the KPI
+API see the same rows.
+"""
+import os
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from shrimp import data
+from shrimp.instrument import cached, span
+
+DB_PATH = os.environ.get("SHRIMP_DB_PATH", os.path.join(data.REPO_ROOT, "shrimp.db"))
+
+# DataFrame column -> SQLite column, for the farm log
+FARM_LOG_COLUMNS = {
+    "Date": "Date",
+    "Batch ID": "BatchID",
+    "WorkerName": "WorkerName",
+    "Block": "Block",
+    "Tank": "Tank",
+    "ScheduledFeed_day_g": "ScheduledFeed_day_g",
+    "ActualFeed_day_g": "ActualFeed_day_g",
+    "LeftoverFeed_g": "LeftoverFeed_g",
+    "Leftover_pct": "Leftover_pct",
+    "DeadCount_day": "DeadCount_day",
+    "DeadWeight_g": "DeadWeight_g",
+    "InitialCount": "InitialCount",
+    "LiveCount": "LiveCount",
+    "Mortality_pct": "Mortality_pct",
+    "WaterTemperature": "WaterTemperature",
+    "RoomTemperature": "RoomTemperature",
+    "Humidity": "Humidity",
+    "Salinity": "Salinity",
+    "pH": "pH",
+    "Requires_Attention": "Requires_Attention",
+    "Problem_Type": "Problem_Type",
+}
+
+# Numeric farm log columns; an empty result would otherwise come back as object
+FARM_LOG_NUMERIC = [
+    "ScheduledFeed_day_g", "ActualFeed_day_g", "LeftoverFeed_g", "Leftover_pct",
+    "DeadCount_day", "DeadWeight_g", "InitialCount", "LiveCount", "Mortality_pct",
+    "Salinity", "pH", "Requires_Attention",
+]
+
+ABW_COLUMNS = {
+    "Date": "Date",
+    "Block": "Block",
+    "Tank": "Tank",
+    "Avg Weight": "AvgWeight",
+    "S-Length": "S_Length",
+    "M-Length": "M_Length",
+    "L-Length": "L_Length",
+    "S-Weight": "S_Weight",
+    "M-Weight": "M_Weight",
+    "L-Weight": "L_Weight",
+}
+
+# Temperatures and humidity are free text in the workbook; NUMERIC affinity
+# stores numbers as numbers and keeps anything else as typed.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS farm_log (
+    Date TEXT NOT NULL,
+    BatchID TEXT,
+    WorkerName TEXT,
+    Block TEXT,
+    Tank TEXT,
+    ScheduledFeed_day_g INTEGER,
+    ActualFeed_day_g INTEGER,
+    LeftoverFeed_g INTEGER,
+    Leftover_pct REAL,
+    DeadCount_day INTEGER,
+    DeadWeight_g REAL,
+    InitialCount INTEGER,
+    LiveCount INTEGER,
+    Mortality_pct REAL,
+    WaterTemperature NUMERIC,
+    RoomTemperature NUMERIC,
+    Humidity NUMERIC,
+    Salinity REAL,
+    pH REAL,
+    Requires_Attention INTEGER,
+    Problem_Type TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_farm_log_date ON farm_log (Date);
+CREATE INDEX IF NOT EXISTS idx_farm_log_tank_date ON farm_log (Block, Tank, Date);
+CREATE INDEX IF NOT EXISTS idx_farm_log_batch ON farm_log (BatchID);
+
+CREATE TABLE IF NOT EXISTS abw_samples (
+    Date TEXT NOT NULL,
+    Block TEXT,
+    Tank TEXT,
+    AvgWeight REAL,
+    S_Length REAL,
+    M_Length REAL,
+    L_Length REAL,
+    S_Weight REAL,
+    M_Weight REAL,
+    L_Weight REAL
+);
+CREATE INDEX IF NOT EXISTS idx_abw_date ON abw_samples (Date);
+CREATE INDEX IF NOT EXISTS idx_abw_tank_date ON abw_samples (Block, Tank, Date);
+
+CREATE TABLE IF NOT EXISTS report_ranges (
+    name TEXT PRIMARY KEY,
+    start TEXT,
+    end TEXT
+);
+
+CREATE TABLE IF NOT EXISTS ingested_files (
+    name TEXT PRIMARY KEY,
+    mtime REAL,
+    rows INTEGER,
+    ingested_at TEXT
+);
+"""
+
+
+def connect(path=DB_PATH):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _ts(value):
+    """Timestamp parameter in the same text form the Date columns use."""
+    return pd.Timestamp(value).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _rows(df, columns):
+    out = pd.DataFrame({sql: df[col] if col in df.columns else None for col, sql in columns.items()})
+    out['Date'] = out['Date'].dt.strftime("%Y-%m-%d %H:%M:%S")
+    out = out.astype(object).where(out.notna(), None)
+    return list(out.itertuples(index=False, name=None))
+
+
+def _insert(conn, table, columns, rows):
+    names = ", ".join(columns.values())
+    marks = ", ".join("?" for _ in columns)
+    conn.executemany(f"INSERT INTO {table} ({names}) VALUES ({marks})", rows)
+
+
+def _record(conn, path, n_rows):
+    conn.execute(
+        "INSERT OR REPLACE INTO ingested_files (name, mtime, rows, ingested_at) VALUES (?, ?, ?, ?)",
+        (os.path.basename(path), data._mtime(path), n_rows, datetime.now().isoformat(timespec="seconds")),
+    )
+
+
+def is_ingested(conn, path):
+    row = conn.execute("SELECT mtime FROM ingested_files WHERE name = ?", (os.path.basename(path),)).fetchone()
+    return row is not None and row[0] == data._mtime(path)
+
+
+def ingest_report(conn, path):
+    """
+    Load one Tank_Consolidated_Report workbook. Its rows replace whatever the
+    store held for the report's date range, so re-ingesting a file or a newer
+    consolidated report never duplicates days.
+    """
+    df = data.read_tank_report(path)
+    with span("db.ingest_report", len(df)), conn:
+        if not df.empty:
+            conn.execute("DELETE FROM farm_log WHERE Date BETWEEN ? AND ?",
+                         (_ts(df['Date'].min()), _ts(df['Date'].max())))
+            _insert(conn, "farm_log", FARM_LOG_COLUMNS, _rows(df, FARM_LOG_COLUMNS))
+            conn.execute("INSERT OR REPLACE INTO report_ranges (name, start, end) VALUES (?, ?, ?)",
+                         (os.path.basename(path), _ts(df['Date'].min()), _ts(df['Date'].max())))
+        _record(conn, path, len(df))
+    return len(df)
+
+
+def ingest_abw(conn, source):
+    """Replace the ABW samples with the contents of ``source`` (the file is cumulative)."""
+    abw_df = data.read_abw(source)
+    with span("db.ingest_abw", len(abw_df)), conn:
+        conn.execute("DELETE FROM abw_samples")
+        _insert(conn, "abw_samples", ABW_COLUMNS, _rows(abw_df, ABW_COLUMNS))
+        _record(conn, source, len(abw_df))
+    return len(abw_df)
+
+
+def _where(start=None, end=None, block=None, tank=None, end_inclusive=True):
+    clauses, params = [], []
+    if start is not None:
+        clauses.append("Date >= ?")
+        params.append(_ts(start))
+    if end is not None:
+        clauses.append("Date <= ?" if end_inclusive else "Date < ?")
+        params.append(_ts(end))
+    if block not in (None, "All"):
+        clauses.append("Block = ?")
+        params.append(block)
+    if tank not in (None, "All"):
+        clauses.append("Tank = ?")
+        params.append(tank)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def query_farm_log(conn, start=None, end=None, block=None, tank=None, end_inclusive=True):
+    """Farm log rows in [start, end] for one Block / Tank (or all), oldest first."""
+    where, params = _where(start, end, block, tank, end_inclusive)
+    select = ", ".join(f'{sql} AS "{col}"' for col, sql in FARM_LOG_COLUMNS.items())
+    with span("db.query_farm_log") as s:
+        df = pd.read_sql_query(f"SELECT {select} FROM farm_log{where} ORDER BY Date", conn, params=params)
+        df['Date'] = pd.to_datetime(df['Date'])
+        if df.empty:
+            # A Block / Tank with no rows in the window still aggregates to numbers
+            df = df.astype({c: float for c in FARM_LOG_NUMERIC})
+        s.rows = len(df)
+    return df
+
+
+def report_range(conn, path):
+    """(first, last) Date of the report ``path`` as ingested, or None."""
+    row = conn.execute("SELECT start, end FROM report_ranges WHERE name = ?", (os.path.basename(path),)).fetchone()
+    return None if row is None else (pd.Timestamp(row[0]), pd.Timestamp(row[1]))
+
+
+def query_current_log(conn, start=None, end=None, block=None, tank=None, end_inclusive=True):
+    """``query_farm_log`` within the dates of the newest report (the rows ``data.get_farm_log`` holds)."""
+    latest_file = data.latest_report_file()
+    bounds = report_range(conn, latest_file) if latest_file else None
+    if bounds is not None:
+        first, last = bounds
+        start = first if start is None else max(pd.Timestamp(start), first)
+        if end is None or pd.Timestamp(end) > last:
+            end, end_inclusive = last, True
+    return query_farm_log(conn, start, end, block, tank, end_inclusive)
+
+
+def query_abw(conn, start=None, end=None, block=None, tank=None):
+    where, params = _where(start, end, block, tank)
+    select = ", ".join(f'{sql} AS "{col}"' for col, sql in ABW_COLUMNS.items())
+    with span("db.query_abw") as s:
+        df = pd.read_sql_query(f"SELECT {select} FROM abw_samples{where} ORDER BY Block, Tank, Date", conn, params=params)
+        df['Date'] = pd.to_datetime(df['Date'])
+        s.rows = len(df)
+    return df
+
+
+def selection_window(selection):
+    """(start, end, end_inclusive) covering a sidebar selection's dates."""
+    view_option = selection['view_option']
+    if view_option == "Daily" and selection['date'] != "All":
+        day = pd.Timestamp(selection['date'])
+        return day, day + pd.Timedelta(days=1), False
+    if view_option == "Weekly":
+        return selection['week_start'], selection['week_end'], True
+    if view_option == "Monthly":
+        month = pd.Period(selection['month'], freq='M')
+        return month.start_time, (month + 1).start_time, False
+    return None, None, True
+
+
+def sync_latest(path=DB_PATH):
+    """Ingest the newest report and the ABW file unless already loaded."""
+    conn = connect(path)
+    try:
+        latest_file = data.latest_report_file()
+        # Stores built before report_ranges existed lack the newest report's range
+        if latest_file and not (is_ingested(conn, latest_file) and report_range(conn, latest_file)):
+            ingest_report(conn, latest_file)
+        source = data.abw_source()
+        if not is_ingested(conn, source):
+            try:
+                ingest_abw(conn, source)
+            except OSError:
+                if os.path.exists(source):
+                    raise  # a local file that cannot be read; the URL may just be unreachable
+    finally:
+        conn.close()
+    return path
+
+
+# ---------------------------
+# Dashboard glue
+# ---------------------------
+@cached(st.cache_resource(max_entries=1, show_spinner="Updating farm database..."))
+def farm_db(data_version):
+    """Path of the database, with the newest report and ABW file ingested."""
+    return sync_latest()
+
+
+@cached(st.cache_data(max_entries=64, show_spinner=False))
+def farm_log_window(data_version, start, end, block, tank, end_inclusive=True):
+    conn = sqlite3.connect(farm_db(data_version))
+    try:
+        return query_current_log(conn, start, end, block, tank, end_inclusive)
+    finally:
+        conn.close()
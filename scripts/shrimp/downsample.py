@@ -0,0 +1,75 @@
+"""
+Server-side downsampling for long-history line charts.
+
+With "All" dates selected the daily charts would otherwise ship every row to
+the browser. ``downsample_frame`` thins each series with
+largest-triangle-three-buckets (LTTB), which keeps the visual shape (peaks and
+troughs) of a series, and always keeps rows flagged as critical so pH and
+salinity outliers never disappear from the chart.
+"""
+import os
+
+import numpy as np
+
+# Max points per chart and the size above which charts switch to WebGL.
+# Both can be overridden with environment variables; the point budget can
+# also be changed per session from the sidebar.
+DEFAULT_POINT_BUDGET = int(os.environ.get("SHRIMP_CHART_POINT_BUDGET", 4000))
+WEBGL_THRESHOLD = int(os.environ.get("SHRIMP_WEBGL_THRESHOLD", 1000))
+
+
+def lttb_indices(y, n_out, x=None):
+    """Positions of the ``n_out`` points LTTB keeps from series ``y``."""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+
+    # First and last points are always kept; the rest is split into buckets
+    every = (n - 2) / (n_out - 2)
+    edges = (np.arange(n_out - 1) * every).astype(int) + 1
+    edges[-1] = n - 1
+
+    out = np.empty(n_out, dtype=int)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        # Area of the triangle (previous pick, candidate, next bucket average)
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def downsample_frame(df, series_cols, value_col, max_points, keep=None):
+    """
+    Reduce ``df`` to roughly ``max_points`` rows, running LTTB on each series
+    (rows sharing ``series_cols``) in its existing row order. Rows where
+    ``keep`` is True are always retained. NaN values are dropped from the
+    thinned output, since they never draw anything.
+    """
+    if not max_points or len(df) <= max_points:
+        return df
+
+    series = df.groupby(series_cols, sort=False).indices
+    per_series = max(max_points // max(len(series), 1), 3)
+    values = df[value_col].to_numpy(dtype=float)
+
+    chosen = []
+    for positions in series.values():
+        positions = positions[~np.isnan(values[positions])]
+        chosen.append(positions[lttb_indices(values[positions], per_series)])
+    if keep is not None:
+        chosen.append(np.flatnonzero(np.asarray(keep)))
+
+    rows = np.unique(np.concatenate(chosen)) if chosen else np.array([], dtype=int)
+    return df.iloc[rows]
+
+
+def use_webgl(n_points):
+    return n_points > WEBGL_THRESHOLD
@@ -0,0 +1,241 @@
+"""
+Online drift detection for water-quality readings.
+
+The fixed bands in ``metrics.alert_levels`` only fire once a reading leaves
+them; a tank sliding from pH 8.2 to 7.7 over a week never does. Here every
+(Block, Tank, Param) keeps a small running state:
+
+- an EWMA baseline (``Mean``) and scale (``Dev``, EWMA of |x - Mean|),
+  frozen while a drift is active so the drift is not absorbed into it;
+- two one-sided CUSUMs of x - Mean beyond a slack of CUSUM_K scales,
+  signalling a "falling" / "rising" drift past CUSUM_H scales;
+- a fast EWMA (``Recent``): a drift still signalled SETTLE_DAYS after it
+  was first flagged (``Since``) is taken as the tank's new level, so the
+  baseline moves to it and the episode ends.
+
+Each new reading updates that state in O(1); ``update_drift`` steps through
+only the days after each key's last reading, vectorized over all keys, and
+records drift episodes (Start, End; End NaT while active). ``load_state`` /
+``save_state`` keep state and episodes between reloads, so a refresh never
+rescans history. The saved state carries the ``log_identity`` of the log it
+was built from (data source, tanks, date range) and is dropped when the next
+log does not continue it:
+
+    source = log_identity(farm_df, data_dir)
+    state, events = load_state(path, source)
+    state, events = update_drift(state, events, readings(farm_df, after=watermark(state)))
+    save_state(state, events, path, source)
+
+No Streamlit dependency, like ``shrimp.metrics``.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from shrimp.instrument import traced
+
+STATE_KEYS = ['Block', 'Tank', 'Param']
+
+# Parameter -> smallest scale used (readings are logged to 0.1)
+PARAMS = {'pH': 0.05, 'Salinity': 0.5, 'WaterTemperature': 0.3}
+ALPHA = 0.05          # baseline memory of about 1 / ALPHA readings
+WARMUP = 14           # readings before a key can signal
+CUSUM_K = 0.5         # slack, in scales
+CUSUM_H = 5.0         # signal threshold, in scales
+MAD_TO_SD = 1.25      # mean absolute deviation -> standard deviation (normal)
+FAST_ALPHA = 0.3      # Recent: about the last three readings
+SETTLE_DAYS = 14      # a drift flagged this long becomes the new baseline
+
+STATE_COLUMNS = STATE_KEYS + ['Last_Date', 'N', 'Mean', 'Dev', 'Recent', 'S_pos', 'S_neg', 'Start_pos', 'Start_neg',
+                              'Drift', 'Since']
+EVENT_COLUMNS = STATE_KEYS + ['Direction', 'Start', 'End', 'Baseline', 'Signal_Value']
+DIRECTIONS = {1: "rising", -1: "falling"}
+
+
+def empty_state():
+    return (pd.DataFrame({c: pd.Series(dtype='datetime64[ns]' if c in ('Last_Date', 'Start_pos', 'Start_neg', 'Since')
+                                       else 'object' if c in STATE_KEYS else 'float64') for c in STATE_COLUMNS}),
+            pd.DataFrame({c: pd.Series(dtype='datetime64[ns]' if c in ('Start', 'End')
+                                       else 'float64' if c in ('Baseline', 'Signal_Value') else 'object')
+                          for c in EVENT_COLUMNS}))
+
+
+def watermark(state):
+    """Block, Tank, Last_Date: per tank, the oldest of its parameters' newest readings in ``state``."""
+    return state.groupby(['Block', 'Tank'], as_index=False)['Last_Date'].min()
+
+
+def readings(farm_df, after=None):
+    """
+    Block, Tank, Param, Date, Value: the daily mean of each water-quality
+    parameter per tank, only for each tank's days after its Last_Date in
+    ``after`` (a ``watermark``) when given; tanks missing from it keep all
+    their days.
+    """
+    rows = farm_df[['Date', 'Block', 'Tank'] + list(PARAMS)].copy()
+    rows['Block'] = rows['Block'].astype(str).str.strip().str.upper()
+    rows['Tank'] = rows['Tank'].astype(str).str.strip().str.upper()
+    rows['Date'] = rows['Date'].dt.normalize()
+    if after is not None and len(after):
+        last = rows[['Block', 'Tank']].merge(after, on=['Block', 'Tank'], how='left')['Last_Date']
+        rows = rows[~(rows['Date'].to_numpy() <= last.to_numpy('datetime64[ns]'))]
+    for col in PARAMS:
+        rows[col] = pd.to_numeric(rows[col], errors='coerce')
+    long = rows.melt(id_vars=['Date', 'Block', 'Tank'], var_name='Param', value_name='Value').dropna()
+    return long.groupby(STATE_KEYS + ['Date'], as_index=False, sort=False)['Value'].mean()
+
+
+@traced("drift.update")
+def update_drift(state, events, new_readings):
+    """
+    ``state`` and ``events`` advanced by every reading dated after its key's
+    Last_Date, one vectorized step per day. Returns new frames.
+    """
+    state = state.set_index(STATE_KEYS)
+    last = new_readings.merge(state['Last_Date'].reset_index(), on=STATE_KEYS, how='left')['Last_Date']
+    fresh = new_readings[~(new_readings['Date'] <= last).to_numpy()]
+    if fresh.empty:
+        return state.reset_index(), events
+
+    keys = state.index.union(pd.MultiIndex.from_frame(fresh[STATE_KEYS].drop_duplicates()))
+    state = state.reindex(keys)
+    matrix = fresh.pivot_table(index='Date', columns=STATE_KEYS, values='Value', aggfunc='last')
+    matrix = matrix.reindex(columns=keys).sort_index()
+
+    n = state['N'].fillna(0).to_numpy()
+    mean, dev = state['Mean'].to_numpy(float), state['Dev'].fillna(0).to_numpy(float)
+    recent = state['Recent'].to_numpy(float)
+    s_pos, s_neg = state['S_pos'].fillna(0).to_numpy(float), state['S_neg'].fillna(0).to_numpy(float)
+    start_pos = state['Start_pos'].to_numpy('datetime64[ns]')
+    start_neg = state['Start_neg'].to_numpy('datetime64[ns]')
+    drift = state['Drift'].fillna(0).to_numpy(int)
+    since = state['Since'].to_numpy('datetime64[ns]')
+    last_date = state['Last_Date'].to_numpy('datetime64[ns]')
+    floor = keys.get_level_values('Param').map(PARAMS).to_numpy(float)
+    changes = []
+
+    for date, x in zip(matrix.index.to_numpy('datetime64[ns]'), matrix.to_numpy(float)):
+        has = ~np.isnan(x)
+        recent = np.where(has & np.isnan(recent), x, np.where(has, recent + FAST_ALPHA * (x - recent), recent))
+        scale = np.maximum(MAD_TO_SD * dev, floor)
+        live = has & (n >= WARMUP)
+        z = np.where(live, x - mean, 0.0)
+
+        new_pos = np.where(live, np.maximum(0.0, s_pos + z - CUSUM_K * scale), s_pos)
+        new_neg = np.where(live, np.maximum(0.0, s_neg - z - CUSUM_K * scale), s_neg)
+        start_pos = np.where((new_pos > 0) & (s_pos == 0), date, start_pos)
+        start_neg = np.where((new_neg > 0) & (s_neg == 0), date, start_neg)
+        s_pos, s_neg = new_pos, new_neg
+
+        signal = np.where(s_pos > CUSUM_H * scale, 1, np.where(s_neg > CUSUM_H * scale, -1, 0))
+        now = np.where(live, np.where(signal != 0, signal, np.where((s_pos > 0) | (s_neg > 0), drift, 0)), drift)
+        since = np.where((now != 0) & (now != drift), date, np.where(now != 0, since, np.datetime64('NaT')))
+        settled = live & (now != 0) & (date - since >= np.timedelta64(SETTLE_DAYS, 'D'))
+        mean = np.where(settled, recent, mean)
+        s_pos, s_neg = np.where(settled, 0.0, s_pos), np.where(settled, 0.0, s_neg)
+        now = np.where(settled, 0, now)
+        changes += [('close', idx, date) for idx in np.nonzero((drift != 0) & (now != drift))[0]]
+        changes += [('open', idx, now[idx], start_pos[idx] if now[idx] > 0 else start_neg[idx], mean[idx], x[idx])
+                    for idx in np.nonzero((now != 0) & (now != drift))[0]]
+        drift = now
+
+        # Baseline learns only from readings outside a drift; plain average while warming up
+        learn = has & (drift == 0)
+        alpha = np.maximum(ALPHA, 1.0 / (n + 1))
+        first = learn & np.isnan(mean)
+        step = np.where(learn & ~first, x - mean, 0.0)
+        dev = np.where(learn & ~first, dev + alpha * (np.abs(step) - dev), dev)
+        mean = np.where(first, x, mean + alpha * step)
+        n = n + has
+        last_date = np.where(has, date, last_date)
+
+    state = pd.DataFrame({'Last_Date': last_date, 'N': n, 'Mean': mean, 'Dev': dev, 'Recent': recent,
+                          'S_pos': s_pos, 'S_neg': s_neg, 'Start_pos': start_pos, 'Start_neg': start_neg,
+                          'Drift': drift, 'Since': since},
+                         index=keys).reset_index()
+    return state[STATE_COLUMNS], _record_events(events, keys, changes)
+
+
+def _record_events(events, keys, changes):
+    # Replay the day-ordered opens / closes onto the episode list
+    rows = events.to_dict('records')
+    running = {tuple(r[k] for k in STATE_KEYS): i for i, r in enumerate(rows) if pd.isna(r['End'])}
+    for change in changes:
+        key = keys[change[1]]
+        if change[0] == 'close':
+            rows[running.pop(key)]['End'] = change[2]
+        else:
+            _, _, direction, start, base, value = change
+            running[key] = len(rows)
+            rows.append(dict(zip(EVENT_COLUMNS, (*key, DIRECTIONS[direction], start, pd.NaT, base, value))))
+    out = pd.DataFrame(rows, columns=EVENT_COLUMNS)
+    out[['Start', 'End']] = out[['Start', 'End']].apply(pd.to_datetime)
+    return out
+
+
+def active_drifts(events):
+    """Episodes still running: one row per drifting (Block, Tank, Param)."""
+    return events[events['End'].isna()].reset_index(drop=True)
+
+
+# -----------------------------
+# Persistence
+# -----------------------------
+def log_identity(farm_df, source):
+    """{'source', 'tanks', 'first', 'last'}: where a farm log comes from, its Block/Tank keys and date range."""
+    tanks = (farm_df['Block'].astype(str).str.strip().str.upper() + "/"
+             + farm_df['Tank'].astype(str).str.strip().str.upper())
+    dates = farm_df['Date'].dt.normalize()
+    return {'source': str(source), 'tanks': sorted(tanks.unique()),
+            'first': str(dates.min().date()) if len(dates) else None,
+            'last': str(dates.max().date()) if len(dates) else None}
+
+
+def continues(saved, current):
+    """
+    True when state built from the log ``saved`` describes can be carried on
+    with the log ``current`` describes: same source, none of the saved tanks
+    gone, and a date range that reaches the saved one without a gap.
+    """
+    if not saved or saved.get('source') != current['source'] or not set(saved['tanks']) <= set(current['tanks']):
+        return False
+    if saved['last'] is None or current['last'] is None:
+        return saved['last'] is None
+    saved_last = pd.Timestamp(saved['last'])
+    return (pd.Timestamp(current['first']) <= saved_last + pd.Timedelta(days=1)
+            and pd.Timestamp(current['last']) >= saved_last)
+
+
+def load_state(path, source=None):
+    """
+    (state, events) saved by ``save_state``; empty frames when missing or
+    unreadable, or when given a ``source`` (``log_identity``) the saved state
+    does not ``continue``.
+    """
+    try:
+        if source is not None:
+            with open(os.path.join(path, "source.json")) as f:
+                if not continues(json.load(f), source):
+                    return empty_state()
+        return (pd.read_parquet(os.path.join(path, "state.parquet")),
+                pd.read_parquet(os.path.join(path, "events.parquet")))
+    except (OSError, ValueError, ImportError):
+        return empty_state()
+
+
+def save_state(state, events, path, source=None):
+    os.makedirs(path, exist_ok=True)
+    for name, frame in (("state", state), ("events", events)):
+        target = os.path.join(path, f"{name}.parquet")
+        tmp = f"{target}.{os.getpid()}.tmp"
+        frame.to_parquet(tmp, index=False)
+        os.replace(tmp, target)
+    if source is not None:
+        target = os.path.join(path, "source.json")
+        tmp = f"{target}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(source, f)
+        os.replace(tmp, target)
+    return path
@@ -0,0 +1,91 @@
+"""
+Downloads: the scorecard Excel workbook and PDF report, and the feed plan
+sheet as Excel or CSV.
+
+Plain functions returning bytes, so the page can hand them to
+``st.download_button`` and benchmarks can time them on their own.
+"""
+from io import BytesIO
+
+import pandas as pd
+
+from shrimp.instrument import traced
+
+
+# -----------------------------
+# EXCEL EXPORT
+# -----------------------------
+@traced("export.scorecard_excel")
+def scorecard_excel(tank_df, worker_v, consolidated_v):
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        tank_df.to_excel(writer, index=False, sheet_name='Tank_Detailed_Scorecard')
+        worker_v.to_excel(writer, sheet_name='Worker_Summary')
+        consolidated_v.to_excel(writer, sheet_name='Consolidated_Report')
+    return output.getvalue()
+
+
+# -----------------------------
+# PDF EXPORT
+# -----------------------------
+@traced("export.scorecard_pdf")
+def scorecard_pdf(cons_df, worker_v_df, start_d, end_d):
+    from fpdf import FPDF
+
+    pdf = FPDF(orientation='L', unit='mm', format='A4')
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 14)
+    pdf.cell(0, 10, txt="PJ Site Score Card", ln=True, align="C")
+    pdf.set_font("Arial","",10)
+    pdf.cell(0,5,txt=f"Period: {start_d} to {end_d}",ln=True,align="C")
+    pdf.ln(5)
+
+    # Consolidated Table
+    pdf.set_font("Arial","B",10)
+    pdf.set_fill_color(200,200,200)
+    pdf.cell(60,8,"Metric",1,0,fill=True)
+    pdf.cell(40,8,"Actual",1,0,align='C',fill=True)
+    pdf.cell(40,8,"Target",1,0,align='C',fill=True)
+    pdf.cell(40,8,"Status",1,1,align='C',fill=True)
+    pdf.set_font("Arial","",9)
+    for idx,row in cons_df.iterrows():
+        pdf.cell(60,6,str(idx),1)
+        pdf.cell(40,6,str(row['Actual']),1,0,'C')
+        pdf.cell(40,6,str(row['Target']),1,0,'C')
+        pdf.cell(40,6,str(row['Status']),1,1,'C')
+
+    # Worker Table
+    pdf.add_page()
+    pdf.set_font("Arial","B",12)
+    pdf.cell(0,10,"Worker Performance Summary",ln=True)
+    col_w = 260/(len(worker_v_df.columns)+1)
+    pdf.set_font("Arial","B",8)
+    pdf.set_fill_color(200,200,200)
+    pdf.cell(col_w,8,"Metric",1,0,fill=True)
+    for col in worker_v_df.columns:
+        pdf.cell(col_w,8,str(col),1,0,'C',fill=True)
+    pdf.ln()
+    pdf.set_font("Arial","",8)
+    for idx,row in worker_v_df.iterrows():
+        pdf.cell(col_w,6,str(idx),1)
+        for val in row:
+            pdf.cell(col_w,6,str(val),1,0,'C')
+        pdf.ln()
+    return pdf.output(dest='S').encode('latin-1')
+
+
+# -----------------------------
+# FEED PLAN EXPORT
+# -----------------------------
+@traced("export.feed_plan_excel")
+def feed_plan_excel(sheet):
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        sheet.to_excel(writer, index=False, sheet_name='Feed_Plan')
+        writer.sheets['Feed_Plan'].freeze_panes(1, 3)
+    return output.getvalue()
+
+
+@traced("export.feed_plan_csv")
+def feed_plan_csv(sheet):
+    return sheet.to_csv(index=False).encode('utf-8')
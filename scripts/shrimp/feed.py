@@ -0,0 +1,180 @@
+"""
+Next-day feed plan for every running tank.
+
+``ScheduledFeed_day_g`` arrives with the tank report; this computes what to
+schedule for the day after the report's last day, for all tanks at once:
+
+    Recommended_g = Biomass × feed rate(ABW) × Appetite × Water
+
+- Biomass: the tank's interpolated ABW (``growth.daily_growth``) grown one
+  day at its recent daily growth, times the live count after one day of its
+  recent mortality (``forecast.current_batches``);
+- feed rate: % of body weight per day, interpolated in FEED_RATE_TABLE;
+- Appetite: the feed the tank ate of what it was scheduled over the last
+  LEFTOVER_DAYS (1 - leftover ratio), or a CLEAN_PLATE_STEP increase when
+  it left less than LEFTOVER_OK;
+- Water: penalties for the last day's pH, salinity and temperature outside
+  their ranges, for dead shrimp over DEAD_LIMIT and for water-quality drift
+  (``shrimp.drift``), each named in Adjustments.
+
+Every step is a column operation or one grouped pass, so the plan is cheap
+to rebuild on each data refresh.
+
+No Streamlit dependency, like ``shrimp.metrics``.
+"""
+import numpy as np
+import pandas as pd
+
+from shrimp.forecast import current_batches
+from shrimp.instrument import traced
+
+KEYS = ['Block', 'Tank']
+
+# ABW (g) -> feed rate (% of biomass per day); edit to the farm's feed supplier table
+FEED_RATE_TABLE = pd.DataFrame({
+    'ABW_g': [0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 15.0, 20.0, 25.0, 30.0],
+    'Rate_pct': [10.0, 8.0, 6.5, 5.5, 4.5, 3.8, 3.2, 2.7, 2.3, 2.0, 1.8],
+})
+
+GROWTH_DAYS = 7              # daily growth taken over this many days
+MAX_DAILY_GROWTH = 1.08      # at most 8 % ABW gain from today to tomorrow
+LEFTOVER_DAYS = 3
+LEFTOVER_OK = 0.05           # leaving less than this counts as a clean plate
+CLEAN_PLATE_STEP = 0.05      # ... and the feed goes up this much
+MIN_FACTOR = 0.5             # Appetite × Water never cuts more than half
+ROUND_G = 10                 # recommendations are rounded to this many grams
+
+# Water / health penalties on the last logged day
+PH_RANGE, PH_FACTOR = (7.6, 8.3), 0.8
+SALINITY_RANGE, SALINITY_FACTOR = (25, 30), 0.9
+TEMPERATURE_RANGE, TEMPERATURE_FACTOR = (25, 33), 0.8
+DEAD_LIMIT, DEAD_FACTOR = 5, 0.9
+DRIFT_FACTOR = 0.9
+
+# Plan column -> feed-sheet heading
+SHEET_COLUMNS = {
+    'Date': 'Feed Date',
+    'Block': 'Block',
+    'Tank': 'Tank',
+    'Batch ID': 'Batch ID',
+    'ABW_g': 'ABW (g)',
+    'LiveCount': 'Live Count',
+    'Biomass_kg': 'Biomass (kg)',
+    'Rate_pct': 'Feed Rate (%BW)',
+    'Recommended_g': 'Recommended Feed (g)',
+    'Scheduled_today_g': 'Scheduled Today (g)',
+    'Actual_today_g': 'Actual Today (g)',
+    'Adjustments': 'Adjustments',
+}
+
+
+def feed_rate(abw):
+    """Feed rate (% of biomass per day) for each ABW, interpolated in FEED_RATE_TABLE."""
+    return np.interp(np.asarray(abw, float), FEED_RATE_TABLE['ABW_g'], FEED_RATE_TABLE['Rate_pct'])
+
+
+def _normalize_keys(df):
+    df = df.copy()
+    for col in KEYS:
+        df[col] = df[col].astype(str).str.strip().str.upper()
+    return df
+
+
+def _growth_today(growth_df, batches):
+    # ABW on each tank's last day and its daily growth factor over the GROWTH_DAYS before
+    rows = growth_df.merge(batches[KEYS + ['Batch ID', 'Last']], on=KEYS + ['Batch ID'])
+    rows = rows[(rows['Date'] >= rows['Last'] - pd.Timedelta(days=GROWTH_DAYS)) & (rows['ABW'] > 0)]
+    rows = rows.sort_values(KEYS + ['Date'], kind='stable')
+    by_tank = rows.groupby(KEYS, sort=True).agg(first=('ABW', 'first'), last=('ABW', 'last'),
+                                                 since=('Date', 'first'), until=('Date', 'last'))
+    days = (by_tank['until'] - by_tank['since']).dt.days
+    with np.errstate(divide='ignore', invalid='ignore'):
+        daily = (by_tank['last'] / by_tank['first']) ** (1 / days.where(days > 0))
+    return pd.DataFrame({'ABW_today': by_tank['last'],
+                         'Growth_day': daily.fillna(1).clip(1, MAX_DAILY_GROWTH)}).reset_index()
+
+
+def _recent_log(farm_df, batches):
+    # Last LEFTOVER_DAYS of each current batch: leftover ratio and the last day's readings
+    cols = ['Date', 'Block', 'Tank', 'Batch ID', 'ScheduledFeed_day_g', 'ActualFeed_day_g', 'DeadCount_day',
+            'pH', 'Salinity', 'WaterTemperature']
+    log = _normalize_keys(farm_df[cols])
+    for col in cols[4:]:
+        log[col] = pd.to_numeric(log[col], errors='coerce')
+    log = log.merge(batches[KEYS + ['Batch ID', 'Last']], on=KEYS + ['Batch ID'])
+    log = log[log['Date'] > log['Last'] - pd.Timedelta(days=LEFTOVER_DAYS)].sort_values(KEYS + ['Date'], kind='stable')
+
+    by_tank = log.groupby(KEYS, sort=True)
+    recent = by_tank.agg(Scheduled_3d=('ScheduledFeed_day_g', 'sum'), Actual_3d=('ActualFeed_day_g', 'sum'))
+    last = by_tank[cols[4:]].last().rename(columns={'ScheduledFeed_day_g': 'Scheduled_today_g',
+                                                    'ActualFeed_day_g': 'Actual_today_g',
+                                                    'DeadCount_day': 'Dead_today'})
+    eaten = (recent['Actual_3d'] / recent['Scheduled_3d'].where(recent['Scheduled_3d'] > 0)).clip(0, 1)
+    return last.assign(Leftover_pct=((1 - eaten) * 100).round(1)).reset_index()
+
+
+def _flag(hit, label):
+    return pd.Series(np.where(hit, "; " + label, ""), index=hit.index)
+
+
+@traced("feed.plan")
+def plan_feed(growth_df, farm_df, drift_events=None):
+    """
+    One row per running tank with ABW on its last logged day: Date (the day
+    planned for), Batch ID, ABW_g, LiveCount, Biomass_kg, Rate_pct,
+    Table_feed_g, Leftover_pct, Appetite, Water, Adjustments,
+    Recommended_g, and the last day's Scheduled_today_g / Actual_today_g.
+    ``drift_events`` are ``shrimp.drift`` episodes, or None.
+    """
+    batches = current_batches(growth_df)
+    batches = batches[batches['LiveCount'] > 0]
+    plan = batches.merge(_growth_today(growth_df, batches), on=KEYS).merge(
+        _recent_log(farm_df, batches), on=KEYS, how='left')
+
+    plan['Date'] = plan['Last'] + pd.Timedelta(days=1)
+    plan['ABW_g'] = (plan['ABW_today'] * plan['Growth_day']).round(2)
+    plan['LiveCount'] = (plan['LiveCount'] * (1 - plan['Mortality_day'])).round()
+    plan['Biomass_kg'] = (plan['LiveCount'] * plan['ABW_g'] / 1000).round(2)
+    plan['Rate_pct'] = feed_rate(plan['ABW_g']).round(2)
+    plan['Table_feed_g'] = plan['Biomass_kg'] * 1000 * plan['Rate_pct'] / 100
+
+    leftover = plan['Leftover_pct'] / 100
+    clean = leftover < LEFTOVER_OK
+    plan['Appetite'] = np.where(clean, 1 + CLEAN_PLATE_STEP, (1 - leftover).fillna(1))
+    adjustments = (_flag(clean, f"clean plate +{CLEAN_PLATE_STEP:.0%}")
+                   + _flag(~clean & leftover.notna(), "leftover " + plan['Leftover_pct'].astype(str) + " %"))
+
+    drifting = pd.Series("", index=plan.index)
+    if drift_events is not None and len(drift_events):
+        running = drift_events[drift_events['End'].isna()]
+        labels = (running['Param'] + " " + running['Direction']).groupby([running['Block'], running['Tank']]).agg(", ".join)
+        drifting = plan.set_index(KEYS).index.map(labels).fillna("").to_series(index=plan.index)
+    checks = [
+        (~plan['pH'].between(*PH_RANGE) & plan['pH'].notna(), PH_FACTOR, "pH " + plan['pH'].round(1).astype(str)),
+        (~plan['Salinity'].between(*SALINITY_RANGE) & plan['Salinity'].notna(), SALINITY_FACTOR,
+         "salinity " + plan['Salinity'].round(1).astype(str)),
+        (~plan['WaterTemperature'].between(*TEMPERATURE_RANGE) & plan['WaterTemperature'].notna(), TEMPERATURE_FACTOR,
+         "temperature " + plan['WaterTemperature'].round(1).astype(str) + " °C"),
+        (plan['Dead_today'] > DEAD_LIMIT, DEAD_FACTOR, plan['Dead_today'].fillna(0).astype(int).astype(str) + " dead"),
+        (drifting != "", DRIFT_FACTOR, drifting + " drift"),
+    ]
+    plan['Water'] = 1.0
+    for hit, factor, label in checks:
+        plan['Water'] *= np.where(hit, factor, 1.0)
+        adjustments += _flag(hit, label)
+
+    factor = np.maximum(plan['Appetite'] * plan['Water'], MIN_FACTOR)
+    plan['Recommended_g'] = (plan['Table_feed_g'] * factor / ROUND_G).round() * ROUND_G
+    plan['Adjustments'] = adjustments.str.removeprefix("; ")
+    plan['Appetite'], plan['Water'] = plan['Appetite'].round(2), plan['Water'].round(2)
+    plan['Table_feed_g'] = plan['Table_feed_g'].round()
+    return plan[['Date'] + KEYS + ['Batch ID', 'ABW_g', 'LiveCount', 'Biomass_kg', 'Rate_pct', 'Table_feed_g',
+                                   'Leftover_pct', 'Appetite', 'Water', 'Adjustments', 'Recommended_g',
+                                   'Scheduled_today_g', 'Actual_today_g']].reset_index(drop=True)
+
+
+def feed_sheet(plan):
+    """The plan with the columns and headings the feed staff work from."""
+    sheet = plan[list(SHEET_COLUMNS)].rename(columns=SHEET_COLUMNS)
+    sheet['Feed Date'] = sheet['Feed Date'].dt.date
+    return sheet
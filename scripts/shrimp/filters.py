@@ -0,0 +1,193 @@
+"""
+Sidebar filters shared by every page.
+
+The entrypoint renders the widgets once per run (so their values survive page
+switches) and stores the selection in session state. Pages then call
+``current_view_df()`` to get the filtered, cleaned frame, which is queried
+from the SQLite store for just the selected window. In compare mode
+``current_compare_df()`` gets the selected window and the previous one in one
+query, labelled by a Window column; ``selected_log(start, end)`` gets the
+selected Block / Tank over any other dates (the scorecard's own range).
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from shrimp import data, db
+from shrimp.downsample import DEFAULT_POINT_BUDGET
+
+
+# =============================
+# 2️⃣ SIDEBAR FILTERS
+# =============================
+def render_sidebar_filters(df):
+    st.sidebar.header("Filters")
+
+    # --- Block Filter ---
+    blocks = ["All"] + sorted(df['Block'].dropna().unique())
+    selected_block = st.sidebar.selectbox("Select Block", blocks)
+
+    # --- Tank Filter ---
+    expected_tanks = ["T3", "T4", "T5"]
+    if selected_block == "All":
+        tanks_available = df['Tank'].dropna().unique().tolist()
+    else:
+        tanks_available = df[df['Block'] == selected_block]['Tank'].dropna().unique().tolist()
+    for t in expected_tanks:
+        if t not in tanks_available:
+            tanks_available.append(t)
+    tanks = ["All"] + tanks_available
+    selected_tank = st.sidebar.selectbox("Select Tank", tanks)
+
+    # --- View Mode ---
+    view_option = st.sidebar.radio("View Mode", ["Daily", "Weekly", "Monthly"])
+
+    selection = {
+        'block': selected_block,
+        'tank': selected_tank,
+        'view_option': view_option,
+        'date': "All",
+        'week': None,
+        'week_start': None,
+        'week_end': None,
+        'month': None,
+    }
+
+    # --- Date / Week / Month Selector ---
+    if view_option == "Daily":
+        dates = ["All"] + sorted(df['Date'].dt.date.unique())
+        selection['date'] = st.sidebar.selectbox("Select Date", dates)
+
+    elif view_option == "Weekly":
+        week_starts = df['Date'] - pd.to_timedelta(df['Date'].dt.weekday, unit='d')
+        week_ranges = pd.DataFrame({'Week_Start': week_starts, 'Week_End': week_starts + pd.Timedelta(days=6)})
+        week_ranges = week_ranges.drop_duplicates().sort_values('Week_Start')
+        week_options = week_ranges.apply(lambda r: f"{r['Week_Start'].date()} to {r['Week_End'].date()}", axis=1).tolist()
+        week_options = ["All"] + week_options
+        selected_week = st.sidebar.selectbox("Select Week", week_options)
+        # Determine start & end dates
+        if selected_week == "All":
+            week_start = df['Date'].min()
+            week_end = df['Date'].max()
+        else:
+            week_start, week_end = selected_week.split(" to ")
+            week_start = pd.to_datetime(week_start)
+            week_end = pd.to_datetime(week_end)
+        selection.update(week=selected_week, week_start=week_start, week_end=week_end)
+
+    elif view_option == "Monthly":
+        month_options = sorted(df['Date'].dt.to_period('M').astype(str).unique())
+        selection['month'] = st.sidebar.selectbox("Select Month", month_options)
+
+    # Long daily charts are thinned to this many points (critical points always kept)
+    selection['point_budget'] = st.sidebar.number_input(
+        "Max chart points", min_value=500, step=500, value=DEFAULT_POINT_BUDGET
+    )
+
+    # Views and the scorecard also show the change from the period before
+    st.sidebar.checkbox("Compare with previous period", key="compare_previous")
+    st.sidebar.checkbox("Show performance panel", key="show_performance")
+
+    st.session_state["view_filters"] = selection
+    return selection
+
+
+# =============================
+# 3️⃣ FILTER DATA
+# =============================
+def selected_tanks(df, selection):
+    """Rows of the sidebar's Block and Tank ("All" keeps every one)."""
+    if selection['block'] != "All":
+        df = df[df['Block'] == selection['block']]
+    if selection['tank'] != "All":
+        df = df[df['Tank'] == selection['tank']]
+    return df
+
+
+def apply_filters(df, selection):
+    view_df = selected_tanks(df, selection)
+
+    view_option = selection['view_option']
+    if view_option == "Daily" and selection['date'] != "All":
+        view_df = view_df[view_df['Date'].dt.date == selection['date']]
+
+    elif view_option == "Weekly":
+        view_df = view_df[(view_df['Date'] >= selection['week_start']) & (view_df['Date'] <= selection['week_end'])]
+
+    elif view_option == "Monthly":
+        view_df = view_df[view_df['Date'].dt.to_period('M').astype(str) == selection['month']]
+
+    return data.prepare_view_df(view_df)
+
+
+def selection_key(selection):
+    """Hashable form of a selection, used as a cache key."""
+    return tuple(sorted(selection.items()))
+
+
+def current_selection():
+    return st.session_state["view_filters"]
+
+
+def baseline_selection(selection):
+    """The same selection one day / week / month earlier, or None when "All" dates are selected."""
+    baseline = dict(selection)
+    view_option = selection['view_option']
+    if view_option == "Daily" and selection['date'] != "All":
+        baseline['date'] = selection['date'] - pd.Timedelta(days=1)
+    elif view_option == "Weekly" and selection['week'] != "All":
+        week_start = selection['week_start'] - pd.Timedelta(days=7)
+        week_end = selection['week_end'] - pd.Timedelta(days=7)
+        baseline.update(week=f"{week_start.date()} to {week_end.date()}", week_start=week_start, week_end=week_end)
+    elif view_option == "Monthly" and selection['month']:
+        baseline['month'] = str(pd.Period(selection['month'], freq='M') - 1)
+    else:
+        return None
+    return baseline
+
+
+def baseline_label(selection):
+    baseline = baseline_selection(selection)
+    if baseline is None:
+        return None
+    view_option = baseline['view_option']
+    return {"Daily": str(baseline['date']), "Weekly": baseline['week'], "Monthly": baseline['month']}[view_option]
+
+
+def compare_mode():
+    return st.session_state.get("compare_previous", False)
+
+
+def current_view_df():
+    selection = current_selection()
+    start, end, end_inclusive = db.selection_window(selection)
+    view_df = db.farm_log_window(data.data_version(), start, end,
+                                 selection['block'], selection['tank'], end_inclusive)
+    return data.prepare_view_df(view_df)
+
+
+def selected_log(start, end):
+    """The sidebar's Block / Tank from ``start`` to ``end`` (both inclusive), whatever its dates."""
+    selection = current_selection()
+    log_df = db.farm_log_window(data.data_version(), pd.Timestamp(start), pd.Timestamp(end) + pd.Timedelta(days=1),
+                                selection['block'], selection['tank'], False)
+    return data.prepare_view_df(log_df)
+
+
+def current_compare_df():
+    """
+    The selected window and the one before it from a single window query,
+    labelled by a Window column ("Current" / "Baseline"); None when there is
+    no previous period to compare with.
+    """
+    selection = current_selection()
+    baseline = baseline_selection(selection)
+    if baseline is None:
+        return None
+    start, end, end_inclusive = db.selection_window(selection)
+    baseline_start, _, _ = db.selection_window(baseline)
+    compare_df = db.farm_log_window(data.data_version(), baseline_start, end,
+                                    selection['block'], selection['tank'], end_inclusive)
+    compare_df = data.prepare_view_df(compare_df)
+    compare_df['Window'] = np.where(compare_df['Date'] >= start, "Current", "Baseline")
+    return compare_df
@@ -0,0 +1,207 @@
+"""
+Growth and harvest forecast per tank.
+
+Each tank's current batch is fitted on its weighed samples: ABW^(1/3) is
+close to linear in days of culture (length grows about linearly and weight
+goes with length cubed, see ``shrimp.sizes``), so a scikit-learn
+``BayesianRidge`` on days gives the curve and its predictive spread.
+``forecast_growth`` projects every tank day by day from its last logged day
+out to HORIZON_DAYS: ABW with an 80 % band, live count at the batch's recent
+daily mortality, and biomass; ``harvest_dates`` reads off when each tank
+reaches market size.
+
+``fit_growth_models`` fits the tanks in parallel through joblib and keeps
+every model with a hash of the samples it was fitted on, so a model store
+(``load_models`` / ``save_models``, keyed on the data source the models
+came from) refits only tanks whose batch or samples changed:
+
+    models = fit_growth_models(forecast_samples(growth_df), load_models(path, source))
+    save_models(models, path, source)
+    daily = forecast_growth(models, current_batches(growth_df))
+
+The input is the ``growth.daily_growth`` table. No Streamlit dependency,
+like ``shrimp.metrics``.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from shrimp.instrument import span, traced
+
+KEYS = ['Block', 'Tank']
+
+# Bump when the model or its features change: stored models of another version are refitted
+MODEL_VERSION = 1
+MIN_SAMPLES = 3
+HORIZON_DAYS = 120
+# Market size (g) for harvest_dates unless the page asks for another
+HARVEST_ABW_G = 20.0
+# Daily mortality is taken over the batch's last this-many logged days
+MORTALITY_DAYS = 14
+# Two-sided 80 % band of a normal predictive distribution
+BAND_Z = 1.2816
+# Joblib workers for fitting (-1: all cores)
+N_JOBS = int(os.environ.get("SHRIMP_FIT_JOBS", -1))
+
+
+# -----------------------------
+# Inputs from the daily growth table
+# -----------------------------
+def current_batches(growth_df):
+    """
+    Batch in each (Block, Tank) on the table's last day: Batch ID, Stocked
+    (first logged day), Last, its LiveCount then and the daily mortality
+    rate over its last MORTALITY_DAYS days. Tanks not logged that day
+    (harvested or empty) are left out.
+    """
+    last_batch = growth_df.loc[growth_df['Date'] == growth_df['Date'].max(), KEYS + ['Batch ID']].drop_duplicates(KEYS)
+    rows = growth_df.merge(last_batch, on=KEYS + ['Batch ID']).sort_values(KEYS + ['Date'], kind='stable')
+
+    by_tank = rows.groupby(KEYS, sort=True)
+    batches = by_tank.agg(**{'Batch ID': ('Batch ID', 'first'), 'Stocked': ('Date', 'min'),
+                             'Last': ('Date', 'max'), 'LiveCount': ('LiveCount', 'last')}).reset_index()
+    recent = rows[rows['Date'] > rows.groupby(KEYS)['Date'].transform('max') - pd.Timedelta(days=MORTALITY_DAYS)]
+    window = recent.groupby(KEYS, sort=True).agg(start=('LiveCount', 'first'), end=('LiveCount', 'last'),
+                                                 first=('Date', 'min'), last=('Date', 'max'))
+    days = (window['last'] - window['first']).dt.days
+    with np.errstate(divide='ignore', invalid='ignore'):
+        survival = (window['end'] / window['start']).where((window['start'] > 0) & (days > 0))
+        rate = (1 - survival.clip(0, 1) ** (1 / days)).fillna(0)
+    batches['Mortality_day'] = rate.to_numpy()
+    return batches
+
+
+def forecast_samples(growth_df):
+    """Weighed days of each tank's current batch: Batch ID, Days (of culture), ABW."""
+    batches = current_batches(growth_df)
+    samples = growth_df[(growth_df['ABW_Source'] == 'sample') & (growth_df['ABW'] > 0)]
+    samples = samples.merge(batches[KEYS + ['Batch ID', 'Stocked']], on=KEYS + ['Batch ID'])
+    samples = samples.assign(Days=(samples['Date'] - samples['Stocked']).dt.days)
+    return samples[KEYS + ['Batch ID', 'Days', 'ABW']].sort_values(KEYS + ['Days'], kind='stable')
+
+
+# -----------------------------
+# Fitting
+# -----------------------------
+def _fit_tank(days, abw):
+    from sklearn.linear_model import BayesianRidge
+
+    return BayesianRidge().fit(np.asarray(days, float).reshape(-1, 1), np.cbrt(abw))
+
+
+def _sample_hash(frame):
+    return int(pd.util.hash_pandas_object(frame[['Batch ID', 'Days', 'ABW']], index=False).sum())
+
+
+@traced("forecast.fit_growth_models")
+def fit_growth_models(samples, previous=None, n_jobs=N_JOBS):
+    """
+    {(Block, Tank): {'hash', 'batch', 'model', 'n'}} for every tank with at
+    least MIN_SAMPLES samples. Entries of ``previous`` whose samples are
+    unchanged are reused; the rest are fitted in parallel with joblib.
+    """
+    from joblib import Parallel, delayed
+
+    previous = previous or {}
+    models, stale = {}, []
+    for key, frame in samples.groupby(KEYS, sort=True):
+        if len(frame) < MIN_SAMPLES:
+            continue
+        entry = {'hash': _sample_hash(frame), 'batch': frame['Batch ID'].iloc[0], 'n': len(frame)}
+        kept = previous.get(key)
+        if kept is not None and kept['hash'] == entry['hash']:
+            models[key] = kept
+        else:
+            stale.append((key, entry, frame))
+
+    with span("forecast.refit") as s:
+        fitted = Parallel(n_jobs=n_jobs, prefer="threads")(
+            delayed(_fit_tank)(frame['Days'].to_numpy(), frame['ABW'].to_numpy()) for _, _, frame in stale)
+        s.rows = len(stale)
+    for (key, entry, _), model in zip(stale, fitted):
+        models[key] = {**entry, 'model': model}
+    return models
+
+
+def load_models(path, source=None):
+    """
+    Models saved by ``save_models``; empty when missing, unreadable, of
+    another MODEL_VERSION or saved for another ``source``.
+    """
+    import joblib
+
+    try:
+        stored = joblib.load(path)
+    except (OSError, EOFError, ValueError, KeyError, AttributeError, ImportError):
+        return {}
+    if not isinstance(stored, dict) or stored.get('version') != MODEL_VERSION or stored.get('source') != source:
+        return {}
+    return stored['models']
+
+
+def save_models(models, path, source=None):
+    """Write the models of data source ``source`` atomically for the next process or data version."""
+    import joblib
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    joblib.dump({'version': MODEL_VERSION, 'source': source, 'models': models}, tmp)
+    os.replace(tmp, path)
+    return path
+
+
+# -----------------------------
+# Forecast
+# -----------------------------
+def _cube(x):
+    return np.clip(x, 0, None) ** 3
+
+
+@traced("forecast.forecast_growth")
+def forecast_growth(models, batches, horizon_days=HORIZON_DAYS):
+    """
+    One row per modelled tank per day from its last logged day to
+    ``horizon_days`` later: Days, ABW with ABW_lo / ABW_hi (80 % band),
+    LiveCount and Biomass_kg (with Biomass_lo_kg / Biomass_hi_kg).
+    """
+    batches = batches[[tuple(k) in models for k in batches[KEYS].itertuples(index=False)]]
+    steps = np.arange(horizon_days + 1)
+    grid = batches.loc[batches.index.repeat(len(steps))].reset_index(drop=True)
+    grid['Ahead'] = np.tile(steps, len(batches))
+    grid['Date'] = grid['Last'] + pd.to_timedelta(grid['Ahead'], unit='D')
+    grid['Days'] = (grid['Date'] - grid['Stocked']).dt.days
+
+    mean, std = np.empty(len(grid)), np.empty(len(grid))
+    for i, key in enumerate(batches[KEYS].itertuples(index=False)):
+        rows = slice(i * len(steps), (i + 1) * len(steps))
+        mean[rows], std[rows] = models[tuple(key)]['model'].predict(
+            grid['Days'].to_numpy(float)[rows].reshape(-1, 1), return_std=True)
+
+    grid['ABW'], grid['ABW_lo'], grid['ABW_hi'] = (_cube(mean), _cube(mean - BAND_Z * std),
+                                                   _cube(mean + BAND_Z * std))
+    grid['LiveCount'] = grid['LiveCount'] * (1 - grid['Mortality_day']) ** grid['Ahead']
+    for col, abw in (('Biomass_kg', 'ABW'), ('Biomass_lo_kg', 'ABW_lo'), ('Biomass_hi_kg', 'ABW_hi')):
+        grid[col] = grid['LiveCount'] * grid[abw] / 1000
+    return grid.drop(columns=['Last', 'Mortality_day'])
+
+
+def harvest_dates(daily, market_abw=HARVEST_ABW_G):
+    """
+    Per tank the first forecast day at ``market_abw``: Harvest_Date from the
+    central curve, Harvest_Early / Harvest_Late from the top / bottom of the
+    band (NaT beyond the horizon), Days_to_harvest and Biomass_at_harvest_kg.
+    """
+    def first_day(col):
+        hit = daily[daily[col] >= market_abw]
+        return hit.groupby(KEYS)['Date'].min()
+
+    table = daily.groupby(KEYS).agg(**{'Batch ID': ('Batch ID', 'first'), 'From': ('Date', 'min'),
+                                       'ABW_now': ('ABW', 'first')})
+    table['Harvest_Date'] = first_day('ABW')
+    table['Harvest_Early'] = first_day('ABW_hi')
+    table['Harvest_Late'] = first_day('ABW_lo')
+    table['Days_to_harvest'] = (table['Harvest_Date'] - table['From']).dt.days
+    at_harvest = daily.merge(table['Harvest_Date'].dropna().rename('Date').reset_index(), on=KEYS + ['Date'])
+    table['Biomass_at_harvest_kg'] = at_harvest.set_index(KEYS)['Biomass_kg'].round(1)
+    return table.reset_index().sort_values(['Harvest_Date'] + KEYS, kind='stable').reset_index(drop=True)
@@ -0,0 +1,205 @@
+"""
+ABW samples lined up against the daily farm log.
+
+``AvgBW.xlsx`` is sampled every few days while the farm log has a row per
+tank per day. ``align_abw`` attaches to every log row the latest sample of
+its (Block, Tank) taken on or before that day, in one sorted as-of join over
+all tanks, so daily biomass is a column and any sub-window is just a date
+slice of the aligned frame:
+
+    aligned = align_abw(view_df, abw_df)
+    week = aligned[aligned['Date'].between(start, end)]
+    week.groupby(['Block', 'Tank'])['Biomass_kg'].last()
+
+``daily_growth`` goes one step further and interpolates a daily ABW curve
+between samples (log-linear, i.e. constant relative growth per day), giving
+daily biomass and the cumulative FCR of each batch. ``extend_daily_growth``
+updates an earlier table for a newer report or ABW file by recomputing only
+the batches whose log rows or samples changed.
+
+No Streamlit dependency, like ``shrimp.metrics``.
+"""
+import numpy as np
+import pandas as pd
+
+from shrimp.instrument import traced
+
+KEYS = ['Block', 'Tank']
+BATCH_KEYS = KEYS + ['Batch ID']
+
+# Days a sample's weight is carried past the last sample of a batch
+MAX_HOLD_DAYS = 14
+
+GROWTH_COLUMNS = ['Date', 'Block', 'Tank', 'Batch ID', 'InitialCount', 'LiveCount', 'ActualFeed_day_g']
+
+
+def abw_samples(abw_df):
+    """One weighed sample per (Block, Tank, Date), oldest first: ABW_Date, ABW (g), CV_pct."""
+    samples = abw_df.dropna(subset=['Date', 'Avg Weight'])
+    cv = samples['CV_pct'] if 'CV_pct' in samples.columns else 0.0
+    samples = pd.DataFrame({
+        'Block': samples['Block'], 'Tank': samples['Tank'], 'ABW_Date': samples['Date'],
+        'ABW': samples['Avg Weight'].astype(float), 'CV_pct': cv,
+    })
+    samples = samples.sort_values('ABW_Date', kind='stable').drop_duplicates(KEYS + ['ABW_Date'], keep='last')
+    return samples.reset_index(drop=True)
+
+
+@traced("growth.align_abw")
+def align_abw(view_df, abw_df):
+    """
+    ``view_df`` sorted by Date with the latest ABW sample of each row's tank on
+    or before its date (ABW_Date, ABW, CV_pct) and Biomass_kg = LiveCount × ABW.
+    Rows before a tank's first sample keep NaN.
+    """
+    samples = abw_samples(abw_df)
+    samples['Date'] = samples['ABW_Date'].astype(view_df['Date'].dtype)
+    left = view_df.drop(columns=['ABW_Date', 'ABW', 'CV_pct', 'Biomass_kg'], errors='ignore')
+    aligned = pd.merge_asof(left.sort_values('Date', kind='stable'), samples, on='Date', by=KEYS,
+                            direction='backward')
+    aligned['Biomass_kg'] = aligned['LiveCount'] * aligned['ABW'] / 1000
+    return aligned
+
+
+def window_rows(aligned, start, end):
+    """Aligned rows dated in [start, end]; ``In_Window`` marks samples also taken inside it."""
+    rows = aligned[(aligned['Date'] >= start) & (aligned['Date'] <= end)].copy()
+    rows['In_Window'] = rows['ABW_Date'] >= start
+    return rows
+
+
+# -----------------------------
+# Daily ABW curve
+# -----------------------------
+def _asof(frame, samples, direction, suffix):
+    side = samples.rename(columns={'ABW_Date': f'Date_{suffix}', 'ABW': f'ABW_{suffix}'})
+    side['Date'] = side[f'Date_{suffix}'].astype(frame['Date'].dtype)
+    return pd.merge_asof(frame, side[KEYS + ['Date', f'Date_{suffix}', f'ABW_{suffix}']],
+                         on='Date', by=KEYS, direction=direction)
+
+
+@traced("growth.interpolate_abw")
+def interpolate_abw(frame, abw_df):
+    """
+    ``frame`` (Block, Tank, Date) sorted by Date, with ABW (g) for every row and
+    ABW_Source: "sample" on a sampling day, "interpolated" between two samples
+    where the weight grew (log-linear), "held" otherwise (last sample carried
+    up to MAX_HOLD_DAYS). With a Batch ID column, only samples taken while that
+    batch was in the tank are used, so a restock never blends two batches.
+    """
+    samples = abw_samples(abw_df)[KEYS + ['ABW_Date', 'ABW']]
+    out = _asof(frame.sort_values('Date', kind='stable'), samples, 'backward', 'prev')
+    out = _asof(out, samples, 'forward', 'next')
+
+    if 'Batch ID' in out.columns:
+        batch_days = out.groupby(BATCH_KEYS, dropna=False)['Date']
+        first, last = batch_days.transform('min'), batch_days.transform('max')
+        prev_ok = out['Date_prev'] >= first
+        next_ok = out['Date_next'] <= last
+        out['ABW_prev'] = out['ABW_prev'].where(prev_ok)
+        out['Date_prev'] = out['Date_prev'].where(prev_ok)
+        out['ABW_next'] = out['ABW_next'].where(next_ok)
+        out['Date_next'] = out['Date_next'].where(next_ok)
+
+    since = (out['Date'] - out['Date_prev']).dt.days
+    span = (out['Date_next'] - out['Date_prev']).dt.days
+    growing = (out['ABW_prev'] > 0) & (out['ABW_next'] >= out['ABW_prev']) & (span > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_prev = np.log(out['ABW_prev'].where(out['ABW_prev'] > 0))
+        curve = np.exp(log_prev + (np.log(out['ABW_next'].where(growing)) - log_prev) * since / span)
+    held = out['ABW_prev'].notna() & (since <= MAX_HOLD_DAYS)
+
+    out['ABW'] = np.where(growing, curve, out['ABW_prev'].where(held))
+    out['ABW_Source'] = np.select([out['ABW_prev'].notna() & (since == 0), growing, held],
+                                  ['sample', 'interpolated', 'held'], None)
+    return out.drop(columns=['Date_prev', 'ABW_prev', 'Date_next', 'ABW_next'])
+
+
+def abw_curve(abw_df):
+    """Daily ABW per (Block, Tank) from its first to its last sample."""
+    samples = abw_samples(abw_df)
+    if samples.empty:
+        return pd.DataFrame(columns=KEYS + ['Date', 'ABW', 'ABW_Source'])
+    bounds = samples.groupby(KEYS)['ABW_Date'].agg(['min', 'max']).reset_index()
+    days = (bounds['max'] - bounds['min']).dt.days + 1
+    grid = bounds.loc[bounds.index.repeat(days), KEYS].reset_index(drop=True)
+    offsets = np.arange(len(grid)) - np.repeat(np.cumsum(days.to_numpy()) - days.to_numpy(), days.to_numpy())
+    grid['Date'] = np.repeat(bounds['min'].to_numpy(), days.to_numpy()) + pd.to_timedelta(offsets, unit='D')
+    return interpolate_abw(grid, abw_df)
+
+
+# -----------------------------
+# Daily biomass and cumulative FCR
+# -----------------------------
+def _normalize_key(col):
+    # Strip / upper-case each distinct label once rather than every row
+    codes, labels = pd.factorize(col, use_na_sentinel=False)
+    return pd.Series(pd.Index(labels).astype(str).str.strip().str.upper()[codes], index=col.index)
+
+
+def _growth_rows(view_df):
+    rows = view_df[GROWTH_COLUMNS].copy()
+    rows['Block'] = _normalize_key(rows['Block'])
+    rows['Tank'] = _normalize_key(rows['Tank'])
+    for col in ['InitialCount', 'LiveCount', 'ActualFeed_day_g']:
+        rows[col] = pd.to_numeric(rows[col], errors='coerce').fillna(0)
+    return rows.dropna(subset=['Date'])
+
+
+@traced("growth.daily_growth")
+def daily_growth(view_df, abw_df):
+    """
+    One row per tank per logged day: interpolated ABW, Biomass_kg, and per
+    batch the feed since its first weighed day (Feed_cum_kg), the biomass
+    gained since then (Gain_kg) and their ratio (Cum_FCR).
+    """
+    table = interpolate_abw(_growth_rows(view_df), abw_df)
+    table = table.sort_values(BATCH_KEYS + ['Date'], kind='stable').reset_index(drop=True)
+    table['Biomass_kg'] = table['LiveCount'] * table['ABW'] / 1000
+
+    batch = table.groupby(BATCH_KEYS, dropna=False, sort=False)
+    weighed = table['Biomass_kg'].notna().astype(int).groupby([table[k] for k in BATCH_KEYS], dropna=False).cummax()
+    table['Feed_cum_kg'] = (table['ActualFeed_day_g'] * weighed).groupby(
+        [table[k] for k in BATCH_KEYS], dropna=False).cumsum() / 1000
+    table['Gain_kg'] = table['Biomass_kg'] - batch['Biomass_kg'].transform('first')
+    table['Cum_FCR'] = (table['Feed_cum_kg'] / table['Gain_kg']).where(table['Gain_kg'] > 0)
+    return table
+
+
+@traced("growth.extend_daily_growth")
+def extend_daily_growth(previous, previous_abw_df, view_df, abw_df):
+    """
+    ``daily_growth(view_df, abw_df)`` from an earlier table built on
+    ``previous_abw_df``: batches with new or changed log rows, or with a new
+    or changed sample on one of their days, are recomputed; the rest is reused.
+    """
+    rows = _growth_rows(view_df)
+    new_hash, old_hash = _row_hash(rows), _row_hash(previous[GROWTH_COLUMNS])
+    touched = pd.concat([rows.loc[~np.isin(new_hash, old_hash), BATCH_KEYS],
+                         previous.loc[~np.isin(old_hash, new_hash), BATCH_KEYS]])
+
+    samples_diff = abw_samples(abw_df)[KEYS + ['ABW_Date', 'ABW']].merge(
+        abw_samples(previous_abw_df)[KEYS + ['ABW_Date', 'ABW']], how='outer', indicator=True)
+    changed = samples_diff.loc[samples_diff['_merge'] != 'both', KEYS + ['ABW_Date']]
+    if not changed.empty:
+        # Samples outside a batch's logged days are never used for it
+        spans = rows.groupby(BATCH_KEYS, dropna=False)['Date'].agg(['min', 'max']).reset_index()
+        spans = spans.merge(changed, on=KEYS)
+        hit = (spans['ABW_Date'] >= spans['min']) & (spans['ABW_Date'] <= spans['max'])
+        touched = pd.concat([touched, spans.loc[hit, BATCH_KEYS]])
+
+    touched = touched.drop_duplicates()
+    if touched.empty:
+        return previous
+    kept = previous[~_in_batches(previous, touched)]
+    fresh = daily_growth(rows[_in_batches(rows, touched)], abw_df)
+    table = pd.concat([kept, fresh], ignore_index=True)
+    return table.sort_values(BATCH_KEYS + ['Date'], kind='stable').reset_index(drop=True)
+
+
+def _row_hash(df):
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def _in_batches(df, batches):
+    return np.isin(_row_hash(df[BATCH_KEYS]), _row_hash(batches))
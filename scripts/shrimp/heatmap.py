@@ -0,0 +1,91 @@
+"""
+Pivot store behind the Block × Date heatmap page.
+
+For every heatmap metric the farm log is pivoted once per data version into a
+dense float32 matrix (one row per Block | Tank, one column per calendar day,
+NaN where nothing was logged). The page then only slices rows and a date
+window out of these arrays, so switching metric or moving the window never
+touches the raw log again.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from shrimp.instrument import cached, traced
+
+# Heatmap metric -> (source column, how same-day rows combine, colour scale)
+HEATMAP_METRICS = {
+    "pH": ("pH", "mean", "RdYlGn"),
+    "Salinity (ppt)": ("Salinity", "mean", "RdYlGn"),
+    "Water Temperature": ("WaterTemperature", "mean", "RdYlBu_r"),
+    "Dead Shrimp Count": ("DeadCount_day", "sum", "Reds"),
+    "Feed Efficiency (%)": ("FeedEfficiency_pct", "mean", "RdYlGn"),
+}
+
+# Colour midpoints, so in-range values sit in the middle of the scale
+HEATMAP_MIDPOINTS = {"pH": 7.95, "Salinity (ppt)": 27.5, "Water Temperature": 29}
+
+
+def _pivot(row_codes, day_codes, values, shape, how):
+    """Dense float32 (rows × days) matrix; NaN where a cell has no values."""
+    valid = ~np.isnan(values)
+    rows, days, values = row_codes[valid], day_codes[valid], values[valid]
+    total = np.zeros(shape, dtype=np.float64)
+    count = np.zeros(shape, dtype=np.int32)
+    np.add.at(total, (rows, days), values)
+    np.add.at(count, (rows, days), 1)
+    if how == "mean":
+        total = np.divide(total, count, out=np.zeros_like(total), where=count > 0)
+    total[count == 0] = np.nan
+    return total.astype(np.float32)
+
+
+@cached(st.cache_resource(max_entries=2, show_spinner="Building heatmaps..."))
+def pivot_store(data_version, _farm_df):
+    """
+    {'blocks', 'tanks', 'labels', 'dates', 'matrices': {metric: ndarray}}
+    for the whole farm log. Shared between sessions; treat it as read-only.
+    """
+    df = _farm_df[['Date', 'Block', 'Tank']].copy()
+    for col in ['pH', 'Salinity', 'WaterTemperature', 'DeadCount_day', 'ActualFeed_day_g', 'ScheduledFeed_day_g']:
+        df[col] = pd.to_numeric(_farm_df[col], errors='coerce')
+    feed_used = df[['ActualFeed_day_g', 'ScheduledFeed_day_g']].min(axis=1)
+    df['FeedEfficiency_pct'] = feed_used / df['ScheduledFeed_day_g'].where(df['ScheduledFeed_day_g'] > 0) * 100
+    df = df.dropna(subset=['Block', 'Tank'])
+
+    days = df['Date'].dt.normalize()
+    dates = pd.date_range(days.min(), days.max(), freq='D')
+    day_codes = ((days - dates[0]) // pd.Timedelta(days=1)).to_numpy()
+
+    keys = df[['Block', 'Tank']].astype(str).drop_duplicates().sort_values(['Block', 'Tank'])
+    row_index = pd.MultiIndex.from_frame(keys)
+    row_codes = row_index.get_indexer(pd.MultiIndex.from_frame(df[['Block', 'Tank']].astype(str)))
+
+    shape = (len(row_index), len(dates))
+    matrices = {
+        metric: _pivot(row_codes, day_codes, df[col].to_numpy(dtype=float), shape, how)
+        for metric, (col, how, _) in HEATMAP_METRICS.items()
+    }
+    return {
+        'blocks': keys['Block'].to_numpy(),
+        'tanks': keys['Tank'].to_numpy(),
+        'labels': (keys['Block'] + " | " + keys['Tank']).tolist(),
+        'dates': dates,
+        'matrices': matrices,
+    }
+
+
+@traced("heatmap.slice")
+def heatmap_slice(store, metric, block="All", tank="All", start=None, end=None):
+    """(matrix, row labels, dates) for the selected rows and date window."""
+    rows = np.ones(len(store['labels']), dtype=bool)
+    if block != "All":
+        rows &= store['blocks'] == block
+    if tank != "All":
+        rows &= store['tanks'] == tank
+    dates = store['dates']
+    lo = 0 if start is None else dates.searchsorted(pd.Timestamp(start))
+    hi = len(dates) if end is None else dates.searchsorted(pd.Timestamp(end), side='right')
+    matrix = store['matrices'][metric][rows, lo:hi]
+    labels = [label for label, keep in zip(store['labels'], rows) if keep]
+    return matrix, labels, dates[lo:hi]
@@ -0,0 +1,212 @@
+"""
+Lightweight instrumentation: timed spans, row counts and cache hit/miss
+counts for every pipeline stage.
+
+No Streamlit dependency, so the metrics library, the API and the benchmarks
+can use it too. Each finished span and each cache lookup is
+
+* appended as one JSON line to ``PERF_LOG`` (``SHRIMP_PERF_LOG``, default
+  ``logs/perf.jsonl`` in the repo root; set it to an empty string to turn the
+  file off),
+* handed to the session hook, if one is set; the dashboard uses it to show
+  the current session's spans in the sidebar Performance panel, and
+* passed to every listener added with ``add_listener`` (the Prometheus
+  export in ``shrimp.prom`` is one).
+
+    with span("load.tank_report") as s:
+        df = pd.read_excel(path)
+        s.rows = len(df)
+
+    @traced("metrics.kpis")          # rows = len(first DataFrame argument)
+    def kpis(view_df): ...
+
+    @cached(st.cache_data(max_entries=64), "db.farm_log_window")
+    def farm_log_window(...): ...
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+_DEFAULT_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "logs", "perf.jsonl")
+PERF_LOG = os.environ.get("SHRIMP_PERF_LOG", os.path.abspath(_DEFAULT_LOG))
+
+_local = threading.local()
+_lock = threading.Lock()
+_cache_counts = Counter()   # (name, "hit" | "miss") -> count, for the whole process
+_session_hook = None
+_listeners = []
+_logger = None
+
+
+# ---------------------------
+# Sinks
+# ---------------------------
+def set_session_hook(hook):
+    """
+    ``hook()`` returns ``(events, context)`` for the session running on this
+    thread, or None outside a session. Finished events are appended to
+    ``events``; ``context`` (e.g. session id, page) is added to each log line.
+    """
+    global _session_hook
+    _session_hook = hook
+
+
+def add_listener(fn):
+    """``fn(event, context)`` is called for every finished span and cache lookup."""
+    if fn not in _listeners:
+        _listeners.append(fn)
+
+
+def _log():
+    global _logger
+    if _logger is None:
+        with _lock:
+            if _logger is None:
+                logger = logging.getLogger("shrimp.perf")
+                logger.propagate = False
+                if PERF_LOG:
+                    try:
+                        os.makedirs(os.path.dirname(PERF_LOG), exist_ok=True)
+                        handler = RotatingFileHandler(PERF_LOG, maxBytes=5_000_000, backupCount=3, encoding="utf-8")
+                        handler.setFormatter(logging.Formatter("%(message)s"))
+                        logger.addHandler(handler)
+                        logger.setLevel(logging.INFO)
+                    except OSError:
+                        # A read-only deployment still gets the sidebar panel
+                        pass
+                _logger = logger
+    return _logger
+
+
+def _emit(event):
+    session = _session_hook() if _session_hook else None
+    context = {}
+    if session is not None:
+        events, context = session
+        events.append(event)
+    for listener in _listeners:
+        listener(event, context)
+    event = {**event, **context}
+    logger = _log()
+    if logger.handlers:
+        logger.info(json.dumps({"ts": datetime.now().isoformat(timespec="milliseconds"), **event}, default=str))
+
+
+# ---------------------------
+# Spans
+# ---------------------------
+class Span:
+    __slots__ = ("name", "rows", "depth", "parent")
+
+    def __init__(self, name, rows, depth, parent):
+        self.name, self.rows, self.depth, self.parent = name, rows, depth, parent
+
+
+@contextmanager
+def span(name, rows=None):
+    """Time the block as ``name``; set ``.rows`` on the yielded span to record a row count."""
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    s = Span(name, rows, len(stack), stack[-1].name if stack else None)
+    stack.append(s)
+    start = time.perf_counter()
+    error = None
+    try:
+        yield s
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        ms = round((time.perf_counter() - start) * 1000, 2)
+        stack.pop()
+        event = {"event": "span", "name": name, "ms": ms, "rows": s.rows, "depth": s.depth, "parent": s.parent}
+        if error:
+            event["error"] = error
+        _emit(event)
+
+
+def _row_count(value):
+    return len(value) if hasattr(value, "columns") else None
+
+
+def traced(name=None):
+    """Decorator form of ``span``; rows are taken from the first DataFrame argument."""
+    def wrap(fn):
+        label = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            rows = next((r for r in map(_row_count, (*args, *kwargs.values())) if r is not None), None)
+            with span(label, rows):
+                return fn(*args, **kwargs)
+        return call
+    return wrap
+
+
+def mark(name):
+    """Record a one-off event such as a script rerun."""
+    _emit({"event": "mark", "name": name})
+
+
+# ---------------------------
+# Cache hit / miss counts
+# ---------------------------
+def _misses():
+    misses = getattr(_local, "misses", None)
+    if misses is None:
+        misses = _local.misses = Counter()
+    return misses
+
+
+def cached(cache_decorator, name=None):
+    """
+    Apply ``cache_decorator`` (e.g. ``st.cache_data(...)``) and count hits and
+    misses: a call is a miss when the wrapped body actually ran. The cache
+    still sees the original function's name, source and signature, so
+    ``_``-prefixed arguments stay unhashed.
+    """
+    def wrap(fn):
+        label = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+        @functools.wraps(fn)
+        def body(*args, **kwargs):
+            _misses()[label] += 1
+            return fn(*args, **kwargs)
+
+        cached_fn = cache_decorator(body)
+
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            before = _misses()[label]
+            result = cached_fn(*args, **kwargs)
+            record_cache(label, hit=_misses()[label] == before)
+            return result
+
+        call.clear = cached_fn.clear
+        return call
+    return wrap
+
+
+def record_cache(name, hit):
+    outcome = "hit" if hit else "miss"
+    with _lock:
+        _cache_counts[(name, outcome)] += 1
+    _emit({"event": "cache", "name": name, "outcome": outcome})
+
+
+def cache_stats():
+    """{name: {"hit": n, "miss": n}} since the process started."""
+    with _lock:
+        items = list(_cache_counts.items())
+    stats = {}
+    for (name, outcome), n in items:
+        stats.setdefault(name, {"hit": 0, "miss": 0})[outcome] = n
+    return stats
@@ -0,0 +1,580 @@
+"""
+Farm metrics library shared by the dashboard pages, the JSON API and any
+batch job.
+
+Plain pandas functions with no Streamlit dependency: each takes the cleaned
+farm log (``data.prepare_view_df`` output) for a window, plus the ABW samples
+where needed, and returns numbers or a DataFrame. Pages only lay the results
+out, so every stage here can be imported, timed and run on its own.
+"""
+import numpy as np
+import pandas as pd
+
+from shrimp.growth import align_abw, window_rows
+from shrimp.instrument import traced
+
+# -----------------------------
+# KPI & TARGET CONFIGURATION
+# -----------------------------
+TARGET_FCR_MAX = 1.0
+TARGET_SURVIVAL_MIN = 95.0
+PH_MIN, PH_MAX = 7.6, 8.3
+SALINITY_MIN, SALINITY_MAX = 25, 30
+
+# Block letter -> worker responsible for it
+BLOCK_WORKERS = {
+    'E': 'Jimmy', 'F': 'Jimmy', 'G': 'Jimmy',
+    'H': 'Flora', 'I': 'Flora', 'J': 'Flora'
+}
+
+ALERT_LEVELS = ["Critical 🔴", "Warning ⚠", "Normal ✅", "No Water Data ❌"]
+
+
+def get_target_weight(days):
+    if days <= 30: return 2.0
+    if days <= 60: return 8.0
+    return 15.0
+
+
+def assign_worker(block):
+    b = str(block).strip().upper()
+    if not b: return "Other"
+    return BLOCK_WORKERS.get(b[0], "Other")
+
+
+# -----------------------------
+# Headline KPIs
+# -----------------------------
+@traced("metrics.kpis")
+def kpis(view_df):
+    """Feed, mortality and water-quality compliance for the whole window (the /api/kpi body)."""
+    if view_df.empty:
+        return {"rows": 0}
+    k = tile_kpis(view_df)
+    scheduled_kg = float(view_df['ScheduledFeed_day_g'].sum()) / 1000
+    actual_kg = float(view_df['ActualFeed_day_g'].sum()) / 1000
+    return {
+        "rows": k["rows"],
+        "start": k["start"],
+        "end": k["end"],
+        "scheduled_feed_kg": round(scheduled_kg, 2),
+        "actual_feed_kg": round(actual_kg, 2),
+        "leftover_feed_kg": round(scheduled_kg - actual_kg, 2),
+        "dead_count": int(k["dead_count"]),
+        "initial_count": int(k["initial_count"]),
+        **{col: float(k[col]) for col in ["mortality_pct", "ph_compliance_pct", "salinity_compliance_pct"]},
+    }
+
+
+@traced("metrics.tile_kpis")
+def tile_kpis(view_df):
+    """The ``kpi_table`` numbers shown in the Daily / Weekly tiles, as plain Python numbers."""
+    if view_df.empty:
+        return {"rows": 0}
+    k = kpi_table(view_df).iloc[0]
+    return {
+        "rows": int(k['rows']),
+        "start": k['start'].date().isoformat(),
+        "end": k['end'].date().isoformat(),
+        # numpy scalars -> the matching int / float
+        **{col: k[col].item() if isinstance(k[col], np.generic) else k[col] for col in KPI_NUMBERS},
+    }
+
+
+# Numeric columns of kpi_table, in tile order
+KPI_NUMBERS = ["feed_g", "feed_kg", "scheduled_feed_kg", "leftover_feed_g", "leftover_feed_kg",
+               "dead_count", "initial_count", "mortality_pct", "ph_compliance_pct", "salinity_compliance_pct"]
+
+
+def kpi_table(view_df, by=None):
+    """``kpis`` with a row per ``by`` group (e.g. 'Window' in compare mode), or one row for the whole frame."""
+    df = view_df.assign(
+        Leftover_g=view_df['ScheduledFeed_day_g'] - view_df['ActualFeed_day_g'],
+        Feed_kg=(view_df['ActualFeed_day_g'] / 1000).round(2),
+        Scheduled_kg=(view_df['ScheduledFeed_day_g'] / 1000).round(2),
+    )
+    df['Leftover_kg'] = (df['Leftover_g'] / 1000).round(2)
+    keys = np.zeros(len(df), dtype=int) if by is None else df[by]
+    # Mortality % is deaths over the stocking of the batches on the first day
+    first_day = df['Date'] == df.groupby(keys)['Date'].transform('min')
+    df['Initial_first_day'] = df['InitialCount'].where(first_day & df['Batch ID'].notna())
+
+    k = df.groupby(keys).agg(
+        rows=('Date', 'size'), start=('Date', 'min'), end=('Date', 'max'),
+        feed_g=('ActualFeed_day_g', 'sum'), feed_kg=('Feed_kg', 'sum'), scheduled_feed_kg=('Scheduled_kg', 'sum'),
+        leftover_feed_g=('Leftover_g', 'sum'), leftover_feed_kg=('Leftover_kg', 'sum'),
+        dead_count=('DeadCount_day', 'sum'), initial_count=('Initial_first_day', 'sum'),
+        ph_compliance_pct=('pH_OK', 'mean'), salinity_compliance_pct=('Salinity_OK', 'mean'),
+    )
+    sums = ['feed_g', 'feed_kg', 'scheduled_feed_kg', 'leftover_feed_g', 'leftover_feed_kg']
+    k[sums] = k[sums].round(2)
+    initial = k['initial_count'].where(k['initial_count'] > 0)
+    k['mortality_pct'] = (k['dead_count'] / initial * 100).round(2).fillna(0.0)
+    k['ph_compliance_pct'] = (k['ph_compliance_pct'] * 100).round(1)
+    k['salinity_compliance_pct'] = (k['salinity_compliance_pct'] * 100).round(1)
+    return k[['rows', 'start', 'end'] + KPI_NUMBERS]
+
+
+# -----------------------------
+# Worker performance & compliance
+# -----------------------------
+def week_label(dates):
+    week_start = dates - pd.to_timedelta(dates.dt.dayofweek, unit='d')
+    week_end = week_start + pd.Timedelta(days=6)
+    return week_start.dt.date.astype(str) + " to " + week_end.dt.date.astype(str)
+
+
+@traced("metrics.worker_summary")
+def worker_summary(view_df, by_week=False, by=None):
+    """
+    Per-worker compliance, feed and deaths for the Jimmy / Flora blocks; with
+    ``by`` (e.g. 'Window' in compare mode) also split by that column.
+    """
+    df = view_df.copy()
+    block_letter = df['Block'].astype(str).str.upper().str.extract(r'([E-J])', expand=False)
+    df['Worker_Assigned'] = block_letter.map(BLOCK_WORKERS)
+    df = df[df['Worker_Assigned'].isin(['Jimmy', 'Flora'])]
+    df['Worker_Display'] = df['WorkerName'].where(df['WorkerName'].notna(), df['Worker_Assigned'])
+    group_cols = ['Worker_Display']
+    if by_week:
+        df['Week'] = week_label(df['Date'])
+        group_cols = ['Week', 'Worker_Display']
+    if by is not None:
+        group_cols = [by] + group_cols
+
+    summary = (
+        df.groupby(group_cols, as_index=False)
+        .agg(
+            Total_Records=('Worker_Display','count'),
+            pH_OK=('pH_OK','sum'),
+            Salinity_OK=('Salinity_OK','sum'),
+            ScheduledFeed_kg=('ScheduledFeed_day_g', lambda x: round(x.sum()/1000,2)),
+            ActualFeed_kg=('ActualFeed_day_g', lambda x: round(x.sum()/1000,2)),
+            Dead_Count=('DeadCount_day','sum'),
+            Dead_Weight_g=('DeadWeight_g','sum')
+        )
+    )
+    summary['pH_%'] = ((summary['pH_OK'] / summary['Total_Records'])*100).round(1)
+    summary['Salinity_%'] = ((summary['Salinity_OK'] / summary['Total_Records'])*100).round(1)
+    summary['Leftover_kg'] = (summary['ScheduledFeed_kg'] - summary['ActualFeed_kg']).round(2)
+    return summary
+
+
+# -----------------------------
+# Monthly tank summary
+# -----------------------------
+@traced("metrics.monthly_tank_summary")
+def monthly_tank_summary(view_df, by=None):
+    """Feed, deaths and water-quality averages per Block / Tank (and ``by`` group) for the window."""
+    keys = ['Block','Tank'] if by is None else [by, 'Block', 'Tank']
+    monthly_df = view_df.groupby(keys, as_index=False).agg(
+        ScheduledFeed_g=('ScheduledFeed_day_g','sum'),
+        ActualFeed_g=('ActualFeed_day_g','sum'),
+        DeadCount=('DeadCount_day','sum'),
+        DeadWeight_g=('DeadWeight_g','sum'),
+        Salinity_avg=('Salinity','mean'),
+        pH_avg=('pH','mean'),
+        Mortality_pct=('Mortality_pct','mean')
+    )
+    monthly_df.insert(len(keys) + 2, 'LeftoverFeed_g', monthly_df['ScheduledFeed_g'] - monthly_df['ActualFeed_g'])
+    monthly_df['ScheduledFeed_kg'] = (monthly_df['ScheduledFeed_g']/1000).round(2)
+    monthly_df['ActualFeed_kg'] = (monthly_df['ActualFeed_g']/1000).round(2)
+    monthly_df['Leftover_kg'] = (monthly_df['LeftoverFeed_g']/1000).round(2)
+    return monthly_df
+
+
+def monthly_kpis(monthly_df, by=None):
+    """Monthly tile numbers over the tanks of ``monthly_tank_summary``, per ``by`` group or for all."""
+    keys = np.zeros(len(monthly_df), dtype=int) if by is None else monthly_df[by]
+    k = monthly_df.groupby(keys).agg(
+        feed_kg=('ActualFeed_kg', 'sum'), scheduled_feed_kg=('ScheduledFeed_kg', 'sum'),
+        leftover_feed_kg=('Leftover_kg', 'sum'), dead_count=('DeadCount', 'sum'),
+        dead_weight_g=('DeadWeight_g', 'sum'), mortality_pct=('Mortality_pct', 'mean'),
+    )
+    k['mortality_pct'] = (k['mortality_pct'] * 100).round(2)
+    return k
+
+
+# -----------------------------
+# Period comparison
+# -----------------------------
+# Values of a compare-mode Window column
+COMPARE_WINDOWS = ["Current", "Baseline"]
+
+
+def change(current, baseline):
+    """(Δ, Δ %) of ``current`` against ``baseline`` Series or frames; Δ % is NaN where the baseline is 0."""
+    delta = (current - baseline).round(3)
+    return delta, (delta / baseline.where(baseline != 0) * 100).round(1)
+
+
+def compare_kpis(table, columns):
+    """Current, Baseline, Δ and Δ % of each of ``columns`` in a table indexed by Window (``kpi_table``)."""
+    values = table.reindex(COMPARE_WINDOWS)[columns].T.astype(float)
+    delta, pct = change(values['Current'], values['Baseline'])
+    return values.assign(**{"Δ": delta, "Δ %": pct})
+
+
+def compare_rows(table, keys, columns):
+    """
+    One row per ``keys`` group of a table with a Window column: each of
+    ``columns`` for the current window, then its Δ and Δ % against the
+    baseline window (NaN for groups that only appear in the current one).
+    """
+    current = table[table['Window'] == "Current"].set_index(keys)[columns]
+    baseline = table[table['Window'] == "Baseline"].set_index(keys)[columns]
+    current, baseline = current.align(baseline, join='left')
+    delta, pct = change(current, baseline)
+    rows = pd.concat([current, delta.add_suffix(" Δ"), pct.add_suffix(" Δ %")], axis=1)
+    return rows[[c for col in columns for c in (col, f"{col} Δ", f"{col} Δ %")]].reset_index()
+
+
+# -----------------------------
+# Block & Tank performance table
+# -----------------------------
+PERIOD_COLUMNS = {"Daily": "Date", "Weekly": "Week", "Monthly": "Month"}
+
+
+def salinity_score(salinity):
+    return np.select([salinity.between(25, 30), salinity.between(23, 25) | salinity.between(30, 33)], [100, 80], 50)
+
+
+def ph_score(ph):
+    # 100 ideal, 80 acceptable, 50 danger
+    return np.select([ph.between(7.6, 8.3), ph.between(7.4, 7.6) | ph.between(8.3, 8.5)], [100, 80], 50)
+
+
+@traced("metrics.performance_table")
+def performance_table(view_df, view_option):
+    """Survival, feed efficiency and compliance scores per period, Block and Tank."""
+    df = view_df.copy()
+    df['Survival_pct'] = (df['LiveCount']/df['InitialCount']*100).round(2)
+    df['Mortality_pct'] = (100 - df['Survival_pct']).round(2)
+    df['FeedUsedForScore'] = df[['ActualFeed_day_g','ScheduledFeed_day_g']].min(axis=1)
+    df['FeedEfficiency_pct'] = (df['FeedUsedForScore']/df['ScheduledFeed_day_g']*100).round(2)
+    df['SalinityScore'] = salinity_score(df['Salinity'])
+    df['PHScore'] = ph_score(df['pH'])
+    df['OverallPerformance_pct'] = df[['Survival_pct','FeedEfficiency_pct','SalinityScore','PHScore']].mean(axis=1).round(2)
+    df['pH_%'] = df['pH'].between(7.6, 8.3).astype(int)
+    df['Salinity_%'] = df['Salinity'].between(25, 30).astype(int)
+
+    period = PERIOD_COLUMNS[view_option]
+    if view_option == "Weekly":
+        df['Week'] = week_label(df['Date'])
+    elif view_option == "Monthly":
+        df['Month'] = df['Date'].dt.to_period('M').astype(str)
+
+    keys = [period, 'Block', 'Tank']
+    table = df.groupby(keys, as_index=False).agg({
+        'Survival_pct': 'mean',
+        'Mortality_pct': 'mean',
+        'FeedEfficiency_pct': 'mean',
+        'pH_%': lambda x: round((x.sum()/len(x))*100, 1),
+        'Salinity_%': lambda x: round((x.sum()/len(x))*100, 1),
+        'OverallPerformance_pct': 'mean'
+    })
+    workers = df.groupby(keys)['WorkerName'].unique().apply(lambda x: ', '.join(x))
+    table['Workers'] = table.set_index(keys).index.map(workers).values
+    return table.sort_values(by='OverallPerformance_pct', ascending=False)
+
+
+# -----------------------------
+# ABW tank scorecard
+# -----------------------------
+def growth_status(cv):
+    return pd.Series(np.select([cv.isna() | (cv == 0), cv > 25], ["–", "🚨 Uneven"], "✅ Uniform"), index=cv.index)
+
+
+@traced("metrics.tank_scorecard")
+def tank_scorecard(view_df, abw_df, start_date, end_date):
+    """
+    Per-tank ABW, biomass, ADG, survival and FCR between ``start_date`` and
+    ``end_date``. ABW start/end are the first/last samples inside the window.
+    """
+    return window_scorecard(scorecard_log(view_df, abw_df), start_date, end_date)
+
+
+def scorecard_log(view_df, abw_df):
+    """The farm log cleaned for the scorecard, with ABW samples aligned (``growth.align_abw``)."""
+    view_df = view_df.copy()
+    view_df['Block'] = view_df['Block'].str.strip().str.upper()
+    view_df['Tank'] = view_df['Tank'].str.strip().str.upper()
+    for col in ['DeadWeight_g', 'ActualFeed_day_g', 'InitialCount', 'LiveCount']:
+        view_df[col] = pd.to_numeric(view_df[col], errors='coerce').fillna(0)
+    for col in ['pH', 'Salinity']:
+        view_df[col] = pd.to_numeric(view_df[col], errors='coerce')
+    return align_abw(view_df, abw_df)
+
+
+@traced("metrics.window_scorecard")
+def window_scorecard(aligned_df, start_date, end_date):
+    """``tank_scorecard`` for any window of an ``align_abw`` frame, without re-joining ABW."""
+    start, end = pd.to_datetime(start_date), pd.to_datetime(end_date)
+    rows = window_rows(aligned_df, start, end)
+    return tank_rollup(rows, ['Block', 'Tank'], max((end - start).days, 1))
+
+
+def tank_rollup(rows, keys, days_elapsed):
+    """
+    Scorecard columns per ``keys`` group of window rows (``window_rows`` output).
+    ``days_elapsed`` is a number, or a Series indexed like the rows for windows
+    of different lengths.
+    """
+    rows = rows.assign(ABW_in=rows['ABW'].where(rows['In_Window']), CV_in=rows['CV_pct'].where(rows['In_Window']))
+    if isinstance(days_elapsed, pd.Series):
+        rows['Days'] = days_elapsed
+    tank_df = rows.groupby(keys).agg(
+        ABW_start=('ABW_in', 'first'),
+        ABW_end=('ABW_in', 'last'),
+        CV_pct=('CV_in', 'last'),
+        InitialCount=('InitialCount', 'first'),
+        LiveCount=('LiveCount', 'last'),
+        ActualFeed_day_g=('ActualFeed_day_g', 'sum'),
+        DeadWeight_g=('DeadWeight_g', 'sum'),
+        pH=('pH', 'mean'),
+        Salinity=('Salinity', 'mean'),
+        **({'Days': ('Days', 'first')} if 'Days' in rows.columns else {})
+    ).reset_index()
+    days = tank_df.pop('Days') if 'Days' in tank_df.columns else days_elapsed
+
+    tank_df['pH'] = tank_df['pH'].round(2)
+    tank_df['Salinity'] = tank_df['Salinity'].round(1)
+    tank_df['Dead_Count'] = tank_df['InitialCount'] - tank_df['LiveCount']
+    tank_df['Feed_kg'] = (tank_df['ActualFeed_day_g'] / 1000).round(2)
+    tank_df['Biomass_start_kg'] = (tank_df['InitialCount'] * tank_df['ABW_start'] / 1000).round(2)
+    tank_df['Biomass_kg'] = (tank_df['LiveCount'] * tank_df['ABW_end'] / 1000).round(2)
+    tank_df['Weight_Gain_kg'] = (tank_df['Biomass_kg'] - tank_df['Biomass_start_kg']).round(2)
+    tank_df['Weekly_Gain'] = (tank_df['ABW_end'] - tank_df['ABW_start']).round(3)
+    tank_df['ADG (g/day)'] = (tank_df['Weekly_Gain'] / days).round(3)
+    tank_df['Survival_%'] = (tank_df['LiveCount'] / tank_df['InitialCount'].replace(0, 1) * 100).round(2)
+    tank_df['Worker'] = tank_df['Block'].map(assign_worker)
+    tank_df['FCR'] = np.where(tank_df['Weight_Gain_kg'] > 0, (tank_df['Feed_kg'] / tank_df['Weight_Gain_kg']).round(2), np.nan)
+    tank_df['Growth_Status'] = growth_status(tank_df['CV_pct'])
+    return tank_df
+
+
+# Rows of the consolidated and worker scorecards
+SCORECARD_METRICS = ["ABW_start","ABW_end","Weekly_Gain","ActualFeed_day_g","DeadWeight_g",
+                     "Dead_Count","DeadWeight_kg","Feed_kg","Biomass_start_kg","Biomass_kg",
+                     "Weight_Gain_kg","ADG (g/day)","Survival %","FCR","Avg pH","Avg Salinity"]
+
+# How tank rows roll up into a worker / farm scorecard
+SCORECARD_AGG = {
+    'ABW_start': 'mean', 'ABW_end': 'mean', 'Weekly_Gain': 'mean',
+    'ActualFeed_day_g': 'sum', 'DeadWeight_g': 'sum', 'Dead_Count': 'sum', 'Feed_kg': 'sum',
+    'Biomass_start_kg': 'sum', 'Biomass_kg': 'sum', 'Weight_Gain_kg': 'sum',
+    'ADG (g/day)': 'mean', 'Survival_%': 'mean', 'pH': 'mean', 'Salinity': 'mean',
+}
+
+
+def scorecard_targets(target_abw):
+    return {
+        "ABW_end": target_abw, "Survival %": TARGET_SURVIVAL_MIN,
+        "FCR": TARGET_FCR_MAX, "Avg pH": f"{PH_MIN}-{PH_MAX}", "Avg Salinity": f"{SALINITY_MIN}-{SALINITY_MAX}"
+    }
+
+
+def scorecard_values(tank_df, by=None):
+    """
+    SCORECARD_METRICS columns, rounded as reported, for each ``by`` group of
+    ``tank_df`` rows (e.g. 'Worker', or ['Period', 'Worker']); one row for the
+    whole farm when ``by`` is None. FCR is 0 where there was no weight gain.
+    """
+    # The farm row goes through the same groupby, so it sums exactly like a period's
+    keys = np.zeros(len(tank_df), dtype=int) if by is None else by
+    agg = tank_df.groupby(keys).agg(SCORECARD_AGG)
+    if by is None and agg.empty:
+        agg = agg.reindex([0]).fillna({c: 0 for c, how in SCORECARD_AGG.items() if how == 'sum'})
+    gain = agg['Weight_Gain_kg']
+    return pd.DataFrame({
+        "ABW_start": agg['ABW_start'].round(2),
+        "ABW_end": agg['ABW_end'].round(2),
+        "Weekly_Gain": agg['Weekly_Gain'].round(3),
+        "ActualFeed_day_g": agg['ActualFeed_day_g'].round(1),
+        "DeadWeight_g": agg['DeadWeight_g'].round(1),
+        "Dead_Count": agg['Dead_Count'],
+        "DeadWeight_kg": (agg['DeadWeight_g'] / 1000).round(2),
+        "Feed_kg": agg['Feed_kg'].round(2),
+        "Biomass_start_kg": agg['Biomass_start_kg'].round(2),
+        "Biomass_kg": agg['Biomass_kg'].round(2),
+        "Weight_Gain_kg": gain.round(2),
+        "ADG (g/day)": agg['ADG (g/day)'].round(3),
+        "Survival %": agg['Survival_%'].round(2),
+        "FCR": (agg['Feed_kg'] / gain.where(gain > 0)).round(2).fillna(0),
+        "Avg pH": agg['pH'].round(2),
+        "Avg Salinity": agg['Salinity'].round(1),
+    }, index=agg.index)
+
+
+def scorecard_status(values, target_abw):
+    """
+    YES / NO against the targets for each SCORECARD_METRICS column of a
+    ``scorecard_values`` frame, "-" where a metric has none. ``target_abw``
+    may be a Series aligned with the rows.
+    """
+    passed = {
+        "ABW_end": values["ABW_end"] >= target_abw,
+        "Survival %": values["Survival %"] >= TARGET_SURVIVAL_MIN,
+        "FCR": values["FCR"] <= TARGET_FCR_MAX,
+        "Avg pH": values["Avg pH"].between(PH_MIN, PH_MAX),
+        "Avg Salinity": values["Avg Salinity"].between(SALINITY_MIN, SALINITY_MAX),
+    }
+    return pd.DataFrame({m: np.where(passed[m], "YES", "NO") if m in passed else "-" for m in SCORECARD_METRICS},
+                        index=values.index)
+
+
+@traced("metrics.consolidated_report")
+def consolidated_report(tank_df, target_abw):
+    """Farm-level Actual / Target / Status table over all tanks."""
+    values = scorecard_values(tank_df)
+    target_map = scorecard_targets(target_abw)
+    return pd.DataFrame({
+        "Metric": SCORECARD_METRICS,
+        "Actual": values.iloc[0].to_numpy(),
+        "Target": [target_map.get(m, "-") for m in SCORECARD_METRICS],
+        "Status": scorecard_status(values, target_abw).iloc[0].to_numpy(),
+    }).set_index("Metric")
+
+
+@traced("metrics.worker_report")
+def worker_report(tank_df, target_abw):
+    """Actual / Status columns per worker, rows as in the consolidated report."""
+    values = scorecard_values(tank_df, 'Worker')
+    status = scorecard_status(values, target_abw)
+    report = pd.concat([values.T.add_suffix(" Act"), status.T.add_suffix(" Stat")], axis=1)
+    report = report[[f"{w} {kind}" for w in values.index for kind in ("Act", "Stat")]]
+    report.index.name, report.columns.name = "Metric", None
+    return report
+
+
+# -----------------------------
+# Executive summary
+# -----------------------------
+EXEC_WORKER_BLOCKS = ['H', 'I', 'J', 'E', 'F', 'G']
+
+
+@traced("metrics.executive_kpis")
+def executive_kpis(filtered_df, initial_stock=1000):
+    """Report KPIs; mortality % is taken against ``initial_stock`` shrimps."""
+    total_feed_scheduled = filtered_df['ScheduledFeed_day_g'].sum() / 1000
+    total_feed_actual = filtered_df['ActualFeed_day_g'].sum() / 1000
+    total_mortality = filtered_df['DeadCount_day'].sum()
+    return {
+        "total_feed_scheduled": total_feed_scheduled,
+        "total_feed_actual": total_feed_actual,
+        "total_leftover_feed": total_feed_scheduled - total_feed_actual,
+        "total_mortality": total_mortality,
+        "mortality_pct": (total_mortality / initial_stock) * 100,
+        "ph_compliance": round(filtered_df['pH_OK'].mean()*100,1),
+        "salinity_compliance": round(filtered_df['Salinity_OK'].mean()*100,1),
+    }
+
+
+@traced("metrics.executive_worker_summary")
+def executive_worker_summary(filtered_df):
+    """Per-worker feed, deaths and compliance for the Flora & Jimmy blocks."""
+    worker_df = filtered_df[filtered_df['Block'].str[0].isin(EXEC_WORKER_BLOCKS)]
+    summary = (
+        worker_df.groupby('WorkerName', as_index=False)
+        .agg(
+            ScheduledFeed_kg=('ScheduledFeed_day_g', lambda x: round(x.sum()/1000,2)),
+            ActualFeed_kg=('ActualFeed_day_g', lambda x: round(x.sum()/1000,2)),
+            Dead_Count=('DeadCount_day','sum'),
+            Dead_Weight_g=('DeadWeight_g','sum'),
+            pH_OK=('pH_OK','sum'),
+            Salinity_OK=('Salinity_OK','sum'),
+            Total_Records=('WorkerName','count'),
+            Total_Blocks=('Block','nunique')
+        )
+    )
+    summary['pH_%'] = ((summary['pH_OK']/summary['Total_Records'])*100).round(1)
+    summary['Salinity_%'] = ((summary['Salinity_OK']/summary['Total_Records'])*100).round(1)
+    summary['Leftover_kg'] = (summary['ScheduledFeed_kg'] - summary['ActualFeed_kg']).round(2)
+    summary['Mortality_%'] = ((summary['Dead_Count']/summary['Total_Records'])*100).round(1)
+    return summary
+
+
+def _marks(values, ok_low, ok_high, warn_low, warn_high):
+    ok = (values >= ok_low) & (values <= ok_high)
+    warn = ((values >= warn_low) & (values < ok_low)) | ((values > ok_high) & (values <= warn_high))
+    return np.select([ok, warn], ["✅", "⚠"], "🔴")
+
+
+def parameter_status(df, ph_ok=(7.6, 8.3), ph_warn=(7.6, 8.4)):
+    """✅ / ⚠ / 🔴 per row for pH, salinity, temperature and mortality."""
+    dead = df['DeadCount_day']
+    return pd.DataFrame({
+        'pH_status': _marks(df['pH'], *ph_ok, *ph_warn),
+        'Sal_status': _marks(df['Salinity'], 25, 30, 24, 31),
+        'Temp_status': _marks(df['WaterTemperature'], 28, 30, 27, 31),
+        'Mort_status': np.select([dead < 5, dead <= 6], ["✅", "⚠"], "🔴"),
+    }, index=df.index)
+
+
+@traced("metrics.tank_status_summary")
+def tank_status_summary(filtered_df, worker_col, extra=None, **status_kwargs):
+    """Worst status per (worker, Tank, Block) with that tank's first readings."""
+    df = pd.concat([filtered_df, parameter_status(filtered_df, **status_kwargs)], axis=1)
+    agg = {
+        'pH_status':'max',
+        'Sal_status':'max',
+        'Temp_status':'max',
+        'Mort_status':'max',
+        'pH':'first',
+        'Salinity':'first',
+        'WaterTemperature':'first',
+        'DeadCount_day':'first'
+    }
+    agg.update(extra or {})
+    return df.groupby([worker_col,'Tank','Block']).agg(agg).reset_index()
+
+
+# -----------------------------
+# Alerts
+# -----------------------------
+def _band(values, ok_low, ok_high, warn_low, warn_high, name):
+    # ✅ inside [ok_low, ok_high], ⚠ in the margins, 🔴 otherwise (including missing)
+    ok = (values >= ok_low) & (values <= ok_high)
+    warn = ((values >= warn_low) & (values < ok_low)) | ((values > ok_high) & (values <= warn_high))
+    return np.select([ok, warn], [f"{name} ✅", f"{name} ⚠"], f"{name} 🔴")
+
+
+@traced("metrics.alert_levels")
+def alert_levels(view_df):
+    """Normal / Warning (1-2 parameters out) / Critical (3+) per row."""
+    ph, sal, temp = view_df['pH'], view_df['Salinity'], pd.to_numeric(view_df['WaterTemperature'], errors='coerce')
+    n_alerts = (
+        ((ph <= 7.6) | (ph >= 8.3)).astype(int)
+        + ((sal <= 25) | (sal >= 30)).astype(int)
+        + ((temp <= 28) | (temp >= 30)).astype(int)
+        + (view_df['DeadCount_day'] > 5).astype(int)
+    )
+    levels = np.select([n_alerts == 0, n_alerts <= 2], ["Normal ✅", "Warning ⚠"], "Critical 🔴")
+    if 'Has_Water_Data' in view_df.columns:
+        levels = np.where(view_df['Has_Water_Data'] == 0, "No Water Data ❌", levels)
+    return pd.Categorical(levels, categories=ALERT_LEVELS)
+
+
+@traced("metrics.alert_details")
+def alert_details(view_df):
+    dead = view_df['DeadCount_day']
+    mortality = np.select([dead < 5, dead <= 6], ["Mortality ✅", "Mortality ⚠"], "Mortality 🔴")
+    parts = [
+        _band(view_df['pH'], 7.6, 8.3, 7.5, 8.3, "pH"),
+        _band(view_df['Salinity'], 25, 30, 24, 31, "Salinity"),
+        _band(pd.to_numeric(view_df['WaterTemperature'], errors='coerce'), 28, 30, 27, 31, "Temp"),
+        mortality,
+    ]
+    return pd.Series(parts[0], index=view_df.index).str.cat(parts[1:], sep=", ")
+
+
+@traced("metrics.alerts")
+def alerts(view_df, levels=None):
+    """Rows with their alert level and details, optionally only some levels."""
+    df = view_df[['Date', 'Block', 'Tank', 'WorkerName', 'pH', 'Salinity', 'WaterTemperature', 'DeadCount_day']].copy()
+    df['WaterTemperature'] = pd.to_numeric(df['WaterTemperature'], errors='coerce')
+    df['Alert_Level'] = alert_levels(view_df)
+    df['Alert_Details'] = alert_details(view_df)
+    if levels:
+        df = df[df['Alert_Level'].isin(levels)]
+    return df.reset_index(drop=True)
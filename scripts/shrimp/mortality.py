@@ -0,0 +1,229 @@
+"""
+Mortality-risk model: the chance of a mortality event in a tank tomorrow.
+
+``mortality_features`` turns the daily farm log into one feature row per
+tank per day from that day and the days before it (water quality, feed
+left over, deaths so far), within each batch, and labels it with whether the
+next logged day had more than EVENT_DEAD dead shrimp (the same threshold
+as the dead-count alert). ``train_mortality_model`` fits the pinned xgboost
+classifier on it, checked on the most recent VALID_FRACTION of days first,
+and returns an artifact (model, feature list, FEATURE_VERSION, metrics).
+
+Artifacts are saved versioned by training time (``save_artifact``) by the
+offline ``scripts/train_risk.py``; the dashboard only loads the newest one
+of the current FEATURE_VERSION (``artifact_paths``, ``load_artifact``) and
+scores every row in one
+batched ``predict_proba`` (``score_mortality_risk``), so nothing is trained
+on a page request.
+
+No Streamlit dependency, like ``shrimp.metrics``.
+"""
+import glob
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from shrimp.instrument import traced
+
+KEYS = ['Block', 'Tank']
+BATCH_KEYS = KEYS + ['Batch ID']
+
+# Bump when FEATURES or how they are computed change: older artifacts are ignored
+FEATURE_VERSION = 1
+# More dead shrimp than this in a day is an event (as in metrics.alert_levels)
+EVENT_DEAD = 5
+VALID_FRACTION = 0.2
+# Risk_Tomorrow at or above these is a warning / high risk
+RISK_WARN, RISK_HIGH = 0.15, 0.30
+# Explained rows: each tank's latest day plus flagged days in the last this-many days
+EXPLAIN_DAYS = 30
+ARTIFACT_PREFIX = "mortality_risk"
+KEEP_ARTIFACTS = 5
+
+XGB_PARAMS = dict(n_estimators=300, max_depth=4, learning_rate=0.05, subsample=0.8, colsample_bytree=0.8,
+                  min_child_weight=5, eval_metric='aucpr', tree_method='hist', n_jobs=-1)
+
+WATER = ['pH', 'Salinity', 'WaterTemperature']
+FEATURES = [
+    'pH', 'Salinity', 'WaterTemperature',
+    'pH_3d', 'Salinity_3d', 'WaterTemperature_3d',
+    'pH_change', 'Salinity_change', 'WaterTemperature_change',
+    'Out_of_range_3d', 'Leftover_pct', 'Leftover_pct_3d',
+    'Dead', 'Dead_3d', 'Dead_7d', 'Dead_per_1000_7d', 'Days',
+]
+# Feature -> the driver it is reported under
+DRIVERS = {
+    'pH': "pH", 'pH_3d': "pH", 'pH_change': "pH",
+    'Salinity': "Salinity", 'Salinity_3d': "Salinity", 'Salinity_change': "Salinity",
+    'WaterTemperature': "Temperature", 'WaterTemperature_3d': "Temperature", 'WaterTemperature_change': "Temperature",
+    'Out_of_range_3d': "pH / salinity range",
+    'Leftover_pct': "Feed", 'Leftover_pct_3d': "Feed",
+    'Dead': "Recent deaths", 'Dead_3d': "Recent deaths", 'Dead_7d': "Recent deaths", 'Dead_per_1000_7d': "Recent deaths",
+    'Days': "Culture age",
+}
+TOP_DRIVERS = 2
+
+
+# -----------------------------
+# Features
+# -----------------------------
+def _rolling(rows, col, window, how):
+    grouped = rows.groupby(BATCH_KEYS, dropna=False, sort=False)[col].rolling(window, min_periods=1)
+    return getattr(grouped, how)().droplevel(list(range(len(BATCH_KEYS))))
+
+
+@traced("mortality.features")
+def mortality_features(farm_df):
+    """
+    One row per (Block, Tank, Date) with FEATURES and Event_Tomorrow (1 / 0,
+    NaN when the next day is not logged for the same batch).
+    """
+    rows = farm_df[['Date', 'Block', 'Tank', 'Batch ID', 'ScheduledFeed_day_g', 'ActualFeed_day_g',
+                    'DeadCount_day', 'LiveCount'] + WATER].copy()
+    rows['Block'] = rows['Block'].astype(str).str.strip().str.upper()
+    rows['Tank'] = rows['Tank'].astype(str).str.strip().str.upper()
+    for col in WATER + ['ScheduledFeed_day_g', 'ActualFeed_day_g', 'DeadCount_day', 'LiveCount']:
+        rows[col] = pd.to_numeric(rows[col], errors='coerce')
+    rows = rows.dropna(subset=['Date']).sort_values(BATCH_KEYS + ['Date'], kind='stable').reset_index(drop=True)
+    batch = rows.groupby(BATCH_KEYS, dropna=False, sort=False)
+
+    for col in WATER:
+        rows[f'{col}_3d'] = _rolling(rows, col, 3, 'mean')
+        rows[f'{col}_change'] = rows[col] - batch[col].shift()
+    rows['Out_of_range'] = (~rows['pH'].between(7.6, 8.3) | ~rows['Salinity'].between(25, 30)).astype(int)
+    rows['Out_of_range_3d'] = _rolling(rows, 'Out_of_range', 3, 'sum')
+    scheduled = rows['ScheduledFeed_day_g'].where(rows['ScheduledFeed_day_g'] > 0)
+    rows['Leftover_pct'] = (scheduled - rows['ActualFeed_day_g']) / scheduled * 100
+    rows['Leftover_pct_3d'] = _rolling(rows, 'Leftover_pct', 3, 'mean')
+    rows['Dead'] = rows['DeadCount_day'].fillna(0)
+    rows['Dead_3d'] = _rolling(rows, 'Dead', 3, 'sum')
+    rows['Dead_7d'] = _rolling(rows, 'Dead', 7, 'sum')
+    rows['Dead_per_1000_7d'] = rows['Dead_7d'] / rows['LiveCount'].where(rows['LiveCount'] > 0) * 1000
+    rows['Days'] = (rows['Date'] - batch['Date'].transform('min')).dt.days
+
+    next_day = batch['Date'].shift(-1) == rows['Date'] + pd.Timedelta(days=1)
+    rows['Event_Tomorrow'] = (batch['Dead'].shift(-1) > EVENT_DEAD).astype(float).where(next_day)
+    return rows[KEYS + ['Batch ID', 'Date'] + FEATURES + ['Event_Tomorrow']]
+
+
+# -----------------------------
+# Training
+# -----------------------------
+def _classifier():
+    from xgboost import XGBClassifier
+
+    # No class re-weighting: Risk_Tomorrow stays a probability, not a rank
+    return XGBClassifier(**XGB_PARAMS)
+
+
+@traced("mortality.train")
+def train_mortality_model(features):
+    """
+    Artifact dict: 'model' (fitted on every labelled row), 'features',
+    'feature_version', 'trained_at', 'trained_until', 'rows' and 'metrics'
+    (ROC AUC, average precision and event rate on the held-out last days).
+    """
+    from sklearn.metrics import average_precision_score, roc_auc_score
+
+    labelled = features.dropna(subset=['Event_Tomorrow'])
+    y = labelled['Event_Tomorrow'].astype(int)
+    if y.nunique() < 2:
+        raise ValueError("Need both event and non-event days to train the mortality-risk model")
+
+    cutoff = labelled['Date'].quantile(1 - VALID_FRACTION)
+    train, valid = labelled['Date'] <= cutoff, labelled['Date'] > cutoff
+    metrics = {'valid_rows': int(valid.sum()), 'valid_event_rate': round(float(y[valid].mean()), 4)}
+    if y[train].nunique() == 2 and y[valid].nunique() == 2:
+        model = _classifier().fit(labelled.loc[train, FEATURES], y[train])
+        p = model.predict_proba(labelled.loc[valid, FEATURES])[:, 1]
+        metrics.update(roc_auc=round(float(roc_auc_score(y[valid], p)), 4),
+                       average_precision=round(float(average_precision_score(y[valid], p)), 4))
+
+    model = _classifier().fit(labelled[FEATURES], y)
+    return {
+        'model': model, 'features': list(FEATURES), 'feature_version': FEATURE_VERSION,
+        'trained_at': datetime.now().strftime("%Y%m%d%H%M%S"), 'trained_until': labelled['Date'].max(),
+        'rows': len(labelled), 'event_rate': round(float(y.mean()), 4), 'metrics': metrics,
+    }
+
+
+# -----------------------------
+# Artifacts
+# -----------------------------
+def artifact_paths(model_dir):
+    """Saved artifacts of the current FEATURE_VERSION, oldest first."""
+    pattern = os.path.join(model_dir, f"{ARTIFACT_PREFIX}-v{FEATURE_VERSION}-*.joblib")
+    return sorted(glob.glob(pattern))
+
+
+def save_artifact(artifact, model_dir):
+    """Write ``<prefix>-v<feature version>-<trained at>.joblib``, keeping the newest KEEP_ARTIFACTS."""
+    import joblib
+
+    os.makedirs(model_dir, exist_ok=True)
+    path = os.path.join(model_dir, f"{ARTIFACT_PREFIX}-v{artifact['feature_version']}-{artifact['trained_at']}.joblib")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(artifact, tmp)
+    os.replace(tmp, path)
+    for old in artifact_paths(model_dir)[:-KEEP_ARTIFACTS]:
+        os.remove(old)
+    return path
+
+
+def load_artifact(path):
+    """The artifact at ``path``; None when it is missing, unreadable or of another FEATURE_VERSION."""
+    import joblib
+
+    try:
+        artifact = joblib.load(path)
+    except (OSError, EOFError, ValueError, KeyError, AttributeError, ImportError):
+        return None
+    return artifact if artifact.get('feature_version') == FEATURE_VERSION else None
+
+
+# -----------------------------
+# Scoring
+# -----------------------------
+@traced("mortality.score")
+def score_mortality_risk(artifact, features):
+    """Block, Tank, Date and Risk_Tomorrow (0-1) for every feature row, in one batched predict."""
+    scores = features[KEYS + ['Date']].copy()
+    scores['Risk_Tomorrow'] = artifact['model'].predict_proba(features[artifact['features']])[:, 1] \
+        if len(features) else np.array([], dtype=float)
+    return scores
+
+
+@traced("mortality.explain")
+def explain_mortality_risk(artifact, features, scores):
+    """
+    SHAP values (log-odds) of each tank's latest day and of the days in the
+    last EXPLAIN_DAYS scored at RISK_WARN or more, from one TreeExplainer
+    pass: Block, Tank, Date, Risk_Tomorrow, Base_value, per feature its value
+    and "SHAP <feature>", per driver the sum of its features ("Driver
+    <driver>"), and Top_drivers (up to TOP_DRIVERS drivers that raised the
+    risk most).
+    """
+    import shap
+
+    latest = features['Date'] == features.groupby(KEYS)['Date'].transform('max')
+    recent = features['Date'] > features['Date'].max() - pd.Timedelta(days=EXPLAIN_DAYS)
+    rows = features[latest | (recent & (scores['Risk_Tomorrow'] >= RISK_WARN))]
+    names = artifact['features']
+    if rows.empty:
+        return pd.DataFrame(columns=KEYS + ['Date', 'Risk_Tomorrow', 'Top_drivers'])
+
+    explainer = shap.TreeExplainer(artifact['model'])
+    values = np.asarray(explainer.shap_values(rows[names]), dtype=float).reshape(len(rows), len(names))
+    shap_df = pd.DataFrame(values, columns=[f"SHAP {f}" for f in names], index=rows.index)
+    drivers = pd.DataFrame(values, columns=names, index=rows.index).T.groupby(DRIVERS, sort=False).sum().T
+
+    table = rows[KEYS + ['Date']].assign(Risk_Tomorrow=scores.loc[rows.index, 'Risk_Tomorrow'].astype(float),
+                                         Base_value=float(np.ravel(explainer.expected_value)[0]))
+    table = pd.concat([table, rows[names], shap_df, drivers.add_prefix("Driver ")], axis=1)
+    order = np.argsort(-drivers.to_numpy(), axis=1)[:, :TOP_DRIVERS]
+    top = drivers.columns.to_numpy()[order]
+    raised = np.take_along_axis(drivers.to_numpy(), order, axis=1) > 0
+    table['Top_drivers'] = [", ".join(d for d, up in zip(row, ups) if up) for row, ups in zip(top, raised)]
+    return table.reset_index(drop=True)
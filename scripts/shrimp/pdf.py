@@ -0,0 +1,21 @@
+def draw_wrapped_text(c, text, x, y, max_width, line_height=14):
+    """
+    Draws text in the PDF with wrapping if it exceeds max_width.
+    Returns the updated y-coordinate after drawing.
+    """
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    words = text.split()
+    line = ""
+    for word in words:
+        test_line = line + " " + word if line else word
+        if stringWidth(test_line, c._fontname, c._fontsize) < max_width:
+            line = test_line
+        else:
+            c.drawString(x, y, line)
+            y -= line_height
+            line = word
+    if line:
+        c.drawString(x, y, line)
+        y -= line_height
+    return y
@@ -0,0 +1,147 @@
+"""
+Scorecard metrics for many periods in one pass.
+
+``period_scorecard`` takes a ``metrics.scorecard_log`` frame and a list of
+non-overlapping periods (``scorecard_periods`` makes every week or month of a
+date range) and computes the tank, worker and farm scorecards of all of them
+with one grouped rollup per level, instead of one ``window_scorecard`` call
+per period. The result is tidy, one row per period × entity × metric:
+
+    Period  Start  End  Level  Entity  Metric  Value  Status  Change
+
+``Change`` is the difference from the entity's previous period, so a trend
+view is a filter on Level and Metric:
+
+    trend = period_scorecard(scorecard_log(view_df, abw_df), scorecard_periods(start, end, "Weekly"))
+    fcr = trend[(trend['Level'] == "Worker") & (trend['Metric'] == "FCR")]
+
+and ``compare_report`` of a ``compare_periods`` table (the window of the
+same length just before, then the current one) is the scorecard's compare
+mode. The log must reach back to the baseline's start.
+
+No Streamlit dependency, like ``shrimp.metrics``.
+"""
+import pandas as pd
+
+from shrimp.instrument import traced
+from shrimp.metrics import (SCORECARD_METRICS, change, get_target_weight, scorecard_status, scorecard_values,
+                            tank_rollup)
+
+PERIOD_FREQS = ["Weekly", "Monthly"]
+LEVELS = ["Farm", "Worker", "Tank"]
+
+# Metrics offered on the trend chart
+TREND_METRICS = ["FCR", "ADG (g/day)", "Survival %", "ABW_end", "Biomass_kg", "Feed_kg", "Weight_Gain_kg"]
+
+PERIOD_COLUMNS = ['Period', 'Start', 'End', 'Level', 'Entity', 'Metric', 'Value', 'Status', 'Change']
+
+
+def scorecard_periods(start_date, end_date, freq="Weekly"):
+    """
+    Period / Start / End for every 7-day week counted from ``start_date``, or
+    every calendar month, between the two dates; the first and last are
+    clipped to them.
+    """
+    start, end = pd.to_datetime(start_date).normalize(), pd.to_datetime(end_date).normalize()
+    if end < start:
+        return pd.DataFrame({'Period': pd.Series(dtype=str), 'Start': pd.Series(dtype='datetime64[ns]'),
+                             'End': pd.Series(dtype='datetime64[ns]')})
+    if freq == "Weekly":
+        starts = pd.date_range(start, end, freq="7D")
+        labels = starts.strftime("%Y-%m-%d")
+        ends = (starts + pd.Timedelta(days=6)).where(starts + pd.Timedelta(days=6) <= end, end)
+    elif freq == "Monthly":
+        months = pd.period_range(start, end, freq="M")
+        labels = months.strftime("%Y-%m")
+        starts = months.start_time.where(months.start_time >= start, start)
+        ends = months.end_time.normalize().where(months.end_time.normalize() <= end, end)
+    else:
+        raise ValueError(f"Unknown period frequency {freq!r}; expected one of {PERIOD_FREQS}")
+    return pd.DataFrame({'Period': labels, 'Start': starts, 'End': ends})
+
+
+def compare_periods(start_date, end_date):
+    """[(baseline start, baseline end), (start, end)]: a window and the one of the same length just before it."""
+    start, end = pd.to_datetime(start_date).normalize(), pd.to_datetime(end_date).normalize()
+    baseline_end = start - pd.Timedelta(days=1)
+    return [(baseline_end - (end - start), baseline_end), (start, end)]
+
+
+def _period_frame(periods):
+    if isinstance(periods, pd.DataFrame):
+        return periods[['Period', 'Start', 'End']].reset_index(drop=True)
+    # [(start, end), ...] labelled by their start date
+    starts = pd.to_datetime([s for s, _ in periods])
+    return pd.DataFrame({'Period': starts.strftime("%Y-%m-%d"), 'Start': starts,
+                         'End': pd.to_datetime([e for _, e in periods])})
+
+
+def _tank_values(tank_df):
+    # Tank scorecard columns under the consolidated report's metric names
+    values = tank_df.rename(columns={'Survival_%': "Survival %", 'pH': "Avg pH", 'Salinity': "Avg Salinity"})
+    values["DeadWeight_kg"] = (values['DeadWeight_g'] / 1000).round(2)
+    values['Entity'] = values['Tank'] + " | " + values['Block']
+    return values.set_index(['Period', 'Entity'])[SCORECARD_METRICS]
+
+
+def _tidy(values, level, targets):
+    """One row per (Period, Entity, Metric) of a values frame indexed by (Period, Entity)."""
+    target_abw = pd.Series(values.index.get_level_values('Period').map(targets), index=values.index)
+    status = scorecard_status(values, target_abw)
+    long = values.reset_index().melt(id_vars=['Period', 'Entity'], var_name='Metric', value_name='Value')
+    long['Status'] = status.reset_index().melt(id_vars=['Period', 'Entity'])['value'].to_numpy()
+    long['Level'] = level
+    return long
+
+
+@traced("periods.scorecard")
+def period_scorecard(aligned_df, periods):
+    """
+    Tank, worker and farm scorecard metrics of every period in ``periods``
+    (a ``scorecard_periods`` frame, or a list of (start, end) pairs) over an
+    ``align_abw`` frame, as a tidy table (see module docstring). Each period
+    is scored like ``window_scorecard`` over it, ABW target included.
+    """
+    periods = _period_frame(periods)
+    if periods.empty or aligned_df.empty:
+        return pd.DataFrame(columns=PERIOD_COLUMNS)
+    windows = pd.IntervalIndex.from_arrays(periods['Start'], periods['End'], closed='both')
+    if windows.is_overlapping:
+        raise ValueError("Scorecard periods must not overlap")
+
+    # Each log row goes to the one period containing its date
+    which = windows.get_indexer(aligned_df['Date'])
+    inside = which >= 0
+    rows, which = aligned_df[inside].copy(), which[inside]
+    rows['Period'] = periods['Period'].to_numpy()[which]
+    rows['In_Window'] = rows['ABW_Date'] >= periods['Start'].to_numpy()[which]
+    days = (periods['End'] - periods['Start']).dt.days.clip(lower=1)
+    tank_df = tank_rollup(rows, ['Period', 'Block', 'Tank'], pd.Series(days.to_numpy()[which], index=rows.index))
+
+    targets = dict(zip(periods['Period'], days.map(get_target_weight)))
+    workers = scorecard_values(tank_df, ['Period', 'Worker']).rename_axis(['Period', 'Entity'])
+    farm = scorecard_values(tank_df, 'Period')
+    farm.index = pd.MultiIndex.from_arrays([farm.index, ["Farm"] * len(farm)], names=['Period', 'Entity'])
+
+    table = pd.concat([_tidy(farm, "Farm", targets), _tidy(workers, "Worker", targets),
+                       _tidy(_tank_values(tank_df), "Tank", targets)], ignore_index=True)
+    table = table.merge(periods, on='Period', how='left').sort_values('Start', kind='stable')
+    previous = table.groupby(['Level', 'Entity', 'Metric'], sort=False)['Value'].shift()
+    table['Change'] = (table['Value'] - previous).round(3)
+    return table[PERIOD_COLUMNS].reset_index(drop=True)
+
+
+def compare_report(table, level):
+    """
+    The last period of a ``period_scorecard`` table against the one before it
+    for one level: a row per SCORECARD_METRICS, and per entity its value
+    ("Act"), change ("Δ") and relative change ("Δ %").
+    """
+    latest = table[(table['Level'] == level) & (table['Period'] == table['Period'].iloc[-1])]
+    delta, pct = change(latest['Value'], latest['Value'] - latest['Change'])
+    latest = latest.assign(**{"Act": latest['Value'], "Δ": delta, "Δ %": pct})
+    report = latest.pivot(index='Metric', columns='Entity', values=["Act", "Δ", "Δ %"]).reindex(SCORECARD_METRICS)
+    entities = latest['Entity'].drop_duplicates()
+    report = report[[(kind, e) for e in entities for kind in ("Act", "Δ", "Δ %")]]
+    report.columns = [f"{e} {kind}" for kind, e in report.columns]
+    return report
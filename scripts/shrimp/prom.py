@@ -0,0 +1,237 @@
+"""
+Prometheus text-format metrics for the dashboard and the KPI API.
+
+``enable()`` subscribes to ``shrimp.instrument`` and turns its events into:
+
+    shrimp_data_load_seconds{stage}        histogram  Excel loads, SQLite, parquet store, prepare
+    shrimp_view_compute_seconds{stage}     histogram  every other span: metrics, analytics modules, page sections
+    shrimp_chart_render_seconds{stage}     histogram  chart bundles and their rendering
+    shrimp_report_build_seconds{stage}     histogram  Excel / PDF exports
+    shrimp_reruns_total                    counter    full script runs
+    shrimp_cache_lookups_total{cache,outcome}  counter  st.cache_* hits and misses
+    shrimp_sessions_started_total          counter
+    shrimp_active_sessions                 gauge      sessions that ran in the last ACTIVE_SESSION_S
+    shrimp_dataset_rows{dataset}           gauge      rows of the last farm log / ABW load and view window
+    shrimp_process_resident_memory_bytes   gauge
+
+``render()`` returns the exposition text. The dashboard writes it to
+``PROM_FILE`` (for node_exporter's textfile collector) and, when
+``SHRIMP_METRICS_PORT`` is set, also serves it on ``/metrics``; the KPI API
+serves it on ``/api/metrics``.
+"""
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from shrimp import instrument
+
+_DEFAULT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "logs", "shrimp_dashboard.prom")
+PROM_FILE = os.environ.get("SHRIMP_PROM_FILE", os.path.abspath(_DEFAULT_FILE))
+METRICS_PORT = int(os.environ.get("SHRIMP_METRICS_PORT", 0)) or None
+
+# Dashboard sessions auto-refresh every 30 s, so a live tab shows up well within this
+ACTIVE_SESSION_S = 90
+WRITE_INTERVAL_S = 5
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Histogram -> (help, span name prefixes). Spans that match no prefix are view
+# compute, so a new analytics module is counted without being listed here.
+HISTOGRAMS = {
+    "shrimp_data_load_seconds": ("Data load and query latency.", ("load.", "db.", "store.", "data.")),
+    "shrimp_view_compute_seconds": ("Per-view compute latency.", ()),
+    "shrimp_chart_render_seconds": ("Chart build and render latency.", ("charts.", "render.")),
+    "shrimp_report_build_seconds": ("Excel / PDF report build latency.", ("export.",)),
+}
+
+VIEW_HISTOGRAM = "shrimp_view_compute_seconds"
+
+COUNTER_HELP = {
+    "shrimp_reruns_total": "Full dashboard script runs.",
+    "shrimp_cache_lookups_total": "Cached function calls by cache and outcome (hit / miss).",
+    "shrimp_sessions_started_total": "Browser sessions seen.",
+}
+GAUGE_HELP = {
+    "shrimp_active_sessions": f"Sessions that ran in the last {ACTIVE_SESSION_S} s.",
+    "shrimp_dataset_rows": "Rows in the most recent load of each dataset.",
+    "shrimp_process_resident_memory_bytes": "Resident memory of this process.",
+}
+
+# Span name -> dataset label for shrimp_dataset_rows
+ROW_GAUGES = {
+    "load.tank_report": "farm_log",
+    "load.abw_excel": "abw_samples",
+    "data.prepare_view_df": "view_window",
+}
+
+_lock = threading.Lock()
+_histograms = {}     # (metric, stage) -> [bucket counts..., sum, count]
+_counters = {("shrimp_reruns_total", ()): 0, ("shrimp_sessions_started_total", ()): 0}   # (metric, labels) -> value
+_gauges = {}         # (metric, labels) -> value
+_sessions = {}       # session id -> last seen (monotonic)
+_last_write = 0.0
+
+
+# ---------------------------
+# Recording
+# ---------------------------
+def _family(name):
+    for metric, (_, prefixes) in HISTOGRAMS.items():
+        if name.startswith(prefixes):
+            return metric
+    return VIEW_HISTOGRAM
+
+
+def observe(metric, stage, seconds):
+    with _lock:
+        h = _histograms.get((metric, stage))
+        if h is None:
+            h = _histograms[(metric, stage)] = [0] * (len(BUCKETS) + 2)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                h[i] += 1
+        h[-2] += seconds
+        h[-1] += 1
+
+
+def inc(metric, labels=(), value=1):
+    with _lock:
+        _counters[(metric, labels)] = _counters.get((metric, labels), 0) + value
+
+
+def set_gauge(metric, labels, value):
+    with _lock:
+        _gauges[(metric, labels)] = value
+
+
+def _on_event(event, context):
+    kind, name = event["event"], event["name"]
+    if kind == "span":
+        observe(_family(name), name, event["ms"] / 1000)
+        if name in ROW_GAUGES and event["rows"] is not None:
+            set_gauge("shrimp_dataset_rows", (("dataset", ROW_GAUGES[name]),), event["rows"])
+    elif kind == "cache":
+        inc("shrimp_cache_lookups_total", (("cache", name), ("outcome", event["outcome"])))
+    elif kind == "mark" and name == "rerun":
+        inc("shrimp_reruns_total")
+
+    session = context.get("session")
+    if session:
+        with _lock:
+            new = session not in _sessions
+            _sessions[session] = time.monotonic()
+        if new:
+            inc("shrimp_sessions_started_total")
+
+
+def enable():
+    """Start collecting; safe to call more than once."""
+    instrument.add_listener(_on_event)
+
+
+# ---------------------------
+# Exposition
+# ---------------------------
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # Peak rather than current off Linux; ru_maxrss is bytes on macOS, KiB elsewhere
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _escape(value):
+    return value.replace("\\", r"\\").replace('"', r'\"').replace("\n", r"\n")
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value):
+    return repr(round(value, 6)) if isinstance(value, float) else str(value)
+
+
+def render():
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    now = time.monotonic()
+    with _lock:
+        for session, seen in list(_sessions.items()):
+            if now - seen > 24 * 3600:
+                del _sessions[session]
+        active = sum(now - seen <= ACTIVE_SESSION_S for seen in _sessions.values())
+        histograms = {k: list(v) for k, v in _histograms.items()}
+        counters, gauges = dict(_counters), dict(_gauges)
+    gauges[("shrimp_active_sessions", ())] = active
+    gauges[("shrimp_process_resident_memory_bytes", ())] = _rss_bytes()
+
+    lines = []
+    for metric, (help_text, _) in HISTOGRAMS.items():
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+        for (m, stage), h in sorted(histograms.items()):
+            if m != metric:
+                continue
+            for bound, n in zip(BUCKETS, h):
+                lines.append(f"{metric}_bucket{_labels((('stage', stage), ('le', _number(bound))))} {n}")
+            lines.append(f"{metric}_bucket{_labels((('stage', stage), ('le', '+Inf')))} {h[-1]}")
+            lines.append(f"{metric}_sum{_labels((('stage', stage),))} {_number(h[-2])}")
+            lines.append(f"{metric}_count{_labels((('stage', stage),))} {h[-1]}")
+
+    for kind, values, helps in (("counter", counters, COUNTER_HELP), ("gauge", gauges, GAUGE_HELP)):
+        for metric, help_text in helps.items():
+            series = sorted((labels, v) for (m, labels), v in values.items() if m == metric)
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+            lines += [f"{metric}{_labels(labels)} {_number(v)}" for labels, v in series]
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path=None, force=False):
+    """Write ``render()`` atomically to ``path``; at most every WRITE_INTERVAL_S unless forced."""
+    global _last_write
+    path = PROM_FILE if path is None else path
+    if not path or (not force and time.monotonic() - _last_write < WRITE_INTERVAL_S):
+        return None
+    _last_write = time.monotonic()
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(render())
+        os.replace(tmp, path)
+    except OSError:
+        return None
+    return path
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port=METRICS_PORT, address="127.0.0.1"):
+    """Serve ``/metrics`` from a daemon thread; returns the server."""
+    server = ThreadingHTTPServer((address, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="shrimp-metrics", daemon=True).start()
+    return server
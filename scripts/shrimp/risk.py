@@ -0,0 +1,173 @@
+"""
+Tank risk table: display columns and cell styles.
+
+Alert levels and details come from ``shrimp.metrics``; "Risk Tomorrow" is
+the mortality-risk model's score (``shrimp.mortality``) when one is trained,
+and "Water Drift" the drift episodes of ``shrimp.drift`` covering each row.
+Cell colours are stored as small categorical "style class" columns next to
+the data, so the page only turns the rows it is actually showing into CSS.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from shrimp.instrument import cached, traced
+from shrimp.metrics import alert_details, alert_levels
+from shrimp.mortality import RISK_HIGH, RISK_WARN
+
+# Columns to display, with their on-screen names
+RISK_COLUMNS = {
+    'X_label': 'Date/Week',
+    'Block': 'Block',
+    'Tank': 'Tank',
+    'pH': 'pH',
+    'Salinity': 'Salinity',
+    'WaterTemperature': 'WaterTemperature',
+    'DeadCount_day': 'Dead Shrimp',
+    'ScheduledFeed_day_g': 'Scheduled Feed (g)',
+    'ActualFeed_day_g': 'Actual Feed (g)',
+    'Alert_Level': 'Alert_Level',
+    'Risk_Tomorrow': 'Risk Tomorrow (%)',
+    'Risk_Drivers': 'Risk Drivers',
+    'Water_Drift': 'Water Drift',
+    'Alert_Details': 'Alert_Details',
+}
+
+# Risk Tomorrow (%) at or above these is coloured red / orange
+RISK_HIGH_PCT = RISK_HIGH * 100
+RISK_WARN_PCT = RISK_WARN * 100
+
+# Style class -> CSS
+STYLE_CSS = {
+    "": "",
+    "red": "background-color: #FF0000",
+    "orange": "background-color: #FF8000",
+    "alert-critical": "background-color: #FF0000; color: white; font-weight: bold",
+    "alert-warning": "background-color: #FFA500; color: black; font-weight: bold",
+    "alert-normal": "background-color: #90EE90; color: black; font-weight: bold",
+}
+
+# Displayed column -> column holding its style class
+STYLED_COLUMNS = {
+    'Alert_Level': '_style_alert',
+    'pH': '_style_ph',
+    'Salinity': '_style_salinity',
+    'Dead Shrimp': '_style_dead',
+    'Risk Tomorrow (%)': '_style_risk',
+    'Water Drift': '_style_drift',
+}
+DRIFT_ARROWS = {"rising": "↑", "falling": "↓"}
+
+
+def _style_class(red, orange):
+    return pd.Categorical(np.select([red, orange], ["red", "orange"], ""), categories=list(STYLE_CSS))
+
+
+def style_classes(table):
+    """Categorical style class per styled cell, one column per styled column."""
+    ph, sal, dead, risk = table['pH'], table['Salinity'], table['Dead Shrimp'], table['Risk Tomorrow (%)']
+    alert = np.select(
+        [table['Alert_Level'] == "Critical 🔴", table['Alert_Level'] == "Warning ⚠", table['Alert_Level'] == "Normal ✅"],
+        ["alert-critical", "alert-warning", "alert-normal"],
+        "",
+    )
+    return pd.DataFrame({
+        '_style_alert': pd.Categorical(alert, categories=list(STYLE_CSS)),
+        '_style_ph': _style_class((ph < 7.6) | (ph > 8.3), ph > 8.2),
+        '_style_salinity': _style_class((sal < 25) | (sal > 30), sal > 29),
+        '_style_dead': _style_class(dead > 5, dead > 4),
+        '_style_risk': _style_class(risk >= RISK_HIGH_PCT, risk >= RISK_WARN_PCT),
+        '_style_drift': _style_class(np.zeros(len(table), dtype=bool), table['Water Drift'] != ""),
+    }, index=table.index)
+
+
+def _risk_tomorrow(view_df, risk):
+    # Model score of each row's tank and day in percent, and its top drivers
+    # where the day was explained; NaN / "" without a model
+    if risk is None:
+        return np.nan, ""
+    keys = pd.DataFrame({
+        'Block': view_df['Block'].astype(str).str.strip().str.upper().to_numpy(),
+        'Tank': view_df['Tank'].astype(str).str.strip().str.upper().to_numpy(),
+        'Date': view_df['Date'].to_numpy(),
+    })
+    scores = risk['scores'].drop_duplicates(['Block', 'Tank', 'Date'], keep='last')
+    drivers = risk['explanations'][['Block', 'Tank', 'Date', 'Top_drivers']]
+    rows = keys.merge(scores, on=['Block', 'Tank', 'Date'], how='left').merge(
+        drivers.drop_duplicates(['Block', 'Tank', 'Date'], keep='last'), on=['Block', 'Tank', 'Date'], how='left')
+    return (rows['Risk_Tomorrow'].to_numpy(float) * 100).round(1), rows['Top_drivers'].fillna("").to_numpy()
+
+
+def _water_drift(view_df, events):
+    # "pH ↓ since 02-10" for each drift episode of the row's tank running on
+    # the row's day (Start <= Date < End); "" when none or no events given
+    if events is None or events.empty:
+        return ""
+    keys = pd.DataFrame({
+        'Block': view_df['Block'].astype(str).str.strip().str.upper().to_numpy(),
+        'Tank': view_df['Tank'].astype(str).str.strip().str.upper().to_numpy(),
+        'Date': view_df['Date'].dt.normalize().to_numpy(),
+        'Row': np.arange(len(view_df)),
+    })
+    rows = keys.merge(events, on=['Block', 'Tank'])
+    rows = rows[(rows['Start'] <= rows['Date']) & ~(rows['End'] <= rows['Date'])]
+    label = (rows['Param'] + " " + rows['Direction'].map(DRIFT_ARROWS)
+             + " since " + rows['Start'].dt.strftime("%m-%d"))
+    text = label.groupby(rows['Row']).agg(", ".join)
+    return text.reindex(range(len(view_df)), fill_value="").to_numpy()
+
+
+@traced("risk.build_table")
+def build_risk_table(view_df, risk=None, drift_events=None):
+    """
+    Display-ready risk table: renamed columns plus hidden ``_style_*``
+    columns. ``risk`` is the ``data.mortality_risk`` result, or None;
+    ``drift_events`` the ``data.water_drift`` episodes, or None.
+    """
+    view_df = view_df.copy()
+    view_df['X_label'] = view_df['Date'].dt.date
+    view_df['DeadCount_day'] = pd.to_numeric(view_df['DeadCount_day'], errors='coerce').fillna(0)
+    for col in ['pH', 'Salinity', 'WaterTemperature']:
+        view_df[col] = pd.to_numeric(view_df[col], errors='coerce')
+
+    view_df['Alert_Level'] = alert_levels(view_df)
+    view_df['Alert_Details'] = alert_details(view_df)
+    view_df['Risk_Tomorrow'], view_df['Risk_Drivers'] = _risk_tomorrow(view_df, risk)
+    view_df['Water_Drift'] = _water_drift(view_df, drift_events)
+
+    table = view_df[list(RISK_COLUMNS)].rename(columns=RISK_COLUMNS).reset_index(drop=True)
+    return pd.concat([table, style_classes(table)], axis=1)
+
+
+@cached(st.cache_data(max_entries=32, show_spinner=False))
+def risk_table(data_version, selection_key, _view_df, model_version=None, _risk=None, _drift_events=None):
+    """``build_risk_table`` for one filter selection, cached per data version and risk model."""
+    return build_risk_table(_view_df, _risk, _drift_events)
+
+
+def query_risk_table(table, levels=None, search="", sort_by=None, descending=False):
+    """Filter and sort the full table; returns the matching rows in order."""
+    mask = np.ones(len(table), dtype=bool)
+    if levels:
+        mask &= table['Alert_Level'].isin(levels).to_numpy()
+    if search:
+        text = (table['Block'].astype(str) + " " + table['Tank'].astype(str) + " " + table['Alert_Details']
+                + " " + table['Water Drift'])
+        mask &= text.str.contains(search, case=False, regex=False).to_numpy()
+    result = table[mask]
+    if sort_by:
+        result = result.sort_values(sort_by, ascending=not descending, kind='stable', na_position='last')
+    return result
+
+
+def style_page(page):
+    """Styler for one page of the table; CSS comes from the style class columns."""
+    visible = page.drop(columns=list(STYLED_COLUMNS.values()))
+
+    def css(_):
+        styles = pd.DataFrame("", index=visible.index, columns=visible.columns)
+        for col, style_col in STYLED_COLUMNS.items():
+            styles[col] = page[style_col].map(STYLE_CSS).astype(str)
+        return styles
+
+    return visible.style.apply(css, axis=None)
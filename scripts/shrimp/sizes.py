@@ -0,0 +1,226 @@
+"""
+Size distribution of each tank from the S / M / L columns of ``AvgBW.xlsx``.
+
+Every sampling weighs and measures three size classes. From them:
+
+- ``length_weight_fits``: W = a·L^b per tank (and for the whole farm), fitted
+  on log(W) = log(a) + b·log(L) over all of a tank's class samples;
+- ``size_samples``: per sampling the weight CV (from the S-L weight spread),
+  the CV implied by the length spread (b × length CV), and the share of the
+  stock in each size class, assuming log-normal weights around the ABW with
+  that CV and class boundaries halfway (geometrically) between class weights;
+- ``tank_sizes``: the CV trend of each tank's current cycle and how heavy its
+  shrimp are for their length against the farm curve, with ``Divergent``
+  flagging tanks far out of line with the rest of the farm on any of them.
+
+Every fit is one batched least-squares solve over all tanks (per-group sums
+with ``np.bincount``, then a stacked ``np.linalg.pinv``), never a loop over
+tanks. ``size_report`` runs all three; the dashboard caches it per ABW file
+version (``data.size_analytics``).
+
+No Streamlit dependency, like ``shrimp.metrics``.
+"""
+import numpy as np
+import pandas as pd
+
+from shrimp.instrument import traced
+
+KEYS = ['Block', 'Tank']
+SIZE_CLASSES = ["S", "M", "L"]
+
+# A fit needs this many class samples over at least two different lengths
+MIN_FIT_POINTS = 4
+# A CV trend needs this many samplings of the current cycle
+MIN_TREND_SAMPLES = 3
+# Robust z-score (median / MAD over all tanks) beyond which a tank diverges
+DIVERGENCE_Z = 3.0
+
+
+def _batched_lstsq(codes, groups, X, y):
+    """
+    Least squares of y ~ X for every group at once: rows of ``X`` (n, p)
+    belong to group ``codes`` (0..groups-1). Returns the (groups, p)
+    coefficients, points per group, R² and each row's residual.
+    """
+    p = X.shape[1]
+    xtx = np.stack([np.bincount(codes, X[:, i] * X[:, j], groups) for i in range(p) for j in range(p)], axis=1)
+    xty = np.stack([np.bincount(codes, X[:, i] * y, groups) for i in range(p)], axis=1)
+    coef = (np.linalg.pinv(xtx.reshape(groups, p, p)) @ xty[..., None])[..., 0]
+
+    residual = y - np.einsum('ij,ij->i', X, coef[codes])
+    n = np.bincount(codes, minlength=groups)
+    y_mean = np.bincount(codes, y, groups) / np.maximum(n, 1)
+    ss_tot = np.bincount(codes, (y - y_mean[codes]) ** 2, groups)
+    ss_res = np.bincount(codes, residual ** 2, groups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r2 = np.where(ss_tot > 0, 1 - ss_res / ss_tot, np.nan)
+    return coef, n, r2, residual
+
+
+def _spread(codes, groups, x):
+    """Whether each group's ``x`` takes at least two different values."""
+    n = np.maximum(np.bincount(codes, minlength=groups), 1)
+    mean = np.bincount(codes, x, groups) / n
+    return np.bincount(codes, (x - mean[codes]) ** 2, groups) > 1e-12
+
+
+def _norm_cdf(z):
+    # Abramowitz & Stegun 7.1.26 erf (|error| < 1.5e-7), vectorized without scipy
+    x = np.abs(z) / np.sqrt(2)
+    t = 1 / (1 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1 - poly * np.exp(-x * x)
+    return 0.5 * (1 + np.sign(z) * erf)
+
+
+# -----------------------------
+# Class samples
+# -----------------------------
+def class_samples(abw_df):
+    """One row per sampling and size class with a positive length (cm) and weight (g)."""
+    parts = []
+    for size in SIZE_CLASSES:
+        length, weight = f"{size}-Length", f"{size}-Weight"
+        if length not in abw_df.columns or weight not in abw_df.columns:
+            continue
+        part = abw_df[KEYS + ['Date']].assign(Class=size, Length_cm=pd.to_numeric(abw_df[length], errors='coerce'),
+                                              Weight_g=pd.to_numeric(abw_df[weight], errors='coerce'))
+        parts.append(part[(part['Length_cm'] > 0) & (part['Weight_g'] > 0)])
+    if not parts:
+        return pd.DataFrame(columns=KEYS + ['Date', 'Class', 'Length_cm', 'Weight_g'])
+    return pd.concat(parts, ignore_index=True)
+
+
+@traced("sizes.length_weight_fits")
+def length_weight_fits(classes):
+    """
+    a, b, R² and n of W = a·L^b per (Block, Tank), plus a farm-wide row with
+    Block = Tank = "ALL". Tanks with too few points or a single length get NaN.
+    """
+    classes = classes.reset_index(drop=True)
+    tanks = classes.groupby(KEYS, sort=True).ngroup().to_numpy()
+    n_tanks = int(tanks.max()) + 1 if len(tanks) else 0
+    # The farm is one more group holding every point
+    codes = np.concatenate([tanks, np.full(len(classes), n_tanks)])
+    log_l = np.log(classes['Length_cm'].to_numpy(float))
+    log_w = np.log(classes['Weight_g'].to_numpy(float))
+    X = np.column_stack([np.ones(2 * len(classes)), np.tile(log_l, 2)])
+    coef, n, r2, _ = _batched_lstsq(codes, n_tanks + 1, X, np.tile(log_w, 2))
+
+    ok = (n >= MIN_FIT_POINTS) & _spread(codes, n_tanks + 1, X[:, 1])
+    labels = classes[KEYS].drop_duplicates().sort_values(KEYS)
+    fits = pd.concat([labels, pd.DataFrame({'Block': ["ALL"], 'Tank': ["ALL"]})], ignore_index=True)
+    fits['a'] = np.where(ok, np.exp(coef[:, 0]), np.nan)
+    fits['b'] = np.where(ok, coef[:, 1], np.nan)
+    fits['R2'] = np.where(ok, r2, np.nan).round(3)
+    fits['n'] = n
+    return fits
+
+
+# -----------------------------
+# Per-sampling CV and class shares
+# -----------------------------
+def _cycles(abw_df):
+    # A "no shrimp" (or empty) row closes a tank's cycle; the next sample starts a new one
+    empty = ~(abw_df['Avg Weight'] > 0)
+    return empty.astype(int).groupby([abw_df[k] for k in KEYS]).cumsum()
+
+
+@traced("sizes.size_samples")
+def size_samples(abw_df, fits):
+    """
+    One row per weighed sampling: ABW, CV_pct, CV_length_pct (the tank's b ×
+    length CV), Cycle, and the estimated share of the stock in each class
+    (Share_S / Share_M / Share_L, NaN where the classes were not weighed).
+    """
+    abw_df = abw_df.sort_values(KEYS + ['Date'], kind='stable')
+    samples = abw_df[KEYS + ['Date']].assign(Cycle=_cycles(abw_df), ABW=abw_df['Avg Weight'])
+    samples['CV_pct'] = abw_df['CV_pct'] if 'CV_pct' in abw_df.columns else np.nan
+    samples = samples[samples['ABW'] > 0].copy()
+    cols = {f"{s}-{m}": pd.to_numeric(abw_df.loc[samples.index, f"{s}-{m}"], errors='coerce')
+            if f"{s}-{m}" in abw_df.columns else np.nan
+            for s in SIZE_CLASSES for m in ("Length", "Weight")}
+
+    b = samples.merge(fits[KEYS + ['b']], on=KEYS, how='left')['b'].to_numpy()
+    length_cv = (cols['L-Length'] - cols['S-Length']) / 4 / cols['M-Length']
+    samples['CV_length_pct'] = (b * length_cv * 100).round(2)
+
+    # Log-normal weights with mean ABW and the weighed CV; class boundaries
+    # at the geometric midpoints between class weights
+    cv = samples['CV_pct'] / 100
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sigma = np.sqrt(np.log1p(cv ** 2)).where(cv > 0)
+        mu = np.log(samples['ABW']) - sigma ** 2 / 2
+        lower = _norm_cdf((np.log(np.sqrt(cols['S-Weight'] * cols['M-Weight'])) - mu) / sigma)
+        upper = _norm_cdf((np.log(np.sqrt(cols['M-Weight'] * cols['L-Weight'])) - mu) / sigma)
+    samples['Share_S'] = (lower * 100).round(1)
+    samples['Share_M'] = ((upper - lower) * 100).round(1)
+    samples['Share_L'] = ((1 - upper) * 100).round(1)
+    return samples.reset_index(drop=True)
+
+
+# -----------------------------
+# Tank summary and divergence
+# -----------------------------
+def _robust_z(values):
+    # (x - median) / (1.4826 MAD); NaN stays NaN and never exceeds a threshold
+    if not np.isfinite(values).any():
+        return np.full_like(values, np.nan)
+    median = np.nanmedian(values)
+    mad = 1.4826 * np.nanmedian(np.abs(values - median))
+    return (values - median) / mad if mad > 0 else np.zeros_like(values)
+
+
+@traced("sizes.tank_sizes")
+def tank_sizes(samples, classes, fits):
+    """
+    Per (Block, Tank): its latest sampling's ABW / CV / class shares, the CV
+    trend over the current cycle (pp per week), weight-for-length against
+    the farm curve (%), the tank's b, and Divergent with the reasons:
+    "uneven sizes" / "CV rising" / "light for length" / "heavy for length"
+    where the tank is more than DIVERGENCE_Z robust z-scores from the others.
+    """
+    latest_cycle = samples['Cycle'] == samples.groupby(KEYS)['Cycle'].transform('max')
+    current = samples[latest_cycle & samples['CV_pct'].notna()].reset_index(drop=True)
+    codes = current.groupby(KEYS, sort=True).ngroup().to_numpy()
+    groups = int(codes.max()) + 1 if len(codes) else 0
+    weeks = (current['Date'] - current['Date'].min()).dt.days.to_numpy(float) / 7
+    coef, n, _, _ = _batched_lstsq(codes, groups, np.column_stack([np.ones(len(current)), weeks]),
+                                   current['CV_pct'].to_numpy(float))
+    trend = current[KEYS].drop_duplicates().sort_values(KEYS).reset_index(drop=True)
+    trend['CV_trend_pp_week'] = np.where((n >= MIN_TREND_SAMPLES) & _spread(codes, groups, weeks),
+                                         coef[:, 1], np.nan).round(2)
+    trend['Samples_in_cycle'] = n
+
+    # Mean log residual of each tank's class samples against the farm curve
+    farm = fits[(fits['Block'] == "ALL") & (fits['Tank'] == "ALL")].iloc[0]
+    residual = np.log(classes['Weight_g']) - np.log(farm['a']) - farm['b'] * np.log(classes['Length_cm'])
+    condition = residual.groupby([classes[k] for k in KEYS]).mean()
+    condition = ((np.exp(condition) - 1) * 100).round(1).rename('Weight_for_length_pct').reset_index()
+
+    # The whole latest row: groupby().last() would take each column's last non-null value
+    latest = (samples.sort_values(KEYS + ['Date'], kind='stable').drop_duplicates(KEYS, keep='last')
+              [KEYS + ['Date', 'ABW', 'CV_pct', 'CV_length_pct', 'Share_S', 'Share_M', 'Share_L']])
+    table = (latest.merge(trend, on=KEYS, how='left').merge(condition, on=KEYS, how='left')
+             .merge(fits[KEYS + ['b']], on=KEYS, how='left'))
+
+    cv_z, trend_z, condition_z = (_robust_z(table[col].to_numpy(float))
+                                  for col in ['CV_pct', 'CV_trend_pp_week', 'Weight_for_length_pct'])
+    reasons = np.stack([
+        np.where(cv_z > DIVERGENCE_Z, "uneven sizes", ""),
+        np.where(trend_z > DIVERGENCE_Z, "CV rising", ""),
+        np.where(condition_z < -DIVERGENCE_Z, "light for length", ""),
+        np.where(condition_z > DIVERGENCE_Z, "heavy for length", ""),
+    ], axis=1)
+    table['Divergence'] = [", ".join(r for r in row if r) for row in reasons]
+    table['Divergent'] = table['Divergence'] != ""
+    return table.sort_values(['Divergent', 'CV_pct'], ascending=False, kind='stable').reset_index(drop=True)
+
+
+@traced("sizes.size_report")
+def size_report(abw_df):
+    """{'fits', 'samples', 'tanks'}: the three tables above for one ABW file."""
+    classes = class_samples(abw_df)
+    fits = length_weight_fits(classes)
+    samples = size_samples(abw_df, fits)
+    return {'fits': fits, 'samples': samples, 'tanks': tank_sizes(samples, classes, fits)}
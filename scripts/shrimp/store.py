@@ -0,0 +1,164 @@
+"""
+Columnar copy of the farm log and ABW samples, partitioned per tank.
+
+Each data version is written once as a hive-partitioned parquet dataset
+(``Block=<b>/Tank=<t>/``) under ``STORE_DIR``. Per-tank pages then read a
+single partition directory instead of the whole workbook, so opening one
+tank costs the same however many tanks the farm has.
+
+A version is built in its own ``.build-*`` directory and renamed into place.
+Only directories this module wrote (hex-named, holding a manifest) are ever
+pruned, and the most recently used other version is kept for processes
+still reading it, so ``STORE_DIR`` can sit inside a shared folder.
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from urllib.parse import quote
+
+import pandas as pd
+import streamlit as st
+
+from shrimp import data
+from shrimp.instrument import cached, span
+
+STORE_DIR = os.environ.get("SHRIMP_STORE_DIR", os.path.join(data.REPO_ROOT, ".shrimp_store"))
+PARTITION_COLS = ['Block', 'Tank']
+MANIFEST = "partitions.json"
+VERSION_NAME = re.compile(r"^[0-9a-f]{16}$")
+BUILD_PREFIX = ".build-"
+# Versions kept: the current one plus the most recently used others
+KEEP_VERSIONS = 2
+# Build directories untouched this long were left by a crashed build
+STALE_BUILD_SECONDS = 3600
+
+# Free-text columns from the workbooks that are measurements
+NUMERIC_COLS = ['WaterTemperature', 'RoomTemperature', 'Humidity', 'pH', 'Salinity']
+
+
+def _version_dir(data_version):
+    return os.path.join(STORE_DIR, hashlib.sha1(data_version.encode()).hexdigest()[:16])
+
+
+def _arrow_safe(df):
+    # Excel columns can mix numbers and text; parquet needs one type per column
+    df = df.copy()
+    for col in df.columns:
+        if col in NUMERIC_COLS:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        elif df[col].dtype == object:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    df[PARTITION_COLS] = df[PARTITION_COLS].astype(str).apply(lambda s: s.str.strip())
+    return df
+
+
+def write_partitions(df, path):
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    table = pa.Table.from_pandas(_arrow_safe(df), preserve_index=False)
+    partitioning = ds.partitioning(pa.schema([(c, pa.string()) for c in PARTITION_COLS]), flavor="hive")
+    ds.write_dataset(table, path, format="parquet", partitioning=partitioning,
+                     existing_data_behavior="overwrite_or_ignore")
+
+
+def _touch(root):
+    # A manifest's mtime is when its version was last used
+    try:
+        os.utime(os.path.join(root, MANIFEST))
+    except OSError:
+        pass
+
+
+def store_versions():
+    """Version directories written by ``build_store``, most recently used first."""
+    found = []
+    for name in os.listdir(STORE_DIR) if os.path.isdir(STORE_DIR) else []:
+        if VERSION_NAME.match(name):
+            try:
+                found.append((os.path.getmtime(os.path.join(STORE_DIR, name, MANIFEST)), name))
+            except OSError:
+                continue  # no manifest: not ours, or being pruned
+    return [os.path.join(STORE_DIR, name) for _, name in sorted(found, reverse=True)]
+
+
+def prune_store(current):
+    """Drop versions beyond the KEEP_VERSIONS most recently used (never ``current``) and stale builds."""
+    for old in [v for v in store_versions() if v != current][KEEP_VERSIONS - 1:]:
+        shutil.rmtree(old, ignore_errors=True)
+    now = time.time()
+    for name in os.listdir(STORE_DIR):
+        path = os.path.join(STORE_DIR, name)
+        try:
+            stale = name.startswith(BUILD_PREFIX) and now - os.path.getmtime(path) > STALE_BUILD_SECONDS
+        except OSError:
+            continue
+        if stale:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def build_store(data_version, farm_df, abw_df):
+    """Write both datasets for ``data_version`` (once) and prune older versions."""
+    root = _version_dir(data_version)
+    manifest_path = os.path.join(root, MANIFEST)
+    if os.path.exists(manifest_path):
+        return root
+
+    os.makedirs(STORE_DIR, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=BUILD_PREFIX, dir=STORE_DIR)
+    try:
+        with span("store.write_partitions", len(farm_df)):
+            write_partitions(farm_df.dropna(subset=PARTITION_COLS), os.path.join(tmp, "farm_log"))
+            if abw_df is not None:
+                write_partitions(abw_df.dropna(subset=PARTITION_COLS), os.path.join(tmp, "abw"))
+
+        keys = _arrow_safe(farm_df[PARTITION_COLS].dropna()).drop_duplicates().sort_values(PARTITION_COLS)
+        with open(os.path.join(tmp, MANIFEST), "w") as f:
+            json.dump({"data_version": data_version, "partitions": keys.values.tolist()}, f)
+        try:
+            os.rename(tmp, root)
+        except OSError:
+            if not os.path.exists(manifest_path):
+                raise  # another process built the same version first otherwise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    prune_store(root)
+    return root
+
+
+@cached(st.cache_resource(max_entries=1, show_spinner="Building tank store..."))
+def tank_store(data_version):
+    """Store directory for the current data version, built on first use."""
+    root = _version_dir(data_version)
+    if not os.path.exists(os.path.join(root, MANIFEST)):
+        try:
+            abw_df = data.get_abw()
+        except Exception:
+            abw_df = None
+        build_store(data_version, data.get_farm_log(), abw_df)
+    _touch(root)
+    return root
+
+
+def partitions(data_version):
+    """[(block, tank), ...] available in the store."""
+    with open(os.path.join(tank_store(data_version), MANIFEST)) as f:
+        return [tuple(p) for p in json.load(f)["partitions"]]
+
+
+@cached(st.cache_data(max_entries=64, show_spinner=False))
+def load_partition(data_version, dataset, block, tank):
+    """One tank's rows from ``dataset`` ('farm_log' or 'abw'); empty if absent."""
+    import pyarrow.parquet as pq
+
+    path = os.path.join(tank_store(data_version), dataset,
+                        f"Block={quote(block, safe='')}", f"Tank={quote(tank, safe='')}")
+    if not os.path.isdir(path):
+        return pd.DataFrame()
+    df = pq.read_table(path).to_pandas()
+    df['Block'], df['Tank'] = block, tank
+    return df.sort_values('Date').reset_index(drop=True)
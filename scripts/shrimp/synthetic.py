@@ -0,0 +1,234 @@
+"""
+Deterministic synthetic farm data at any scale.
+
+``generate_farm`` builds a daily tank log and weekly ABW samples with the same
+column names and the same quirks as the real workbooks (weights written as
+"1.06g" / "0.47 g", "no shrimp" for emptied tanks, temperatures such as
+"26,2", "No Check" or "30.9°C"), so everything downstream parses them exactly
+as it parses a real report. ``write_farm`` saves them as
+``Tank_Consolidated_Report_<end>_000000.xlsx`` and ``AvgBW.xlsx``;
+``ensure_farm`` does so only if the folder does not hold them yet.
+
+The same arguments and seed always give the same rows.
+"""
+import glob
+import logging
+import os
+import string
+
+import numpy as np
+import pandas as pd
+
+_log = logging.getLogger(__name__)
+
+REPORT_COLUMNS = [
+    "Date", "Batch ID", "Worker Name", "Block", "Tank No.",
+    "Scheduled Feed (g)", "Adjusted Feed (g)", "Leftover_g", "Leftover_pct",
+    "Dead Shrimp Count", "Dead Shrimp Weight (g)", "InitialCount", "LiveCount", "Mortality_pct",
+    "Water Temperature", "Room Temperature", "Humidity",
+    "Water condition (Y/N)", "Foam Present  (Y/N)", "Salinity (ppt)", "pH Value",
+    "Aeration (OK)", "Water Circulation (Y/N)", "Requires_Attention", "Problem_Type",
+]
+# The real ABW sheet has a trailing space in its date header
+ABW_COLUMNS = ["Date ", "Block", "Tank", "Avg Weight",
+               "S-Length", "M-Length", "L-Length", "S-Weight", "M-Weight", "L-Weight"]
+
+BLOCKS_PER_LETTER = 4
+HIKARU_LETTERS = "HIJ"
+STOCKING_COUNTS = [20000, 24000, 26000]
+
+# Growth: logistic ABW in grams against days since stocking
+MAX_WEIGHT_G = 25.0
+GROWTH_RATE = 0.07
+GROWTH_MIDPOINT_DAYS = 95
+# Length-weight relation W = a * L^b (g, cm)
+LW_A, LW_B = 0.008, 3.0
+
+
+def farm_layout(blocks=48, tanks=2):
+    """[(block, tank, worker), ...]: blocks A1..A4, B1.., tanks T3, T4, ..."""
+    layout = []
+    for i in range(blocks):
+        letter = string.ascii_uppercase[i // BLOCKS_PER_LETTER % 26]
+        # Past Z the letters wrap round with higher numbers: A5..A8, B5..
+        block = f"{letter}{i // (BLOCKS_PER_LETTER * 26) * BLOCKS_PER_LETTER + i % BLOCKS_PER_LETTER + 1}"
+        worker = "Hikaru" if letter in HIKARU_LETTERS else "Jimmy"
+        layout += [(block, f"T{3 + t}", worker) for t in range(tanks)]
+    return layout
+
+
+def growth_curve(days, rate=1.0):
+    return MAX_WEIGHT_G / (1 + np.exp(-GROWTH_RATE * rate * (days - GROWTH_MIDPOINT_DAYS)))
+
+
+def _batches(rng, start, end):
+    """(stock_date, harvest_date) cycles for one tank between start and end."""
+    batches = []
+    stock = start - pd.Timedelta(days=int(rng.integers(0, 60)))
+    while stock <= end:
+        harvest = stock + pd.Timedelta(days=int(rng.integers(100, 131)))
+        batches.append((stock, harvest))
+        stock = harvest + pd.Timedelta(days=int(rng.integers(7, 22)))
+    return batches
+
+
+def _grams(value, rng):
+    return f"{value:g}{rng.choice(['g', ' g'], p=[0.8, 0.2])}"
+
+
+def _cm(value, rng):
+    return f"{value:g}{rng.choice(['cm', ' cm'], p=[0.6, 0.4])}"
+
+
+def _with_quirks(values, rng, quirks):
+    """Stringify ``values`` in place of numbers for a few rows, like the workbook."""
+    out = values.astype(object)
+    for p, fmt in quirks:
+        hit = rng.random(len(out)) < p
+        out[hit] = [fmt(v) for v in values[hit]]
+    return out
+
+
+def _tank_log(rng, block, tank, worker, stock, harvest, rate, start, end):
+    """Daily rows for one batch in one tank, clipped to [start, end]."""
+    days = pd.date_range(max(stock, start), min(harvest, end), freq="D")
+    n = len(days)
+    if n == 0:
+        return None
+    age = (days - stock).days.to_numpy()
+    weight = growth_curve(age, rate) * rng.normal(1.0, 0.03, n)
+
+    initial = int(rng.choice(STOCKING_COUNTS))
+    dead = rng.poisson(0.8, n) + np.where(rng.random(n) < 0.02, rng.poisson(15, n), 0)
+    # Deaths before the window started still count against LiveCount
+    remaining = max(initial - int(rng.poisson(0.8 * max((start - stock).days, 0))), 0)
+    cum_dead = np.minimum(np.cumsum(dead), remaining)
+    dead = np.diff(cum_dead, prepend=0)
+    live = remaining - cum_dead
+
+    feed_rate = 0.03 + 0.09 * np.exp(-weight / 2)
+    scheduled = np.rint(live * weight * feed_rate * 0.6).astype(int)
+    adjusted = np.rint(scheduled * rng.beta(6, 3, n)).astype(int)
+    adjusted = np.where(rng.random(n) < 0.15, scheduled, adjusted)
+    leftover = scheduled - adjusted
+    with np.errstate(divide="ignore", invalid="ignore"):
+        leftover_pct = np.where(scheduled > 0, leftover / scheduled * 100, 0.0)
+        mortality_pct = np.where(live > 0, dead / live * 100, 0.0)
+
+    ph = np.round(rng.normal(7.9, 0.2, n), 1)
+    salinity = np.round(rng.normal(26, 1.5, n)).astype(float)
+    water_temp = np.round(rng.normal(26, 0.8, n), 1)
+    room_temp = np.round(rng.normal(31.5, 1.2, n), 1)
+    humidity = np.round(rng.normal(65, 5, n)).astype(float)
+    aeration = (rng.random(n) < 0.995).astype(int)
+    circulation = (rng.random(n) < 0.3).astype(int)
+
+    problems = np.stack([
+        np.where(leftover_pct > 20, "Feed", ""),
+        np.where((ph < 8.0) | (ph > 8.3), "pH", ""),
+        np.where((salinity < 25) | (salinity > 30), "Salinity", ""),
+        np.where((aeration == 0) | (circulation == 0), "Aeration/Circulation", ""),
+    ], axis=1)
+    problem_type = np.array([", ".join(p for p in row if p) or None for row in problems], dtype=object)
+
+    return pd.DataFrame({
+        "Date": days,
+        "Batch ID": "PJ" + stock.strftime("%y%m%d"),
+        "Worker Name": worker,
+        "Block": block,
+        "Tank No.": tank,
+        "Scheduled Feed (g)": scheduled,
+        "Adjusted Feed (g)": adjusted,
+        "Leftover_g": leftover,
+        "Leftover_pct": leftover_pct,
+        "Dead Shrimp Count": dead,
+        "Dead Shrimp Weight (g)": np.round(dead * weight * rng.uniform(0.6, 1.0, n), 2),
+        "InitialCount": initial,
+        "LiveCount": live,
+        "Mortality_pct": mortality_pct,
+        "Water Temperature": _with_quirks(water_temp, rng, [
+            (0.002, lambda v: f"{v:.1f}".replace(".", ",")), (0.002, lambda v: "No Check")]),
+        "Room Temperature": _with_quirks(room_temp, rng, [(0.005, lambda v: f"{v:.1f}°C")]),
+        "Humidity": _with_quirks(humidity, rng, [(0.005, lambda v: f"{v:.0f}°C")]),
+        "Water condition (Y/N)": (rng.random(n) < 0.99).astype(int),
+        "Foam Present  (Y/N)": (rng.random(n) < 0.6).astype(int),
+        "Salinity (ppt)": salinity,
+        "pH Value": ph,
+        "Aeration (OK)": aeration,
+        "Water Circulation (Y/N)": circulation,
+        "Requires_Attention": (problem_type != None).astype(int),  # noqa: E711
+        "Problem_Type": problem_type,
+    })
+
+
+def _abw_rows(rng, block, tank, stock, harvest, rate, sample_days, start, end):
+    """Weekly ABW samples for one batch, then one "no shrimp" row once emptied."""
+    rows = []
+    for day in sample_days[(sample_days >= max(stock + pd.Timedelta(days=21), start))
+                           & (sample_days <= min(harvest, end))]:
+        avg = round(float(growth_curve((day - stock).days, rate) * rng.normal(1.0, 0.05)), 2)
+        row = {"Date ": day, "Block": block, "Tank": tank, "Avg Weight": _grams(avg, rng)}
+        # Size classes are only weighed once the shrimp are big enough to sort
+        if avg >= 0.8:
+            for size, factor in zip("SML", (0.3, 0.9, 1.9)):
+                w = round(avg * factor * rng.normal(1.0, 0.08), 2)
+                row[f"{size}-Weight"] = _grams(w, rng)
+                row[f"{size}-Length"] = _cm(round((w / LW_A) ** (1 / LW_B) * 2) / 2, rng)
+        rows.append(row)
+    after = sample_days[(sample_days > harvest) & (sample_days <= end)]
+    if len(after):
+        label = str(rng.choice(["no shrimp", "No Shrimp"]))
+        rows.append({"Date ": after[0], "Block": block, "Tank": tank, "Avg Weight": "no shrimp",
+                     **{f"{s}-{m}": label for s in "SML" for m in ("Length", "Weight")}})
+    return rows
+
+
+def generate_farm(blocks=48, tanks=2, days=365, end="2026-01-18", seed=0):
+    """
+    (report_df, abw_df) for ``blocks`` × ``tanks`` tanks over ``days`` days
+    ending on ``end``, each tank running back-to-back batches.
+    """
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp(end).normalize()
+    start = end - pd.Timedelta(days=days - 1)
+    # Every tank is weighed on the same day each week, like the real file
+    sample_days = pd.date_range(start, end, freq="7D")
+
+    logs, abw_rows = [], []
+    for block, tank, worker in farm_layout(blocks, tanks):
+        for stock, harvest in _batches(rng, start, end):
+            # Growth speed of this batch, shared by its feed log and ABW samples
+            rate = rng.normal(1.0, 0.06)
+            log = _tank_log(rng, block, tank, worker, stock, harvest, rate, start, end)
+            if log is not None:
+                logs.append(log)
+            abw_rows += _abw_rows(rng, block, tank, stock, harvest, rate, sample_days, start, end)
+
+    report_df = pd.concat(logs, ignore_index=True)[REPORT_COLUMNS]
+    report_df = report_df.sort_values(["Date", "Block", "Tank No."], kind="stable").reset_index(drop=True)
+    abw_df = pd.DataFrame(abw_rows).reindex(columns=ABW_COLUMNS)
+    abw_df = abw_df.sort_values(["Date ", "Block", "Tank"], kind="stable").reset_index(drop=True)
+    return report_df, abw_df
+
+
+def write_farm(out_dir, report_df, abw_df):
+    """Write the two workbooks into ``out_dir``; returns (report_path, abw_path)."""
+    os.makedirs(out_dir, exist_ok=True)
+    end = report_df["Date"].max()
+    report_path = os.path.join(out_dir, f"Tank_Consolidated_Report_{end:%Y%m%d}_000000.xlsx")
+    abw_path = os.path.join(out_dir, "AvgBW.xlsx")
+    with pd.ExcelWriter(report_path, engine="xlsxwriter") as writer:
+        report_df.to_excel(writer, index=False, sheet_name="Sheet1")
+    with pd.ExcelWriter(abw_path, engine="xlsxwriter") as writer:
+        abw_df.to_excel(writer, index=False, sheet_name="工作表1")
+    return report_path, abw_path
+
+
+def ensure_farm(out_dir, blocks=48, tanks=2, days=365, seed=0):
+    """(report_path, abw_path) in ``out_dir``, generated on first use."""
+    reports = glob.glob(os.path.join(out_dir, "Tank_Consolidated_Report_*.xlsx"))
+    abw_path = os.path.join(out_dir, "AvgBW.xlsx")
+    if reports and os.path.exists(abw_path):
+        return reports[0], abw_path
+    _log.info("generating %s blocks × %s tanks × %s days into %s ...", blocks, tanks, days, out_dir)
+    return write_farm(out_dir, *generate_farm(blocks, tanks, days, seed=seed))
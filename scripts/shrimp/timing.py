@@ -0,0 +1,104 @@
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from shrimp import instrument, prom
+
+# Events kept per session; older ones are dropped between full reruns
+MAX_SESSION_EVENTS = 2000
+
+
+# ---------------------------
+# ⏱️ Section timing
+# ---------------------------
+# Every dashboard section runs inside an st.fragment, so a widget that belongs
+# to one section only reruns that section. Each run records its own
+# wall-clock cost here so a slow section can be spotted on its own.
+@contextmanager
+def timed_section(name):
+    start = time.perf_counter()
+    try:
+        with instrument.span(f"section: {name}"):
+            yield
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        st.session_state.setdefault("section_timings", {})[name] = round(elapsed_ms, 1)
+        if st.session_state.get("show_performance"):
+            st.caption(f"⏱️ {name}: {elapsed_ms:.0f} ms")
+
+
+# ---------------------------
+# 📈 Performance panel
+# ---------------------------
+def _session_events():
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return None
+    events = st.session_state.setdefault("perf_events", [])
+    if len(events) > MAX_SESSION_EVENTS:
+        del events[:-MAX_SESSION_EVENTS // 2]
+    return events, {"session": ctx.session_id[:8]}
+
+
+instrument.set_session_hook(_session_events)
+prom.enable()
+
+
+def start_run():
+    """Call at the top of the entrypoint: spans shown in the panel restart with each full run."""
+    st.session_state["perf_events"] = []
+    instrument.mark("rerun")
+
+
+def performance_panel():
+    """Sidebar panel with this session's spans and cache hit/miss counts."""
+    if not st.session_state.get("show_performance"):
+        return
+    events = st.session_state.get("perf_events", [])
+    with st.sidebar.expander("📈 Performance", expanded=True):
+        spans = [e for e in events if e["event"] == "span"]
+        if spans:
+            st.dataframe(pd.DataFrame({
+                "Stage": ["· " * e["depth"] + e["name"] for e in spans],
+                "ms": [e["ms"] for e in spans],
+                "Rows": [e["rows"] for e in spans],
+            }), hide_index=True)
+        else:
+            st.caption("No spans recorded in this run.")
+
+        lookups = pd.DataFrame([e for e in events if e["event"] == "cache"], columns=["name", "outcome"])
+        process = instrument.cache_stats()
+        if not lookups.empty or process:
+            session = lookups.groupby(["name", "outcome"]).size().unstack(fill_value=0)
+            names = sorted(set(session.index) | set(process))
+            st.dataframe(pd.DataFrame({
+                "Cache": names,
+                "Hits (run)": [int(session.get("hit", {}).get(n, 0)) for n in names],
+                "Misses (run)": [int(session.get("miss", {}).get(n, 0)) for n in names],
+                "Hits (process)": [process.get(n, {}).get("hit", 0) for n in names],
+                "Misses (process)": [process.get(n, {}).get("miss", 0) for n in names],
+            }), hide_index=True)
+        if instrument.PERF_LOG:
+            st.caption(f"JSON-lines log: {instrument.PERF_LOG}")
+
+
+# ---------------------------
+# 📡 Prometheus export
+# ---------------------------
+@st.cache_resource(show_spinner=False)
+def _metrics_server(port):
+    try:
+        return prom.serve(port)
+    except OSError:
+        # Another dashboard process already serves this port
+        return None
+
+
+def publish_metrics():
+    """Refresh the .prom textfile and make sure /metrics is served when a port is set."""
+    if prom.METRICS_PORT:
+        _metrics_server(prom.METRICS_PORT)
+    prom.write_textfile()
@@ -0,0 +1,51 @@
+"""
+Train the mortality-risk model offline and save a new versioned artifact.
+
+    python scripts/train_risk.py                              # newest report in the repo root
+    python scripts/train_risk.py Tank_Consolidated_Report_*.xlsx --model-dir /data/models
+
+Several reports are concatenated (newer rows win on the same tank and day).
+The dashboard picks up the newest artifact on its next data refresh; see
+``shrimp.mortality``.
+"""
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+from shrimp import data, mortality
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("reports", nargs="*", help="Tank_Consolidated_Report_*.xlsx files (default: newest in the repo root)")
+    parser.add_argument("--model-dir", default=data.MODEL_DIR, help=f"artifact folder (default: {data.MODEL_DIR})")
+    args = parser.parse_args(argv)
+
+    reports = args.reports or [data.latest_report_file()]
+    reports = sorted((r for r in reports if r), key=os.path.getmtime)
+    if not reports:
+        print(f"No tank reports found in {data.DATA_DIR}", file=sys.stderr)
+        return 1
+    farm_df = pd.concat([data.read_tank_report(path) for path in reports], ignore_index=True)
+    farm_df = farm_df.drop_duplicates(['Date', 'Block', 'Tank'], keep='last')
+
+    try:
+        artifact = mortality.train_mortality_model(mortality.mortality_features(farm_df))
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    path = mortality.save_artifact(artifact, args.model_dir)
+    metrics = artifact['metrics']
+    print(f"trained on {artifact['rows']} tank-days up to {artifact['trained_until'].date()}, "
+          f"event rate {artifact['event_rate']:.1%}")
+    if 'roc_auc' in metrics:
+        print(f"held-out last {mortality.VALID_FRACTION:.0%} of days: ROC AUC {metrics['roc_auc']}, "
+              f"average precision {metrics['average_precision']} (event rate {metrics['valid_event_rate']:.1%})")
+    print(f"✅ saved {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
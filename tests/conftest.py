@@ -0,0 +1,29 @@
+"""
+Shared setup: ``scripts`` on the import path, the SQLite and parquet stores,
+perf log and Prometheus file pointed at a temporary folder before any shrimp
+module reads its environment, and the repo's own workbooks as test data.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+_TMP = tempfile.mkdtemp(prefix="shrimp-tests-")
+os.environ.update({
+    "SHRIMP_DB_PATH": os.path.join(_TMP, "shrimp.db"),
+    "SHRIMP_STORE_DIR": os.path.join(_TMP, "store"),
+    "SHRIMP_PERF_LOG": "",
+    "SHRIMP_PROM_FILE": "",
+})
+
+
+@pytest.fixture(scope="session")
+def farm_log():
+    """The newest report in the repo root as the pages see it (``data.prepare_view_df``)."""
+    from shrimp import data
+
+    return data.prepare_view_df(data.read_tank_report(data.latest_report_file()))
@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+from shrimp import data, db
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = db.connect(str(tmp_path / "shrimp.db"))
+    db.ingest_report(conn, data.latest_report_file())
+    db.ingest_abw(conn, data.abw_source())
+    yield conn
+    conn.close()
+
+
+def test_read_abw_parses_block_tank_and_weights(tmp_path):
+    path = tmp_path / "AvgBW.xlsx"
+    pd.DataFrame({
+        "Date ": ["2026-01-01", "2026-01-08", "2026-01-08"],
+        "Block": [" a1 ", "A1", "b2"],
+        "Tank": ["t3 ", "T3", " T4"],
+        "Avg Weight": ["1.06g", "2.5 g", "no shrimp"],
+        "S-Weight": ["0.8g", "2g", "no shrimp"], "M-Weight": ["1g", "2.5g", "no shrimp"],
+        "L-Weight": ["1.2g", "3g", "no shrimp"],
+    }).to_excel(path, index=False)
+
+    abw = data.read_abw(str(path)).set_index(['Block', 'Tank', 'Date'])
+    assert set(abw.index.droplevel('Date')) == {("A1", "T3"), ("B2", "T4")}
+    week2 = abw.loc[("A1", "T3", pd.Timestamp("2026-01-08"))]
+    assert week2['Avg Weight'] == 2.5
+    assert week2['ABW_start'] == 1.06
+    assert week2['L-Weight'] == 3.0
+    assert week2['CV_pct'] == pytest.approx((3.0 - 2.0) / 4 / 2.5 * 100)
+    assert abw.loc[("B2", "T4", pd.Timestamp("2026-01-08")), 'Avg Weight'] == 0
+
+
+def test_window_query_matches_the_workbook(conn):
+    report = data.read_tank_report(data.latest_report_file())
+    block, tank = report[['Block', 'Tank']].iloc[0]
+    start, end = report['Date'].min() + pd.Timedelta(days=10), report['Date'].min() + pd.Timedelta(days=40)
+
+    rows = db.query_farm_log(conn, start, end, block, tank)
+    expected = report[(report['Block'] == block) & (report['Tank'] == tank)
+                      & report['Date'].between(start, end)]
+    assert len(rows) == len(expected) > 0
+    assert set(rows['Block']) == {block} and set(rows['Tank']) == {tank}
+    assert rows['ActualFeed_day_g'].sum() == expected['ActualFeed_day_g'].sum()
+    assert rows['Date'].is_monotonic_increasing
+
+
+def test_reingest_replaces_the_report_range(conn):
+    before = db.query_farm_log(conn)
+    db.ingest_report(conn, data.latest_report_file())
+    assert len(db.query_farm_log(conn)) == len(before)
+
+
+def test_current_log_is_clamped_to_the_newest_report(conn):
+    first, last = db.report_range(conn, data.latest_report_file())
+    # A row of an older report still in the store
+    conn.execute("INSERT INTO farm_log (Date, Block, Tank) VALUES (?, 'A1', 'T3')",
+                 ((first - pd.Timedelta(days=30)).strftime("%Y-%m-%d %H:%M:%S"),))
+    rows = db.query_current_log(conn)
+    assert rows['Date'].min() == first and rows['Date'].max() == last
+    assert len(rows) == len(db.query_farm_log(conn)) - 1
+
+
+def test_sqlite_abw_matches_the_workbook(conn):
+    columns = ['Block', 'Tank', 'Date', 'Avg Weight', 'ABW_start', 'CV_pct']
+    from_db = data.derive_abw(db.query_abw(conn))[columns].sort_values(columns[:3]).reset_index(drop=True)
+    from_excel = data.read_abw(data.abw_source())[columns].sort_values(columns[:3]).reset_index(drop=True)
+    pd.testing.assert_frame_equal(from_db, from_excel, check_dtype=False)
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from shrimp.downsample import downsample_frame, lttb_indices
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    y = np.sin(np.linspace(0, 20, 5000))
+    y[1234] = 50.0
+    idx = lttb_indices(y, 200)
+    assert len(idx) == 200
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+    assert 1234 in idx
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_short_series_untouched():
+    assert list(lttb_indices([1.0, 2.0, 3.0], 10)) == [0, 1, 2]
+
+
+def test_downsample_frame_keeps_series_ends_and_flagged_rows():
+    n = 3000
+    df = pd.DataFrame({
+        'Tank': np.repeat(["T3", "T4"], n),
+        'pH': np.tile(8.0 + 0.1 * np.sin(np.linspace(0, 30, n)), 2),
+    })
+    flagged = np.zeros(len(df), dtype=bool)
+    flagged[[17, 2222, n + 999]] = True
+
+    out = downsample_frame(df, ['Tank'], 'pH', 400, keep=flagged)
+    assert len(out) < len(df) / 5
+    assert {0, n - 1, n, 2 * n - 1} <= set(out.index)
+    assert set(np.flatnonzero(flagged)) <= set(out.index)
+    assert out.index.is_monotonic_increasing
+
+
+def test_downsample_frame_under_budget_is_unchanged():
+    df = pd.DataFrame({'Tank': ["T3"] * 10, 'pH': np.arange(10.0)})
+    assert downsample_frame(df, ['Tank'], 'pH', 100) is df
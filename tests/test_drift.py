@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from shrimp import drift
+
+
+def _sorted(df, by):
+    return df.sort_values(by, kind='stable').reset_index(drop=True)
+
+
+def _series(values, param='pH', tank="T3", start="2026-01-01"):
+    dates = pd.date_range(start, periods=len(values), freq="D")
+    return pd.DataFrame({'Block': "A1", 'Tank': tank, 'Param': param, 'Date': dates, 'Value': values})
+
+
+def test_incremental_updates_equal_one_batch_update(farm_log, tmp_path):
+    days = np.sort(farm_log['Date'].dt.normalize().unique())
+    # pH of one tank sliding 0.5 over the last 10 days, so an episode is still open
+    farm_log = farm_log.copy()
+    block, tank = farm_log[['Block', 'Tank']].iloc[-1]
+    sliding = (farm_log['Block'] == block) & (farm_log['Tank'] == tank) & (farm_log['Date'] >= days[-10])
+    farm_log.loc[sliding, 'pH'] -= np.linspace(0, 0.5, sliding.sum())
+
+    batch_state, batch_events = drift.update_drift(*drift.empty_state(), drift.readings(farm_log))
+    assert len(drift.active_drifts(batch_events)) >= 1
+
+    state, events = drift.empty_state()
+    for cut in [days[15], days[16], days[30], days[-5], days[-1]]:
+        # Through the saved files each time, as the dashboard does per data version
+        log = farm_log[farm_log['Date'] < cut + pd.Timedelta(days=1)]
+        source = drift.log_identity(log, "farm")
+        state, events = drift.load_state(str(tmp_path), source)
+        state, events = drift.update_drift(state, events, drift.readings(log, after=drift.watermark(state)))
+        drift.save_state(state, events, str(tmp_path), source)
+
+    pd.testing.assert_frame_equal(_sorted(state, drift.STATE_KEYS), _sorted(batch_state, drift.STATE_KEYS),
+                                  check_dtype=False)
+    pd.testing.assert_frame_equal(_sorted(events, drift.STATE_KEYS + ['Start']),
+                                  _sorted(batch_events, drift.STATE_KEYS + ['Start']), check_dtype=False)
+
+
+def test_slow_creep_inside_the_bands_is_flagged():
+    rng = np.random.default_rng(0)
+    steady = 8.2 + rng.normal(0, 0.03, 30)
+    creep = np.linspace(8.2, 7.7, 8) + rng.normal(0, 0.03, 8)
+    state, events = drift.update_drift(*drift.empty_state(), _series(np.concatenate([steady, creep])))
+    running = drift.active_drifts(events)
+    assert running[['Param', 'Direction']].values.tolist() == [['pH', "falling"]]
+    assert running['Start'].iloc[0] >= pd.Timestamp("2026-01-31")
+    assert running['Baseline'].iloc[0] == pytest.approx(8.2, abs=0.05)
+
+
+def test_steady_water_never_signals():
+    rng = np.random.default_rng(1)
+    _, events = drift.update_drift(*drift.empty_state(), _series(28 + rng.normal(0, 0.3, 120), 'Salinity'))
+    assert events.empty
+
+
+def test_readings_older_than_the_state_are_skipped():
+    state, events = drift.update_drift(*drift.empty_state(), _series(np.full(20, 8.0)))
+    late = _series([7.0], start="2026-01-05")
+    again, _ = drift.update_drift(state, events, late)
+    pd.testing.assert_frame_equal(again, state)
+    assert drift.watermark(again)['Last_Date'].tolist() == [pd.Timestamp("2026-01-20")]
+
+
+def test_a_tank_logged_late_still_gets_its_days():
+    state, events = drift.update_drift(*drift.empty_state(),
+                                       pd.concat([_series(np.full(20, 8.0)), _series(np.full(10, 8.0), tank="T4")],
+                                                 ignore_index=True))
+    # T4's last ten days arrive after T3 has moved on
+    late = pd.DataFrame({'Date': pd.date_range("2026-01-11", periods=10, freq="D"), 'Block': "A1", 'Tank': "T4",
+                         'pH': 8.0, 'Salinity': np.nan, 'WaterTemperature': np.nan})
+    fresh = drift.readings(late, after=drift.watermark(state))
+    assert len(fresh) == 10
+    state, _ = drift.update_drift(state, events, fresh)
+    assert state.set_index('Tank').loc["T4", 'N'] == 20
+
+
+def test_state_from_another_log_is_dropped(tmp_path):
+    log = pd.DataFrame({'Date': pd.date_range("2026-01-01", periods=20, freq="D"), 'Block': "A1", 'Tank': "T3",
+                        'pH': 8.0, 'Salinity': 28.0, 'WaterTemperature': 29.0})
+    source = drift.log_identity(log, "farm")
+    drift.save_state(*drift.update_drift(*drift.empty_state(), drift.readings(log)), str(tmp_path), source)
+    assert len(drift.load_state(str(tmp_path), source)[0]) == 3
+
+    longer = pd.concat([log, log.assign(Date=log['Date'] + pd.Timedelta(days=20))], ignore_index=True)
+    assert len(drift.load_state(str(tmp_path), drift.log_identity(longer, "farm"))[0]) == 3
+    for other in (drift.log_identity(log, "synthetic"),                                  # another data source
+                  drift.log_identity(log.assign(Tank="T4"), "farm"),                     # another tank set
+                  drift.log_identity(log.assign(Date=log['Date'] + pd.Timedelta(days=40)), "farm"),  # a gap
+                  drift.log_identity(log.iloc[:10], "farm")):                            # an older log
+        assert drift.load_state(str(tmp_path), other)[0].empty
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from shrimp import data, drift, feed, growth
+
+
+@pytest.fixture(scope="module")
+def growth_df(farm_log):
+    return growth.daily_growth(farm_log, data.read_abw(data.abw_source()))
+
+
+def _episode(block, tank, end=pd.NaT):
+    return {'Block': block, 'Tank': tank, 'Param': "pH", 'Direction': "falling",
+            'Start': pd.Timestamp("2026-01-10"), 'End': end, 'Baseline': 8.1, 'Signal_Value': 7.8}
+
+
+def test_plan_is_table_feed_times_appetite_and_water(growth_df, farm_log):
+    plan = feed.plan_feed(growth_df, farm_log)
+    assert len(plan) > 0 and not plan.duplicated(feed.KEYS).any()
+    assert (plan['Date'] == farm_log['Date'].max().normalize() + pd.Timedelta(days=1)).all()
+    assert plan['Table_feed_g'].to_numpy() == pytest.approx(
+        (plan['Biomass_kg'] * 1000 * plan['Rate_pct'] / 100).to_numpy(), abs=0.5)
+    assert (plan['Recommended_g'] % feed.ROUND_G == 0).all()
+    # Appetite and Water are shown rounded to two decimals
+    factor = np.maximum(plan['Appetite'] * plan['Water'], feed.MIN_FACTOR)
+    assert plan['Recommended_g'].to_numpy() == pytest.approx((plan['Table_feed_g'] * factor).to_numpy(),
+                                                             rel=0.015, abs=feed.ROUND_G / 2)
+
+
+def test_active_drift_cuts_only_its_tank(growth_df, farm_log):
+    before = feed.plan_feed(growth_df, farm_log).set_index(feed.KEYS)
+    (drifting, closed), others = before.index[:2], before.index[2:]
+    events = pd.DataFrame([_episode(*drifting), _episode(*closed, end=pd.Timestamp("2026-01-15"))],
+                          columns=drift.EVENT_COLUMNS)
+    after = feed.plan_feed(growth_df, farm_log, events).set_index(feed.KEYS)
+
+    assert after.loc[drifting, 'Water'] == pytest.approx(before.loc[drifting, 'Water'] * feed.DRIFT_FACTOR, abs=0.01)
+    assert after.loc[drifting, 'Recommended_g'] < before.loc[drifting, 'Recommended_g']
+    assert "pH falling drift" in after.loc[drifting, 'Adjustments']
+    pd.testing.assert_frame_equal(after.loc[[closed, *others]], before.loc[[closed, *others]])
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from shrimp import forecast
+
+STOCKED = pd.Timestamp("2026-01-01")
+
+
+def _growth(tanks=("T3", "T4"), days=60, slope=0.02):
+    """Daily growth table whose weekly samples lie exactly on ABW^(1/3) = 0.5 + slope · day."""
+    frames = []
+    for i, tank in enumerate(tanks):
+        day = np.arange(days)
+        frames.append(pd.DataFrame({
+            'Block': "A1", 'Tank': tank, 'Batch ID': f"B{i}", 'Date': STOCKED + pd.to_timedelta(day, unit='D'),
+            'ABW': (0.5 + slope * day) ** 3, 'ABW_Source': np.where(day % 7 == 0, 'sample', 'interpolated'),
+            'LiveCount': 10000 * 0.999 ** day,
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_harvest_date_follows_the_fitted_curve_and_bands_are_ordered():
+    growth_df = _growth()
+    models = forecast.fit_growth_models(forecast.forecast_samples(growth_df), n_jobs=1)
+    daily = forecast.forecast_growth(models, forecast.current_batches(growth_df))
+    assert (daily['ABW_lo'] <= daily['ABW']).all() and (daily['ABW'] <= daily['ABW_hi']).all()
+    assert (daily['Biomass_lo_kg'] <= daily['Biomass_hi_kg']).all()
+    assert daily.groupby('Tank')['LiveCount'].is_monotonic_decreasing.all()
+
+    harvest = forecast.harvest_dates(daily, market_abw=20.0)
+    # ABW reaches 20 g on day ceil((20^(1/3) - 0.5) / 0.02) of culture
+    expected = STOCKED + pd.Timedelta(days=int(np.ceil((20 ** (1 / 3) - 0.5) / 0.02)))
+    assert (harvest['Harvest_Date'] - expected).abs().max() <= pd.Timedelta(days=1)
+    assert (harvest['Harvest_Early'] <= harvest['Harvest_Date']).all()
+    assert (harvest['Harvest_Date'] <= harvest['Harvest_Late']).all()
+    assert (harvest['Days_to_harvest'] == (harvest['Harvest_Date'] - harvest['From']).dt.days).all()
+
+
+def test_only_tanks_with_new_samples_are_refitted():
+    growth_df = _growth()
+    models = forecast.fit_growth_models(forecast.forecast_samples(growth_df), n_jobs=1)
+    again = forecast.fit_growth_models(forecast.forecast_samples(growth_df), models, n_jobs=1)
+    assert all(again[key]['model'] is models[key]['model'] for key in models)
+
+    # T4 weighed again on its last day
+    last = (growth_df['Tank'] == "T4") & (growth_df['Date'] == growth_df['Date'].max())
+    growth_df.loc[last, 'ABW_Source'] = 'sample'
+    refitted = forecast.fit_growth_models(forecast.forecast_samples(growth_df), models, n_jobs=1)
+    assert refitted[("A1", "T3")]['model'] is models[("A1", "T3")]['model']
+    assert refitted[("A1", "T4")]['model'] is not models[("A1", "T4")]['model']
+    assert refitted[("A1", "T4")]['n'] == models[("A1", "T4")]['n'] + 1
+
+
+def test_stored_models_are_kept_per_source(tmp_path):
+    path = str(tmp_path / "growth_models.joblib")
+    models = forecast.fit_growth_models(forecast.forecast_samples(_growth()), n_jobs=1)
+    forecast.save_models(models, path, "/farm/a")
+    loaded = forecast.load_models(path, "/farm/a")
+    assert loaded.keys() == models.keys()
+    assert loaded[("A1", "T3")]['hash'] == models[("A1", "T3")]['hash']
+    model, saved = loaded[("A1", "T3")]['model'], models[("A1", "T3")]['model']
+    assert model.predict([[30.0]]) == pytest.approx(saved.predict([[30.0]]))
+    assert forecast.load_models(path, "/farm/b") == {}
+    assert forecast.load_models(str(tmp_path / "missing.joblib"), "/farm/a") == {}
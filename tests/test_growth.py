@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from shrimp import data, growth
+from shrimp.growth import MAX_HOLD_DAYS, align_abw, daily_growth, extend_daily_growth, interpolate_abw, window_rows
+
+DAY0 = pd.Timestamp("2026-01-01")
+
+
+def _days(n, batch="B1", start=DAY0):
+    dates = pd.date_range(start, periods=n, freq="D")
+    return pd.DataFrame({'Date': dates, 'Block': "A1", 'Tank': "T3", 'Batch ID': batch})
+
+
+def _samples(*weights_by_day):
+    return pd.DataFrame({'Date': [DAY0 + pd.Timedelta(days=d) for d, _ in weights_by_day],
+                         'Block': "A1", 'Tank': "T3", 'Avg Weight': [w for _, w in weights_by_day]})
+
+
+def _log(tanks=("T3", "T4"), n=10):
+    frames = [_days(n).assign(Tank=tank, LiveCount=1000 - 10 * np.arange(n)) for tank in tanks]
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_each_day_gets_the_latest_sample_of_its_own_tank():
+    samples = pd.concat([_samples((2, 1.0), (6, 2.0)), _samples((5, 3.0)).assign(Tank="T4")], ignore_index=True)
+    aligned = align_abw(_log(), samples)
+    t3 = aligned[aligned['Tank'] == "T3"].set_index('Date')
+    assert t3['ABW'].iloc[:2].isna().all()
+    assert (t3['ABW'].iloc[2:6] == 1.0).all() and (t3['ABW'].iloc[6:] == 2.0).all()
+    assert (t3['ABW_Date'].iloc[6:] == DAY0 + pd.Timedelta(days=6)).all()
+    assert t3['Biomass_kg'].iloc[6] == pytest.approx(t3['LiveCount'].iloc[6] * 2.0 / 1000)
+    t4 = aligned[aligned['Tank'] == "T4"]
+    assert t4['ABW'].iloc[:5].isna().all() and (t4['ABW'].iloc[5:] == 3.0).all()
+    assert aligned['Date'].is_monotonic_increasing
+
+
+def test_window_rows_mark_samples_taken_inside_the_window():
+    aligned = align_abw(_log(("T3",)), _samples((2, 1.0), (6, 2.0)))
+    rows = window_rows(aligned, DAY0 + pd.Timedelta(days=4), DAY0 + pd.Timedelta(days=8))
+    assert len(rows) == 5
+    assert rows['In_Window'].tolist() == [False, False, True, True, True]
+
+
+def test_interpolation_is_log_linear_between_samples():
+    out = interpolate_abw(_days(15), _samples((0, 1.0), (14, 4.0))).set_index('Date')
+    assert out['ABW'].iloc[7] == pytest.approx(2.0)     # halfway in days is the geometric mean
+    assert out['ABW'].iloc[0] == 1.0 and out['ABW'].iloc[14] == pytest.approx(4.0)
+    assert np.all(np.diff(np.log(out['ABW'].to_numpy())) == pytest.approx(np.log(4) / 14))
+    assert out['ABW_Source'].iloc[[0, 7, 14]].tolist() == ["sample", "interpolated", "sample"]
+
+
+def test_last_sample_is_held_then_dropped():
+    out = interpolate_abw(_days(MAX_HOLD_DAYS + 5), _samples((0, 2.0)))
+    assert (out['ABW'].iloc[:MAX_HOLD_DAYS + 1] == 2.0).all()
+    assert out['ABW_Source'].iloc[MAX_HOLD_DAYS] == "held"
+    assert out['ABW'].iloc[MAX_HOLD_DAYS + 1:].isna().all()
+
+
+def test_a_restock_never_blends_two_batches():
+    frame = pd.concat([_days(10, "B1"), _days(10, "B2", DAY0 + pd.Timedelta(days=10))], ignore_index=True)
+    out = interpolate_abw(frame, _samples((0, 10.0), (12, 0.5), (19, 1.0)))
+    old_batch = out[out['Batch ID'] == "B1"]
+    assert (old_batch['ABW'] == 10.0).all()     # held, not pulled towards the restocked 0.5 g
+    assert out.loc[out['Batch ID'] == "B2", 'ABW'].iloc[:2].isna().all()
+
+
+def test_extending_the_table_equals_a_rebuild(farm_log):
+    abw = data.read_abw(data.abw_source())
+    cut = farm_log['Date'].max() - pd.Timedelta(days=20)
+    old_log, old_abw = farm_log[farm_log['Date'] <= cut], abw[abw['Date'] <= cut]
+    extended = extend_daily_growth(daily_growth(old_log, old_abw), old_abw, farm_log, abw)
+    rebuilt = daily_growth(farm_log, abw)
+    columns = growth.BATCH_KEYS + ['Date', 'ABW', 'Biomass_kg', 'Cum_FCR']
+    pd.testing.assert_frame_equal(extended[columns], rebuilt[columns])
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from shrimp.heatmap import HEATMAP_METRICS, heatmap_slice, pivot_store
+
+
+def _pivot_table(farm_log, column, how):
+    values = farm_log.assign(Day=farm_log['Date'].dt.normalize(),
+                             Value=pd.to_numeric(farm_log[column], errors='coerce'))
+    return values.pivot_table(index=['Block', 'Tank'], columns='Day', values='Value', aggfunc=how)
+
+
+def test_matrices_are_dense_float32_tanks_by_days(farm_log):
+    store = pivot_store("test-heatmap", farm_log)
+    n_tanks = len(farm_log[['Block', 'Tank']].drop_duplicates())
+    n_days = (farm_log['Date'].max().normalize() - farm_log['Date'].min().normalize()).days + 1
+    assert len(store['labels']) == n_tanks and len(store['dates']) == n_days
+    assert set(store['matrices']) == set(HEATMAP_METRICS)
+    for matrix in store['matrices'].values():
+        assert matrix.dtype == np.float32 and matrix.shape == (n_tanks, n_days)
+        assert matrix.flags['C_CONTIGUOUS']
+
+
+def test_cells_match_a_pandas_pivot(farm_log):
+    store = pivot_store("test-heatmap", farm_log)
+    for metric in ["pH", "Dead Shrimp Count"]:
+        column, how, _ = HEATMAP_METRICS[metric]
+        expected = _pivot_table(farm_log, column, how)
+        expected = expected.reindex(index=pd.MultiIndex.from_arrays([store['blocks'], store['tanks']]),
+                                    columns=store['dates'])
+        np.testing.assert_allclose(store['matrices'][metric], expected.to_numpy(dtype=np.float32), rtol=1e-5)
+
+
+def test_slice_keeps_the_selected_rows_and_window(farm_log):
+    store = pivot_store("test-heatmap", farm_log)
+    block = store['blocks'][0]
+    start, end = store['dates'][5], store['dates'][11]
+    matrix, labels, dates = heatmap_slice(store, "pH", block=block, start=start, end=end)
+    assert matrix.shape == (int((store['blocks'] == block).sum()), 7)
+    assert all(label.startswith(f"{block} | ") for label in labels)
+    assert dates[0] == start and dates[-1] == end
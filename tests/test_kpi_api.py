@@ -0,0 +1,50 @@
+import json
+
+import tornado.testing
+
+import kpi_api
+from shrimp import metrics
+
+# The /api/kpi contract published with the API
+KPI_COUNTS = ["rows", "dead_count", "initial_count"]
+KPI_NUMBERS = ["scheduled_feed_kg", "actual_feed_kg", "leftover_feed_kg",
+               "mortality_pct", "ph_compliance_pct", "salinity_compliance_pct"]
+
+
+def test_kpis_serialize_as_json_numbers(farm_log):
+    k = json.loads(json.dumps(metrics.kpis(farm_log), default=str))
+    assert set(k) == set(KPI_COUNTS + KPI_NUMBERS + ["start", "end"])
+    assert all(type(k[key]) is int for key in KPI_COUNTS)
+    assert all(type(k[key]) is float for key in KPI_NUMBERS)
+    assert k["rows"] == len(farm_log)
+    assert k["actual_feed_kg"] == round(farm_log['ActualFeed_day_g'].sum() / 1000, 2)
+
+
+def test_tile_kpis_are_plain_python_numbers(farm_log):
+    k = metrics.tile_kpis(farm_log)
+    assert set(metrics.KPI_NUMBERS) <= set(k)
+    assert all(type(k[key]) in (int, float) for key in ["rows"] + metrics.KPI_NUMBERS)
+
+
+class KpiApiTest(tornado.testing.AsyncHTTPTestCase):
+    def get_app(self):
+        return kpi_api.make_app()
+
+    def test_kpi_json_types(self):
+        response = self.fetch("/api/kpi")
+        assert response.code == 200
+        k = json.loads(response.body)["data"]
+        assert all(isinstance(k[key], int) for key in KPI_COUNTS)
+        assert all(isinstance(k[key], (int, float)) and not isinstance(k[key], bool) for key in KPI_NUMBERS)
+        assert k["rows"] > 0
+
+    def test_etag_answers_304_until_the_query_changes(self):
+        first = self.fetch("/api/kpi?start=2025-12-01&end=2025-12-31")
+        etag = first.headers["ETag"]
+        again = self.fetch("/api/kpi?start=2025-12-01&end=2025-12-31", headers={"If-None-Match": etag})
+        assert again.code == 304 and not again.body
+        other = self.fetch("/api/kpi?start=2025-12-01&end=2025-12-15", headers={"If-None-Match": etag})
+        assert other.code == 200 and other.headers["ETag"] != etag
+
+    def test_bad_date_is_a_400(self):
+        assert self.fetch("/api/kpi?start=someday").code == 400
@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from shrimp import mortality
+
+
+@pytest.fixture(scope="module")
+def features(farm_log):
+    return mortality.mortality_features(farm_log)
+
+
+@pytest.fixture(scope="module")
+def artifact(features):
+    return mortality.train_mortality_model(features)
+
+
+def test_label_is_the_next_logged_day_of_the_same_batch(features):
+    rows = features.sort_values(mortality.BATCH_KEYS + ['Date'])
+    batch = rows.groupby(mortality.BATCH_KEYS)
+    next_day = batch['Date'].shift(-1) == rows['Date'] + pd.Timedelta(days=1)
+    expected = (batch['Dead'].shift(-1) > mortality.EVENT_DEAD).astype(float)
+    assert (rows.loc[next_day, 'Event_Tomorrow'] == expected[next_day]).all()
+    assert rows.loc[~next_day, 'Event_Tomorrow'].isna().all()
+    assert rows.groupby(mortality.BATCH_KEYS)['Days'].min().eq(0).all()
+
+
+def test_artifact_round_trip_keeps_the_newest(artifact, features, tmp_path):
+    saved = [mortality.save_artifact({**artifact, 'trained_at': f"2026010{i}000000"}, str(tmp_path))
+             for i in range(1, mortality.KEEP_ARTIFACTS + 3)]
+    assert mortality.artifact_paths(str(tmp_path)) == saved[-mortality.KEEP_ARTIFACTS:]
+
+    loaded = mortality.load_artifact(saved[-1])
+    assert loaded['features'] == mortality.FEATURES and loaded['metrics'] == artifact['metrics']
+    np.testing.assert_allclose(loaded['model'].predict_proba(features[mortality.FEATURES]),
+                               artifact['model'].predict_proba(features[mortality.FEATURES]))
+
+    # Artifacts of another feature version are neither listed nor loaded
+    other = mortality.save_artifact({**artifact, 'feature_version': mortality.FEATURE_VERSION + 1}, str(tmp_path))
+    assert other not in mortality.artifact_paths(str(tmp_path))
+    assert mortality.load_artifact(other) is None
+    assert mortality.load_artifact(os.path.join(str(tmp_path), "missing.joblib")) is None
+
+
+def test_scores_cover_every_row(artifact, features):
+    scores = mortality.score_mortality_risk(artifact, features)
+    assert list(scores.columns) == ['Block', 'Tank', 'Date', 'Risk_Tomorrow']
+    assert len(scores) == len(features) and scores.index.equals(features.index)
+    assert scores['Risk_Tomorrow'].between(0, 1).all()
+    assert artifact['metrics']['roc_auc'] > 0.5
+    empty = mortality.score_mortality_risk(artifact, features.iloc[:0])
+    assert empty.empty and list(empty.columns) == list(scores.columns)
+
+
+def test_explanations_sum_to_the_model_margin(artifact, features):
+    scores = mortality.score_mortality_risk(artifact, features)
+    table = mortality.explain_mortality_risk(artifact, features, scores)
+    latest = features.groupby(mortality.KEYS)['Date'].max().reset_index()
+    assert len(latest.merge(table, on=mortality.KEYS + ['Date'])) == len(latest)
+
+    rows = table[mortality.KEYS + ['Date']].merge(features, on=mortality.KEYS + ['Date'], how='left')
+    margin = artifact['model'].predict(rows[mortality.FEATURES], output_margin=True)
+    shap_sum = table[[f"SHAP {f}" for f in mortality.FEATURES]].sum(axis=1) + table['Base_value']
+    np.testing.assert_allclose(shap_sum, margin, atol=1e-4)
+    drivers = table[[f"Driver {d}" for d in dict.fromkeys(mortality.DRIVERS.values())]].sum(axis=1)
+    np.testing.assert_allclose(drivers + table['Base_value'], margin, atol=1e-4)
+    np.testing.assert_allclose(table['Risk_Tomorrow'], 1 / (1 + np.exp(-margin)), atol=1e-5)
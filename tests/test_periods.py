@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+
+from shrimp import data, db, metrics
+from shrimp.periods import compare_periods, compare_report, period_scorecard, scorecard_periods
+
+# period_scorecard metric -> window_scorecard column
+SAME_NUMBERS = {"ABW_end": "ABW_end", "Biomass_kg": "Biomass_kg", "Feed_kg": "Feed_kg", "FCR": "FCR",
+                "ADG (g/day)": "ADG (g/day)", "Survival %": "Survival_%"}
+
+
+@pytest.fixture(scope="module")
+def aligned(farm_log):
+    return metrics.scorecard_log(farm_log, data.read_abw(data.abw_source()))
+
+
+def test_periods_cover_the_range_and_are_clipped():
+    weeks = scorecard_periods("2026-01-01", "2026-01-17")
+    assert weeks['Period'].tolist() == ["2026-01-01", "2026-01-08", "2026-01-15"]
+    assert weeks['End'].iloc[-1] == pd.Timestamp("2026-01-17")
+    months = scorecard_periods("2025-11-20", "2026-01-10", "Monthly")
+    assert months['Start'].tolist() == [pd.Timestamp(d) for d in ["2025-11-20", "2025-12-01", "2026-01-01"]]
+    assert months['End'].iloc[-1] == pd.Timestamp("2026-01-10")
+    with pytest.raises(ValueError):
+        scorecard_periods("2026-01-01", "2026-01-10", "Daily")
+
+
+def test_each_period_scores_like_its_window(aligned):
+    periods = scorecard_periods(aligned['Date'].min(), aligned['Date'].max(), "Monthly")
+    table = period_scorecard(aligned, periods)
+    tanks = table[table['Level'] == "Tank"]
+
+    for period in periods.itertuples():
+        window = metrics.window_scorecard(aligned, period.Start, period.End)
+        window['Entity'] = window['Tank'] + " | " + window['Block']
+        scored = tanks[tanks['Period'] == period.Period].pivot(index='Entity', columns='Metric', values='Value')
+        assert len(scored) > 0
+        for metric, column in SAME_NUMBERS.items():
+            expected = window.set_index('Entity')[column].reindex(scored.index).astype(float)
+            pd.testing.assert_series_equal(scored[metric].astype(float), expected, check_names=False)
+
+
+def test_change_is_against_the_previous_period(aligned):
+    periods = scorecard_periods(aligned['Date'].min(), aligned['Date'].max(), "Monthly")
+    farm = period_scorecard(aligned, periods).query("Level == 'Farm' and Metric == 'Feed_kg'")
+    assert farm['Change'].iloc[0] != farm['Change'].iloc[0]     # NaN: no previous period
+    assert farm['Change'].iloc[1:].tolist() == pytest.approx(farm['Value'].diff().iloc[1:].tolist(), abs=1e-3)
+
+
+def test_overlapping_periods_are_rejected(aligned):
+    with pytest.raises(ValueError):
+        period_scorecard(aligned, [("2026-01-01", "2026-01-10"), ("2026-01-05", "2026-01-15")])
+
+
+def test_compare_scores_the_baseline_from_its_own_dates(tmp_path):
+    conn = db.connect(str(tmp_path / "shrimp.db"))
+    db.ingest_report(conn, data.latest_report_file())
+    _, last = db.report_range(conn, data.latest_report_file())
+    periods = compare_periods(last - pd.Timedelta(days=13), last)
+    (baseline_start, baseline_end), (start, end) = periods
+    assert baseline_end == start - pd.Timedelta(days=1) and end - start == baseline_end - baseline_start
+
+    # As the page queries it: the sidebar's Block / Tank from the baseline's start to the end
+    log = data.prepare_view_df(db.query_current_log(conn, baseline_start, end + pd.Timedelta(days=1),
+                                                    end_inclusive=False))
+    conn.close()
+    abw = data.read_abw(data.abw_source())
+    table = period_scorecard(metrics.scorecard_log(log, abw), periods)
+    farm = table[table['Level'] == "Farm"].set_index(['Period', 'Metric'])['Value']
+    assert farm.loc[(baseline_start.strftime("%Y-%m-%d"), "Feed_kg")] > 0
+    assert compare_report(table, "Farm")["Farm Δ"].notna().any()
+
+    # A log of the current window alone leaves nothing to compare with
+    alone = period_scorecard(metrics.scorecard_log(log[log['Date'] >= start], abw), periods)
+    assert compare_report(alone, "Farm")["Farm Δ"].isna().all()
@@ -0,0 +1,41 @@
+import pandas as pd
+
+from shrimp.risk import STYLE_CSS, STYLED_COLUMNS, build_risk_table, query_risk_table, style_page
+
+
+def test_table_keeps_every_row_with_a_style_class_per_styled_cell(farm_log):
+    table = build_risk_table(farm_log)
+    assert len(table) == len(farm_log)
+    for col, style_col in STYLED_COLUMNS.items():
+        assert col in table.columns
+        assert isinstance(table[style_col].dtype, pd.CategoricalDtype)
+        assert set(table[style_col].cat.categories) == set(STYLE_CSS)
+
+    critical = table['Alert_Level'] == "Critical 🔴"
+    assert critical.any() and (table.loc[critical, '_style_alert'] == "alert-critical").all()
+    ph = table['pH']
+    assert (table.loc[(ph < 7.6) | (ph > 8.3), '_style_ph'] == "red").all()
+    assert (table.loc[ph.between(7.6, 8.2), '_style_ph'] == "").all()
+    assert (table.loc[table['Dead Shrimp'] > 5, '_style_dead'] == "red").all()
+
+
+def test_query_filters_and_sorts_the_full_table(farm_log):
+    table = build_risk_table(farm_log)
+    block, tank = table[['Block', 'Tank']].iloc[0]
+    found = query_risk_table(table, levels=["Critical 🔴", "Warning ⚠"], search=f"{block} {tank}",
+                             sort_by='Dead Shrimp', descending=True)
+    expected = table[table['Alert_Level'].isin(["Critical 🔴", "Warning ⚠"])
+                     & (table['Block'] == block) & (table['Tank'] == tank)]
+    assert len(found) == len(expected) > 0
+    assert found['Dead Shrimp'].is_monotonic_decreasing
+    assert len(query_risk_table(table)) == len(table)
+
+
+def test_only_the_page_is_styled(farm_log):
+    table = build_risk_table(farm_log)
+    page = table.iloc[25:50]
+    styler = style_page(page)
+    assert list(styler.data.columns) == [c for c in table.columns if c not in STYLED_COLUMNS.values()]
+    html = styler.to_html()
+    assert html.count("<tr>") == len(page) + 1
+    assert ("#FF0000" in html) == page[list(STYLED_COLUMNS.values())].isin(["red", "alert-critical"]).any().any()
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from shrimp import data, sizes
+
+A, B = 0.012, 2.9
+
+
+def _abw(tanks=8, samplings=5, seed=0):
+    """Weekly samplings whose class weights follow W = A·L^B exactly; tank T0 of block X1 is uneven."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for t in range(tanks):
+        for week in range(samplings):
+            m_length = 5 + week + rng.uniform(-0.2, 0.2)
+            spread = 1.5 if t == 0 else 0.5
+            lengths = {"S": m_length - spread, "M": m_length, "L": m_length + spread}
+            row = {'Date': pd.Timestamp("2026-01-01") + pd.Timedelta(weeks=week), 'Block': f"X{t % 4 + 1}",
+                   'Tank': f"T{t // 4}", 'Avg Weight': A * m_length ** B}
+            for size, length in lengths.items():
+                row[f"{size}-Length"], row[f"{size}-Weight"] = length, A * length ** B
+            rows.append(row)
+    return _with_cv(pd.DataFrame(rows))
+
+
+def _with_cv(abw):
+    # read_abw's weight CV: (L - S) / 4 over the ABW
+    return abw.assign(CV_pct=((abw['L-Weight'] - abw['S-Weight']) / 4 / abw['Avg Weight'] * 100).fillna(0))
+
+
+def test_read_abw_parses_class_lengths(tmp_path):
+    path = tmp_path / "AvgBW.xlsx"
+    pd.DataFrame({
+        "Date ": ["2026-01-01", "2026-01-01"], "Block": ["A1", "A1"], "Tank": ["T3", "T4"],
+        "Avg Weight": ["1.5g", "no shrimp"],
+        "S-Weight": ["1g", "no shrimp"], "M-Weight": ["1.5g", "no shrimp"], "L-Weight": ["2g", "no shrimp"],
+        "S-Length": ["4.5cm", "no shrimp"], "M-Length": ["5 cm", "no shrimp"], "L-Length": ["5.5", "no shrimp"],
+    }).to_excel(path, index=False)
+    abw = data.read_abw(str(path)).set_index('Tank')
+    assert abw.loc["T3", ['S-Length', 'M-Length', 'L-Length']].tolist() == [4.5, 5.0, 5.5]
+    assert abw.loc["T4", ['S-Length', 'M-Length', 'L-Length']].isna().all()
+    assert len(sizes.class_samples(abw.reset_index())) == 3
+
+
+def test_length_weight_fit_recovers_the_curve():
+    fits = sizes.length_weight_fits(sizes.class_samples(_abw()))
+    assert len(fits) == 9 and fits.iloc[-1][['Block', 'Tank']].tolist() == ["ALL", "ALL"]
+    assert fits['a'].to_numpy() == pytest.approx(A, rel=1e-6)
+    assert fits['b'].to_numpy() == pytest.approx(B, rel=1e-6)
+    assert (fits['R2'] == 1.0).all() and (fits['n'].iloc[:-1] == 15).all()
+
+
+def test_class_shares_sum_to_the_whole_stock():
+    report = sizes.size_report(_abw())
+    shares = report['samples'][['Share_S', 'Share_M', 'Share_L']].sum(axis=1)
+    assert shares.to_numpy() == pytest.approx(100, abs=0.2)
+    assert report['samples']['CV_length_pct'].notna().all()
+
+
+def test_uneven_tank_is_flagged_divergent():
+    tanks = sizes.size_report(_abw())['tanks'].set_index(['Block', 'Tank'])
+    assert tanks.loc[("X1", "T0"), 'Divergent']
+    assert "uneven sizes" in tanks.loc[("X1", "T0"), 'Divergence']
+    assert tanks['Divergent'].sum() == 1
+    assert tanks['Weight_for_length_pct'].abs().max() < 0.1
+
+
+def test_tank_summary_takes_the_whole_latest_sampling():
+    abw = _abw()
+    latest = abw['Date'] == abw['Date'].max()
+    # The newest sampling weighed no size classes
+    abw.loc[latest, ['S-Weight', 'M-Weight', 'L-Weight', 'S-Length', 'M-Length', 'L-Length']] = np.nan
+    tanks = sizes.size_report(_with_cv(abw))['tanks']
+    assert (tanks['Date'] == abw['Date'].max()).all()
+    newest = tanks.merge(abw.loc[latest, ['Block', 'Tank', 'Avg Weight']], on=['Block', 'Tank'])
+    assert len(newest) == len(tanks) and (newest['ABW'] == newest['Avg Weight']).all()
+    assert tanks[['Share_S', 'Share_M', 'Share_L']].isna().all().all()
@@ -0,0 +1,53 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from shrimp import data, store
+
+
+@pytest.fixture
+def store_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "STORE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_a_partition_reads_back_its_tank(store_dir, farm_log):
+    abw = data.read_abw(data.abw_source())
+    store.build_store("test-store-roundtrip", farm_log, abw)
+    assert set(store.partitions("test-store-roundtrip")) == set(map(tuple, farm_log[['Block', 'Tank']].values))
+
+    block, tank = farm_log[['Block', 'Tank']].iloc[0]
+    rows = store.load_partition("test-store-roundtrip", "farm_log", block, tank)
+    expected = farm_log[(farm_log['Block'] == block) & (farm_log['Tank'] == tank)].sort_values('Date')
+    assert len(rows) == len(expected) > 0
+    assert (rows['Date'].to_numpy() == expected['Date'].to_numpy()).all()
+    for col in ['ActualFeed_day_g', 'DeadCount_day', 'pH']:
+        assert rows[col].sum() == pytest.approx(pd.to_numeric(expected[col], errors='coerce').sum())
+
+    samples = store.load_partition("test-store-roundtrip", "abw", block, tank)
+    assert len(samples) == ((abw['Block'] == block) & (abw['Tank'] == tank)).sum()
+    assert store.load_partition("test-store-roundtrip", "farm_log", block, "no such tank").empty
+
+
+def test_prune_keeps_the_current_and_last_used_versions_only(store_dir, farm_log):
+    small = farm_log.head(50)
+    roots = []
+    for i, version in enumerate(["v1", "v2", "v3"]):
+        roots.append(store.build_store(version, small, None))
+        # v1 last used three hours ago, v3 one hour ago
+        stamp = time.time() - (3 - i) * 3600
+        os.utime(os.path.join(roots[-1], store.MANIFEST), (stamp, stamp))
+    foreign = store_dir / "0123456789abcdef"     # looks like a version but has no manifest
+    foreign.mkdir()
+    crashed, running = store_dir / f"{store.BUILD_PREFIX}old", store_dir / f"{store.BUILD_PREFIX}new"
+    crashed.mkdir()
+    running.mkdir()
+    stamp = time.time() - store.STALE_BUILD_SECONDS - 60
+    os.utime(crashed, (stamp, stamp))
+
+    current = store.build_store("v4", small, None)
+    assert store.store_versions() == [current, roots[-1]]
+    assert not os.path.exists(roots[0]) and not os.path.exists(roots[1])
+    assert foreign.exists() and running.exists() and not crashed.exists()